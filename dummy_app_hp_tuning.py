@@ -47,9 +47,15 @@ while True:
     configuration["environment"] = environment_configuration
     configuration["brain"] = brain_configuration
     configuration["optimizer"] = optimizer_configuration
+    configuration["preprocessing"] = {}
     configuration["enhancer"] = {
-        "type": [None, "RandomEnhancer"]
+        "type": random.choice([None, "RandomEnhancer"])
     }
+    configuration["global_seed"] = random.randint(0, 100000)
+
+    # All brains of the sweep have a batched implementation, and the DummyApp a vectorized one (VecDummyApp), thus the
+    # genomes of a worker are evaluated in lockstep
+    configuration["batched_evaluation"] = True
 
     print(configuration)
 
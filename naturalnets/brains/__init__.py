@@ -1,7 +1,7 @@
-from naturalnets.brains.i_brain import IBrain
-from naturalnets.brains.continuous_time_rnn import CTRNN
-from naturalnets.brains.feed_forward_nn import FeedForwardNN
+from naturalnets.brains.i_brain import IBrain, IBatchedBrain
+from naturalnets.brains.continuous_time_rnn import CTRNN, BatchedCTRNN
+from naturalnets.brains.feed_forward_nn import FeedForwardNN, BatchedFeedForwardNN
 from naturalnets.brains.indirect_encoded_ctrnn import IndirectCTRNN
-from naturalnets.brains.rnn import RNN
-from naturalnets.brains.gru import GRU
-from naturalnets.brains.lstm import LSTM
+from naturalnets.brains.rnn import RNN, BatchedRNN
+from naturalnets.brains.gru import GRU, BatchedGRU
+from naturalnets.brains.lstm import LSTM, BatchedLSTM
@@ -35,7 +35,7 @@ def assign_individual_to_brain_weights(individual: np.ndarray, input_size: int,
             current_index += num_elements
         else:
             # No bias, simply use zeros as they are added and do not alter the output
-            biases.append(np.zeros((number_of_gates, hidden_size)))
+            biases.append(np.zeros((number_of_gates, hidden_size), dtype=individual.dtype))
 
         current_input_size = hidden_size
 
@@ -51,7 +51,7 @@ def assign_individual_to_brain_weights(individual: np.ndarray, input_size: int,
 
         current_index += output_size
     else:
-        output_bias = np.zeros((output_size,))
+        output_bias = np.zeros((output_size,), dtype=individual.dtype)
 
     assert current_index == len(individual)
 
@@ -1,9 +1,11 @@
-from typing import Dict, Tuple
+from typing import Callable, Dict, Optional, Tuple, Sequence, Union
 
 import numpy as np
 from attrs import define, field, validators
+from scipy.sparse import csr_matrix, issparse
 
-from naturalnets.brains.i_brain import IBrain, IBrainCfg, register_brain_class
+from naturalnets.brains.i_brain import (IBrain, IBrainCfg, register_brain_class, IBatchedBrain,
+                                        register_batched_brain_class)
 
 DENSE_MASK = "dense"
 RANDOM_MASK = "random"
@@ -11,6 +13,14 @@ RANDOM_MASK = "random"
 NATURAL_NET_DIFF_EQ = "NaturalNet"
 LI_HO_CHOW_DIFF_EQ = "LiHoChow2005"
 
+EULER_INTEGRATION = "Euler"
+RK2_INTEGRATION = "RK2"
+RK4_INTEGRATION = "RK4"
+
+# Weight matrices with fewer elements than this are always stored dense, because for them the overhead of a sparse
+# matrix-vector product is larger than the time saved by skipping the zeros
+SPARSE_MINIMUM_NUMBER_ELEMENTS = 50000
+
 
 @define(slots=True, auto_attribs=True, frozen=True, kw_only=True)
 class ContinuousTimeRNNCfg(IBrainCfg):
@@ -41,6 +51,147 @@ class ContinuousTimeRNNCfg(IBrainCfg):
     # TODO can this be negative (probably not)?
     alpha: float = field(default=0.0, converter=float, validator=validators.instance_of(float))
     optimize_x0: bool = field(default=False, validator=validators.instance_of(bool))
+    # The method, with which the differential equation is integrated: forward Euler, the midpoint method (RK2), or the
+    # classic Runge-Kutta method (RK4)
+    integration_method: str = field(
+        default=EULER_INTEGRATION,
+        validator=[validators.instance_of(str), validators.in_([EULER_INTEGRATION, RK2_INTEGRATION, RK4_INTEGRATION])]
+    )
+    # The number of integration steps of size delta_t per environment step, i.e. the state advances by
+    # number_substeps * delta_t per environment step. The input is held constant during the substeps.
+    number_substeps: int = field(default=1, validator=[validators.instance_of(int), validators.gt(0)])
+    # A weight matrix, whose mask has a density below this threshold, is stored as a sparse CSR matrix (if it has at
+    # least SPARSE_MINIMUM_NUMBER_ELEMENTS elements). Set it to 0.0 to always use dense matrices.
+    sparse_density_threshold: float = field(default=0.2, converter=float,
+                                            validator=[validators.ge(0.0), validators.le(1.0)])
+
+
+class CTRNNIntegrator:
+    """
+    Integrates the differential equation of a CTRNN, or of a batch of CTRNNs, in place over one environment step. The
+    differential equation and the integration method are resolved once at construction, and all intermediate states
+    are preallocated, such that the substeps only consist of in-place array operations.
+    """
+
+    def __init__(self, config: ContinuousTimeRNNCfg, recurrent_product: Callable[[np.ndarray, np.ndarray], None],
+                 shape: Tuple[int, ...], dtype: np.dtype):
+        """
+        :param config: The configuration of the CTRNN
+        :param recurrent_product: Computes the product of W with the first argument into the second argument
+        :param shape: The shape of the state x
+        :param dtype: The data type of the state x
+        """
+        self.recurrent_product = recurrent_product
+        self.alpha = config.alpha
+        self.delta_t = config.delta_t
+        self.number_substeps = config.number_substeps
+        self.clipping_range = config.clipping_range
+
+        if config.differential_equation == NATURAL_NET_DIFF_EQ:
+            self.derivative = self.natural_net_derivative
+        elif config.differential_equation == LI_HO_CHOW_DIFF_EQ:
+            self.derivative = self.li_ho_chow_derivative
+        else:
+            raise RuntimeError(f"'{config.differential_equation}' is no valid differential equation")
+
+        if config.integration_method == EULER_INTEGRATION:
+            self.integration_step = self.euler_step
+            number_stages = 1
+        elif config.integration_method == RK2_INTEGRATION:
+            self.integration_step = self.rk2_step
+            number_stages = 2
+        elif config.integration_method == RK4_INTEGRATION:
+            self.integration_step = self.rk4_step
+            number_stages = 4
+        else:
+            raise RuntimeError(f"'{config.integration_method}' is no valid integration method")
+
+        # The derivatives of the stages of the integration method, the intermediate state at which they are evaluated,
+        # and a temporary array for the derivative
+        self.stages = [np.empty(shape, dtype=dtype) for _ in range(number_stages)]
+        self.intermediate_state = np.empty(shape, dtype=dtype)
+        self.temporary = np.empty(shape, dtype=dtype)
+
+    def natural_net_derivative(self, x: np.ndarray, input_product: np.ndarray, out: np.ndarray):
+        # dx_dt = -alpha * x + W.dot(tanh(x)) + V.dot(u)
+        np.tanh(x, out=self.temporary)
+        self.recurrent_product(self.temporary, out)
+
+        if self.alpha != 0.0:
+            np.multiply(x, -self.alpha, out=self.temporary)
+            out += self.temporary
+
+        out += input_product
+
+    def li_ho_chow_derivative(self, x: np.ndarray, input_product: np.ndarray, out: np.ndarray):
+        # dx_dt = -alpha * x + W.dot(tanh(x + V.dot(u)))
+        np.add(x, input_product, out=self.temporary)
+        np.tanh(self.temporary, out=self.temporary)
+        self.recurrent_product(self.temporary, out)
+
+        if self.alpha != 0.0:
+            np.multiply(x, -self.alpha, out=self.temporary)
+            out += self.temporary
+
+    def euler_step(self, x: np.ndarray, input_product: np.ndarray):
+        k1 = self.stages[0]
+
+        self.derivative(x, input_product, k1)
+
+        k1 *= self.delta_t
+        x += k1
+
+    def rk2_step(self, x: np.ndarray, input_product: np.ndarray):
+        k1, k2 = self.stages
+
+        self.derivative(x, input_product, k1)
+
+        np.multiply(k1, 0.5 * self.delta_t, out=self.intermediate_state)
+        self.intermediate_state += x
+        self.derivative(self.intermediate_state, input_product, k2)
+
+        k2 *= self.delta_t
+        x += k2
+
+    def rk4_step(self, x: np.ndarray, input_product: np.ndarray):
+        k1, k2, k3, k4 = self.stages
+
+        self.derivative(x, input_product, k1)
+
+        np.multiply(k1, 0.5 * self.delta_t, out=self.intermediate_state)
+        self.intermediate_state += x
+        self.derivative(self.intermediate_state, input_product, k2)
+
+        np.multiply(k2, 0.5 * self.delta_t, out=self.intermediate_state)
+        self.intermediate_state += x
+        self.derivative(self.intermediate_state, input_product, k3)
+
+        np.multiply(k3, self.delta_t, out=self.intermediate_state)
+        self.intermediate_state += x
+        self.derivative(self.intermediate_state, input_product, k4)
+
+        # x += delta_t / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        k2 += k3
+        k2 *= 2.0
+        k1 += k2
+        k1 += k4
+        k1 *= self.delta_t / 6.0
+        x += k1
+
+    def integrate(self, x: np.ndarray, input_product: np.ndarray):
+        """
+        Advances the state x in place by number_substeps integration steps, and clips it to the state boundaries after
+        each of them.
+
+        :param x: The state, it is changed in place
+        :param input_product: The product of V with the current input, which is constant during the substeps
+        """
+        for _ in range(self.number_substeps):
+            self.integration_step(x, input_product)
+
+            # Same as np.clip(), which has a much larger overhead for small arrays
+            np.maximum(x, -self.clipping_range, out=x)
+            np.minimum(x, self.clipping_range, out=x)
 
 
 @register_brain_class
@@ -54,54 +205,101 @@ class CTRNN(IBrain):
 
         v_mask, w_mask, t_mask = self.get_masks_from_brain_state(brain_state)
 
-        # Insert weights-values into weight-masks to receive weight-matrices
-        # explanation here: https://stackoverflow.com/a/61968524/5132456
-        v_size: int = np.count_nonzero(v_mask)
-        w_size: int = np.count_nonzero(w_mask)
-        t_size: int = np.count_nonzero(t_mask)
+        # The positions of the weights in the masks were precomputed in get_brain_state_from_masks(), such that the
+        # weight matrices are decoded without searching the masks (a brain is created for each evaluation)
+        v_size = len(brain_state["v_flat_indices"])
+        w_size = len(brain_state["w_flat_indices"])
+        t_size = len(brain_state["t_flat_indices"])
 
         # Get weight matrices of current individual
-        self.V = np.array([[element] for element in individual[0:v_size]])
-        self.W = np.array([[element] for element in individual[v_size:v_size + w_size]])
-        self.T = np.array([[element] for element in individual[v_size + w_size:v_size + w_size + t_size]])
-
-        self.V = self.V.reshape([self.config.number_neurons, self.input_size])
-        self.W = self.W.reshape([self.config.number_neurons, self.config.number_neurons])
-        self.T = self.T.reshape([self.output_size, self.config.number_neurons])
+        w_values = individual[v_size:v_size + w_size]
 
-        # Set elements of main diagonal to less than 0
+        # Set elements of main diagonal to less than 0. The main diagonal is always part of the mask of W.
         if self.config.set_principle_diagonal_elements_of_W_negative:
-            for j in range(self.config.number_neurons):
-                self.W[j][j] = -abs(self.W[j][j])
+            diagonal_indices = brain_state["w_diagonal_indices"]
+            w_values = np.array(w_values)
+            w_values[diagonal_indices] = -np.abs(w_values[diagonal_indices])
+
+        self.V = self.get_weight_matrix(brain_state, "v", individual[0:v_size], self.config.sparse_density_threshold)
+        self.W = self.get_weight_matrix(brain_state, "w", w_values, self.config.sparse_density_threshold)
+        self.T = self.get_weight_matrix(brain_state, "t", individual[v_size + w_size:v_size + w_size + t_size],
+                                        self.config.sparse_density_threshold)
 
         index = v_size + w_size + t_size
 
         # Initial state values x0
         if self.config.optimize_x0:
-            self.x0 = np.array([element for element in individual[index:index + self.config.number_neurons]])
+            self.x0 = individual[index:index + self.config.number_neurons]
             index += self.config.number_neurons
         else:
-            self.x0 = np.zeros(self.config.number_neurons)
+            self.x0 = np.zeros(self.config.number_neurons, dtype=individual.dtype)
+
+        if issparse(self.W):
+            self.recurrent_product = self.sparse_recurrent_product
+        else:
+            self.recurrent_product = self.dense_recurrent_product
+
+        self.weights_dtype = np.result_type(self.x0, self.V.dtype, self.W.dtype, self.T.dtype)
+
+        # The integrator and the state are allocated for the data type of the inputs in the first step, since the state
+        # is integrated in place
+        self.input_dtype: Optional[np.dtype] = None
+        self.integrator: Optional[CTRNNIntegrator] = None
 
         self.x = self.x0
 
+    def allocate_buffers(self, input_dtype: np.dtype):
+        self.input_dtype = input_dtype
+        dtype = np.result_type(self.weights_dtype, input_dtype)
+        self.integrator = CTRNNIntegrator(self.config, self.recurrent_product, self.x0.shape, dtype)
+
+        # Copy the state, because x0 must not be changed by the integration
+        self.x = np.array(self.x, dtype=dtype)
+
+    def dense_recurrent_product(self, vector: np.ndarray, out: np.ndarray):
+        np.dot(self.W, vector, out=out)
+
+    def sparse_recurrent_product(self, vector: np.ndarray, out: np.ndarray):
+        out[:] = self.W.dot(vector)
+
+    @staticmethod
+    def get_weight_matrix(brain_state: Dict[str, np.ndarray], name: str, values: np.ndarray,
+                          sparse_density_threshold: float) -> Union[np.ndarray, csr_matrix]:
+        """
+        Inserts the values into the positions of the mask with the given name ("v", "w" or "t"), which are True, in
+        row-major order. Note that the result may be a view of values.
+
+        :return: A dense array, or a sparse CSR matrix if the mask is large and has a density below
+            sparse_density_threshold. Both are used the same way with dot() in step().
+        """
+        shape = brain_state[f"{name}_mask"].shape
+        flat_indices = brain_state[f"{name}_flat_indices"]
+        number_elements = shape[0] * shape[1]
+
+        if len(flat_indices) == number_elements:
+            return values.reshape(shape)
+
+        is_sparse = len(flat_indices) < sparse_density_threshold * number_elements
+
+        if is_sparse and number_elements >= SPARSE_MINIMUM_NUMBER_ELEMENTS:
+            return csr_matrix((values, brain_state[f"{name}_csr_indices"], brain_state[f"{name}_csr_indptr"]),
+                              shape=shape)
+
+        matrix = np.zeros(number_elements, dtype=values.dtype)
+        matrix[flat_indices] = values
+
+        return matrix.reshape(shape)
+
     def step(self, u: np.ndarray) -> np.ndarray:
 
         assert u.ndim == 1
 
-        # Differential equation
-        if self.config.differential_equation == NATURAL_NET_DIFF_EQ:
-            dx_dt = -self.config.alpha * self.x + self.W.dot(np.tanh(self.x)) + self.V.dot(u)
-        elif self.config.differential_equation == LI_HO_CHOW_DIFF_EQ:
-            dx_dt = -self.config.alpha * self.x + self.W.dot(np.tanh(self.x + self.V.dot(u)))
-        else:
-            raise RuntimeError(f"'{self.config.differential_equation}' is no valid differential equation")
-
-        # Euler forward discretization
-        self.x = self.x + self.config.delta_t * dx_dt
+        # Note that a comparison of a data type with None compares it with float64
+        if self.input_dtype is None or u.dtype != self.input_dtype:
+            self.allocate_buffers(u.dtype)
 
-        # Clip y to state boundaries
-        self.x = np.clip(self.x, -self.config.clipping_range, +self.config.clipping_range)
+        # Integrate the differential equation, the input is constant during the substeps
+        self.integrator.integrate(self.x, self.V.dot(u))
 
         # Calculate outputs
         y = np.tanh(self.T.dot(self.x))
@@ -112,7 +310,10 @@ class CTRNN(IBrain):
 
     def reset(self):
         # self.x0 always has the starting state of the hidden units, no matter if using config.optimize_x0 or not
-        self.x = self.x0
+        if self.input_dtype is not None:
+            self.x[:] = self.x0
+        else:
+            self.x = self.x0
 
     @classmethod
     def generate_brain_state(cls, input_size: int, output_size: int, configuration: dict) -> Dict[str, np.ndarray]:
@@ -172,7 +373,26 @@ class CTRNN(IBrain):
 
     @staticmethod
     def get_brain_state_from_masks(v_mask: np.ndarray, w_mask: np.ndarray, t_mask: np.ndarray) -> Dict[str, np.ndarray]:
-        return {"v_mask": v_mask, "w_mask": w_mask, "t_mask": t_mask}
+        brain_state = {"v_mask": v_mask, "w_mask": w_mask, "t_mask": t_mask}
+
+        # Precompute the positions of the weights in the masks, which are used to decode each genome. The row-major
+        # order of the weights is also the order of the data of a CSR matrix, thus the structure of the sparse matrices
+        # can be precomputed as well.
+        for name, mask in (("v", v_mask), ("w", w_mask), ("t", t_mask)):
+            flat_indices = np.flatnonzero(mask)
+
+            csr_indptr = np.zeros(mask.shape[0] + 1, dtype=np.int32)
+            np.cumsum(np.count_nonzero(mask, axis=1), out=csr_indptr[1:])
+
+            brain_state[f"{name}_flat_indices"] = flat_indices
+            brain_state[f"{name}_csr_indices"] = (flat_indices % mask.shape[1]).astype(np.int32)
+            brain_state[f"{name}_csr_indptr"] = csr_indptr
+
+        # The positions of the main diagonal of W in its weights
+        rows, columns = np.nonzero(w_mask)
+        brain_state["w_diagonal_indices"] = np.flatnonzero(rows == columns)
+
+        return brain_state
 
     @classmethod
     def get_free_parameter_usage(cls, input_size: int, output_size: int, configuration: dict, brain_state: dict):
@@ -189,10 +409,63 @@ class CTRNN(IBrain):
             "T": free_parameters_t
         }
 
-        if configuration["optimize_x0"]:
-            free_parameters["x_0"] = configuration["number_neurons"]
+        config = ContinuousTimeRNNCfg(**configuration)
+
+        if config.optimize_x0:
+            free_parameters["x_0"] = config.number_neurons
 
         number_of_output_neurons_start_index = free_parameters_v + free_parameters_w
         number_of_output_neurons_end_index = number_of_output_neurons_start_index + free_parameters_t
 
         return free_parameters, number_of_output_neurons_start_index, number_of_output_neurons_end_index
+
+
+@register_batched_brain_class(CTRNN)
+class BatchedCTRNN(IBatchedBrain):
+
+    def __init__(self, input_size: int, output_size: int, individuals: Sequence[np.ndarray], configuration: dict,
+                 brain_state: dict):
+        super().__init__(input_size, output_size, individuals, configuration, brain_state)
+
+        self.config = ContinuousTimeRNNCfg(**configuration)
+
+        # Decode the genomes with the single brain implementation, and stack the weights of all brains
+        brains = [CTRNN(input_size, output_size, individual, configuration, brain_state) for individual in individuals]
+
+        self.V = np.stack([self.to_dense(b.V) for b in brains])
+        self.W = np.stack([self.to_dense(b.W) for b in brains])
+        self.T = np.stack([self.to_dense(b.T) for b in brains])
+        self.x0 = np.stack([b.x0 for b in brains])
+
+        self.buffer_dtype: Optional[np.dtype] = None
+        self.integrator: Optional[CTRNNIntegrator] = None
+
+        self.x = self.x0
+
+    @staticmethod
+    def to_dense(matrix: Union[np.ndarray, csr_matrix]) -> np.ndarray:
+        return matrix.toarray() if issparse(matrix) else matrix
+
+    def recurrent_product(self, vectors: np.ndarray, out: np.ndarray):
+        out[:] = self.matvec(self.W, vectors)
+
+    def step(self, u: np.ndarray) -> np.ndarray:
+
+        assert u.ndim == 2
+
+        dtype = np.result_type(self.x0, self.V, self.W, self.T, u)
+        if self.buffer_dtype is None or dtype != self.buffer_dtype:
+            self.buffer_dtype = dtype
+            self.integrator = CTRNNIntegrator(self.config, self.recurrent_product, self.x0.shape, dtype)
+            self.x = np.array(self.x, dtype=dtype)
+
+        self.integrator.integrate(self.x, self.matvec(self.V, u))
+
+        # Calculate outputs
+        return np.tanh(self.matvec(self.T, self.x))
+
+    def reset(self):
+        if self.buffer_dtype is not None:
+            self.x[:] = self.x0
+        else:
+            self.x = self.x0
@@ -1,12 +1,12 @@
 import itertools
-from typing import List, Tuple
+from typing import List, Tuple, Sequence
 
 import numpy as np
 from attrs import define, field, validators
 
 from naturalnets.brains.brain_utils import validate_list_of_ints_larger_zero
 from naturalnets.brains.i_brain import (IBrain, IBrainCfg, register_brain_class, LINEAR_ACTIVATION, RELU_ACTIVATION,
-                                        TANH_ACTIVATION)
+                                        TANH_ACTIVATION, IBatchedBrain, register_batched_brain_class)
 
 
 @define(slots=True, auto_attribs=True, frozen=True, kw_only=True)
@@ -42,27 +42,32 @@ class FeedForwardNN(IBrain):
         self.weights_hidden_layers: List[np.ndarray] = []
         self.biases_hidden_layers: List[np.ndarray] = []
 
+        # The matrices are views of the genome, and thus have its data type
+        dtype = individual.dtype
+
         index = 0
         previous_layer_size = self.input_size
 
         # Read out weight matrices and bias matrices from genome for hidden layers
         for hidden_layer in self.config.hidden_layers:
-            current_weight, index = self.read_matrix_from_genome(individual, index, hidden_layer, previous_layer_size)
+            current_weight, index = self.read_matrix_from_genome(individual, index, hidden_layer, previous_layer_size,
+                                                                 dtype)
             self.weights_hidden_layers.append(current_weight)
 
             if self.config.use_bias:
-                current_bias, index = self.read_matrix_from_genome(individual, index, hidden_layer, 1)
+                current_bias, index = self.read_matrix_from_genome(individual, index, hidden_layer, 1, dtype)
                 self.biases_hidden_layers.append(current_bias)
 
             previous_layer_size = hidden_layer
 
         # Read out weight matrix from genome for output layer
         self.weights_output_layer, index = self.read_matrix_from_genome(individual, index, self.output_size,
-                                                                        previous_layer_size)
+                                                                        previous_layer_size, dtype)
 
         # Read out bias matrix from genome for output layer
         if self.config.use_bias:
-            self.biases_output_layer, index = self.read_matrix_from_genome(individual, index, self.output_size, 1)
+            self.biases_output_layer, index = self.read_matrix_from_genome(individual, index, self.output_size, 1,
+                                                                           dtype)
 
     def step(self, ob: np.ndarray) -> np.ndarray:
 
@@ -129,3 +134,55 @@ class FeedForwardNN(IBrain):
             output_neurons_end_index = individual_size
 
         return {"individual_size": individual_size}, output_neurons_start_index, output_neurons_end_index
+
+
+@register_batched_brain_class(FeedForwardNN)
+class BatchedFeedForwardNN(IBatchedBrain):
+
+    def __init__(self, input_size: int, output_size: int, individuals: Sequence[np.ndarray], configuration: dict,
+                 brain_state: dict):
+        super().__init__(input_size, output_size, individuals, configuration, brain_state)
+
+        self.config = FeedForwardCfg(**configuration)
+
+        self.activation_hidden_layers = FeedForwardNN.get_activation_function(self.config.neuron_activation)
+        self.activation_output_layer = FeedForwardNN.get_activation_function(self.config.neuron_activation_output)
+
+        # Decode the genomes with the single brain implementation, and stack the weights of all brains
+        brains = [FeedForwardNN(input_size, output_size, individual, configuration, brain_state)
+                  for individual in individuals]
+
+        self.weights_hidden_layers: List[np.ndarray] = [
+            np.stack([b.weights_hidden_layers[i] for b in brains]) for i in range(len(self.config.hidden_layers))
+        ]
+        self.biases_hidden_layers: List[np.ndarray] = [
+            np.stack([b.biases_hidden_layers[i] for b in brains]) for i in range(len(brains[0].biases_hidden_layers))
+        ]
+
+        self.weights_output_layer = np.stack([b.weights_output_layer for b in brains])
+
+        if self.config.use_bias:
+            self.biases_output_layer = np.stack([b.biases_output_layer for b in brains])
+
+    def step(self, obs: np.ndarray) -> np.ndarray:
+
+        assert obs.shape == (self.batch_size, self.input_size)
+
+        # Same as FeedForwardNN.predict(), only with an additional batch dimension
+        x = obs[:, :, np.newaxis]
+
+        for weights, biases in itertools.zip_longest(self.weights_hidden_layers, self.biases_hidden_layers):
+            x = np.matmul(weights, x)
+            if self.config.use_bias:
+                x = np.add(x, biases)
+            x = self.activation_hidden_layers(x)
+
+        x = np.matmul(self.weights_output_layer, x)
+        if self.config.use_bias:
+            x = np.add(x, self.biases_output_layer)
+        x = self.activation_output_layer(x)
+
+        return x[:, :, 0]
+
+    def reset(self):
+        pass
@@ -1,10 +1,12 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Sequence
 
 import numpy as np
 from attrs import define, field, validators
+from scipy.special import expit
 
 from naturalnets.brains.brain_utils import assign_individual_to_brain_weights, validate_list_of_ints_larger_zero
-from naturalnets.brains.i_brain import register_brain_class, IBrain, IBrainCfg
+from naturalnets.brains.i_brain import (register_brain_class, IBrain, IBrainCfg, IBatchedBrain,
+                                        register_batched_brain_class)
 
 
 @define(slots=True, auto_attribs=True, frozen=True, kw_only=True)
@@ -39,52 +41,121 @@ class GRU(IBrain):
         self.weights_hidden_to_output = brain_weights[3]
         self.output_bias = brain_weights[4]
 
+        # The weights of the three gates of a layer are fused into one (3 * hidden_size, input_size + hidden_size)
+        # matrix, which is multiplied with the concatenation of the input and the hidden state. The candidate gate
+        # uses the hidden state only after it was multiplied with the reset gate (see step()), thus its
+        # hidden-to-hidden weights are zero in the fused matrix and are applied in a second product.
+        self.fused_weights = []
+        self.candidate_weights_hidden_to_hidden = []
+        for w_ih, w_hh in zip(self.weights_input_to_hidden, self.weights_hidden_to_hidden):
+            fused_weights = np.concatenate([w_ih, w_hh], axis=2)
+            fused_weights[2, :, w_ih.shape[2]:] = 0
+
+            self.fused_weights.append(np.ascontiguousarray(fused_weights.reshape(-1, fused_weights.shape[2])))
+            self.candidate_weights_hidden_to_hidden.append(np.ascontiguousarray(w_hh[2]))
+
+        self.fused_biases = [np.ascontiguousarray(b.reshape(-1), dtype=individual.dtype) for b in self.biases]
+
+        # The concatenated inputs, gates and hidden states are computed in place in these arrays, which are allocated
+        # for the data type of the inputs in the first step, see allocate_buffers()
+        self.input_dtype: Optional[np.dtype] = None
+        self.concatenated_inputs: List[np.ndarray] = []
+        self.gates: List[np.ndarray] = []
+        self.reset_hidden: List[np.ndarray] = []
+        self.candidate_products: List[np.ndarray] = []
+        self.hidden_states: List[np.ndarray] = []
+
         self.hidden = []
+        self.reset()
+
+    def allocate_buffers(self, input_dtype: np.dtype):
+        self.input_dtype = input_dtype
+        dtype = np.result_type(self.fused_weights[0], input_dtype)
+        self.concatenated_inputs = []
+        self.gates = []
+        self.reset_hidden = []
+        self.candidate_products = []
+        self.hidden_states = []
+
+        current_input_size = self.input_size
+        for h, hidden_size in zip(self.hidden, self.configuration.hidden_layers):
+            concatenated_input = np.zeros(current_input_size + hidden_size, dtype=dtype)
+
+            # The hidden state is the second part of the concatenated input of its layer, thus it does not have to be
+            # copied into it in each step
+            hidden_state = concatenated_input[current_input_size:]
+            hidden_state[:] = h
+
+            self.concatenated_inputs.append(concatenated_input)
+            self.gates.append(np.empty(3 * hidden_size, dtype=dtype))
+            self.reset_hidden.append(np.empty(hidden_size, dtype=dtype))
+            self.candidate_products.append(np.empty(hidden_size, dtype=dtype))
+            self.hidden_states.append(hidden_state)
 
-        for hidden_size in self.configuration.hidden_layers:
-            self.hidden.append(
-                np.zeros(hidden_size, dtype=np.float32)
-            )
+            current_input_size = hidden_size
+
+        self.hidden = list(self.hidden_states)
 
     def step(self, inputs: np.ndarray) -> np.ndarray:
+        # Note that a comparison of a data type with None compares it with float64
+        if self.input_dtype is None or inputs.dtype != self.input_dtype:
+            self.allocate_buffers(inputs.dtype)
+
         current_input = inputs
-        for i in range(len(self.configuration.hidden_layers)):
-            w_ih = self.weights_input_to_hidden[i]
-            b_ih = self.biases[i]
-            w_hh = self.weights_hidden_to_hidden[i]
-            h_old = self.hidden[i]
+        for i, hidden_size in enumerate(self.configuration.hidden_layers):
+            h = self.hidden_states[i]
 
-            z_t = self.sigmoid(
-                np.dot(w_ih[0], current_input)
-                + b_ih[0]
-                + np.dot(w_hh[0], h_old)
-            )
+            if self.hidden[i] is not h:
+                # The hidden state was replaced from outside, copy it into the buffer
+                h[:] = self.hidden[i]
+                self.hidden[i] = h
 
-            r_t = self.sigmoid(
-                np.dot(w_ih[1], current_input)
-                + b_ih[1]
-                + np.dot(w_hh[1], h_old)
-            )
+            concatenated_input = self.concatenated_inputs[i]
+            gates = self.gates[i]
+            reset_hidden = self.reset_hidden[i]
+            candidate_products = self.candidate_products[i]
+
+            concatenated_input[:-hidden_size] = current_input
+
+            np.dot(self.fused_weights[i], concatenated_input, out=gates)
+            gates += self.fused_biases[i]
+
+            sigmoid_gates = gates[:2 * hidden_size]
+            expit(sigmoid_gates, out=sigmoid_gates)
+
+            z_t = gates[:hidden_size]
+            r_t = gates[hidden_size:2 * hidden_size]
+            hh = gates[2 * hidden_size:]
 
             # Note that r_t is multiplied with the old hidden state _before_ the matrix multiplication. Other
             # implementations might do this after the matmul. I chose to do it this way, because in the most recent
             # version of the GRU paper the authors do the same. In addition, the corresponding TensorFlow variant
             # (GRUCell with reset_after=False), only requires one bias, instead of two when setting reset_after=True.
             # Read more here: https://www.tensorflow.org/api_docs/python/tf/keras/layers/GRU#used-in-the-notebooks
-            hh = np.tanh(
-                np.dot(w_ih[2], current_input)
-                + b_ih[2]
-                + np.dot(w_hh[2], r_t * h_old)
-            )
+            np.multiply(r_t, h, out=reset_hidden)
+            np.dot(self.candidate_weights_hidden_to_hidden[i], reset_hidden, out=candidate_products)
+            hh += candidate_products
+            np.tanh(hh, out=hh)
 
-            h_new = z_t * h_old + (1 - z_t) * hh
+            # h = z_t * h + (1 - z_t) * hh, the reset gate is not needed anymore and holds (1 - z_t) * hh
+            h *= z_t
+            np.subtract(1, z_t, out=r_t)
+            r_t *= hh
+            h += r_t
 
-            self.hidden[i] = h_new
-            current_input = h_new
+            current_input = h
 
         return np.tanh(np.dot(self.weights_hidden_to_output, current_input) + self.output_bias)
 
     def reset(self):
+        if self.input_dtype is not None:
+            # The hidden state arrays are reused
+            for h in self.hidden_states:
+                h.fill(0)
+
+            self.hidden = list(self.hidden_states)
+            return
+
         self.hidden = []
         for hidden_size in self.configuration.hidden_layers:
             self.hidden.append(
@@ -136,3 +207,70 @@ class GRU(IBrain):
         parameter_dict["output_layer"] = output_layer_dict
 
         return parameter_dict, output_neurons_start_index, output_neurons_end_index
+
+
+@register_batched_brain_class(GRU)
+class BatchedGRU(IBatchedBrain):
+    def __init__(self, input_size: int, output_size: int, individuals: Sequence[np.ndarray], configuration: dict,
+                 brain_state: dict):
+        super().__init__(input_size, output_size, individuals, configuration, brain_state)
+
+        self.configuration = GRUConfig(**configuration)
+
+        # Decode the genomes with the single brain implementation, and stack the weights of all brains. The gate
+        # weights of one layer then have the shape (batch_size, 3, hidden_size, input_size).
+        brains = [GRU(input_size, output_size, individual, self.configuration, brain_state)
+                  for individual in individuals]
+
+        number_layers = len(self.configuration.hidden_layers)
+        self.weights_input_to_hidden = [np.stack([b.weights_input_to_hidden[i] for b in brains])
+                                        for i in range(number_layers)]
+        self.weights_hidden_to_hidden = [np.stack([b.weights_hidden_to_hidden[i] for b in brains])
+                                         for i in range(number_layers)]
+        self.biases = [np.stack([b.biases[i] for b in brains]) for i in range(number_layers)]
+        self.weights_hidden_to_output = np.stack([b.weights_hidden_to_output for b in brains])
+        self.output_bias = np.stack([b.output_bias for b in brains])
+
+        self.hidden = []
+        self.reset()
+
+    def step(self, inputs: np.ndarray) -> np.ndarray:
+        current_input = inputs
+        for i in range(len(self.configuration.hidden_layers)):
+            w_ih = self.weights_input_to_hidden[i]
+            b_ih = self.biases[i]
+            w_hh = self.weights_hidden_to_hidden[i]
+            h_old = self.hidden[i]
+
+            z_t = GRU.sigmoid(
+                self.matvec(w_ih[:, 0], current_input)
+                + b_ih[:, 0]
+                + self.matvec(w_hh[:, 0], h_old)
+            )
+
+            r_t = GRU.sigmoid(
+                self.matvec(w_ih[:, 1], current_input)
+                + b_ih[:, 1]
+                + self.matvec(w_hh[:, 1], h_old)
+            )
+
+            # See GRU.step() on why r_t is multiplied with the hidden state before the matrix multiplication
+            hh = np.tanh(
+                self.matvec(w_ih[:, 2], current_input)
+                + b_ih[:, 2]
+                + self.matvec(w_hh[:, 2], r_t * h_old)
+            )
+
+            h_new = z_t * h_old + (1 - z_t) * hh
+
+            self.hidden[i] = h_new
+            current_input = h_new
+
+        return np.tanh(self.matvec(self.weights_hidden_to_output, current_input) + self.output_bias)
+
+    def reset(self):
+        self.hidden = []
+        for hidden_size in self.configuration.hidden_layers:
+            self.hidden.append(
+                np.zeros((self.batch_size, hidden_size), dtype=np.float32)
+            )
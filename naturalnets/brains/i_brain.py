@@ -1,5 +1,5 @@
 import abc
-from typing import Callable, Type, Tuple, Optional, Dict
+from typing import Callable, Type, Tuple, Optional, Dict, Sequence
 
 import numpy as np
 from attrs import define, field, validators
@@ -13,6 +13,7 @@ LINEAR_ACTIVATION = "linear"
 BRAIN_STATE_KEY = "brain_state"
 
 registered_brain_classes = {}
+registered_batched_brain_classes = {}
 
 
 def get_brain_class(brain_class_name: str) -> Type["IBrain"]:
@@ -28,6 +29,26 @@ def register_brain_class(brain_class):
     return brain_class
 
 
+def get_batched_brain_class(brain_class_name: str) -> Type["IBatchedBrain"]:
+    if brain_class_name in registered_batched_brain_classes:
+        return registered_batched_brain_classes[brain_class_name]
+    else:
+        raise RuntimeError(f"'{brain_class_name}' has no batched implementation. Please choose one from the following "
+                           f"list: {list(registered_batched_brain_classes)!r}")
+
+
+def register_batched_brain_class(brain_class: Type["IBrain"]):
+    """
+    Registers the decorated IBatchedBrain as the batched implementation of the given brain class, i.e. it can be
+    retrieved with get_batched_brain_class() using the name of the brain class.
+    """
+    def register(batched_brain_class):
+        registered_batched_brain_classes[brain_class.__name__] = batched_brain_class
+        return batched_brain_class
+
+    return register
+
+
 @define(slots=True, auto_attribs=True, frozen=True, kw_only=True)
 class IBrainCfg:
     type: str = field(validator=validators.instance_of(str))
@@ -74,10 +95,15 @@ class IBrain(abc.ABC):
         return None
 
     @staticmethod
-    def read_matrix_from_genome(individual: np.ndarray, index: int, matrix_rows: int, matrix_columns: int):
+    def read_matrix_from_genome(individual: np.ndarray, index: int, matrix_rows: int, matrix_columns: int,
+                                dtype: np.dtype = np.single):
+        """
+        Reads a matrix with the given data type from the genome. If the genome already has this data type, the matrix
+        is a view of it, thus convert a genome only once before reading several matrices from it.
+        """
         matrix_size = matrix_columns * matrix_rows
 
-        matrix = np.array(individual[index:index + matrix_size], dtype=np.single)
+        matrix = np.asarray(individual[index:index + matrix_size], dtype=dtype)
         matrix = matrix.reshape(matrix_rows, matrix_columns)
 
         index += matrix_size
@@ -132,3 +158,47 @@ class IBrain(abc.ABC):
     @staticmethod
     def sigmoid(x):
         return expit(x)
+
+
+class IBatchedBrain(abc.ABC):
+    """
+    Evaluates a batch of brains of the same type and configuration at once, for example a whole population, or the
+    part of the population a worker evaluates.
+
+    The weights of all brains are stacked along a new first axis, thus one step() advances all N brains on N
+    observations using batched matrix multiplications. The outputs for one brain in the batch are the same (up to
+    floating point precision) as the outputs of the corresponding IBrain.
+    """
+
+    @abc.abstractmethod
+    def __init__(self, input_size: int, output_size: int, individuals: Sequence[np.ndarray], configuration: dict,
+                 brain_state: dict):
+        """
+        :param individuals: The genomes of the brains, either a list of genomes or a 2-D array with one genome per row
+        """
+        self.input_size = input_size
+        self.output_size = output_size
+        self.batch_size = len(individuals)
+
+    @abc.abstractmethod
+    def step(self, obs: np.ndarray) -> np.ndarray:
+        """
+        :param obs: The observations for all brains, with shape (batch_size, input_size)
+        :return: The outputs of all brains, with shape (batch_size, output_size)
+        """
+        pass
+
+    @abc.abstractmethod
+    def reset(self):
+        pass
+
+    @staticmethod
+    def matvec(matrices: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        """
+        Batched matrix-vector product, i.e. multiplies matrices[n] with vectors[n] for each n in the batch.
+
+        :param matrices: Array of shape (batch_size, ..., rows, columns)
+        :param vectors: Array of shape (batch_size, ..., columns)
+        :return: Array of shape (batch_size, ..., rows)
+        """
+        return np.matmul(matrices, vectors[..., np.newaxis])[..., 0]
@@ -59,7 +59,7 @@ class IndirectCTRNN(IBrain):
 
         individual_ctrnn = np.concatenate((individual_ctrnn_v, individual_ctrnn_w, individual_ctrnn_t))
 
-        brain_state_ctrnn = {"v_mask": v_mask, "w_mask": w_mask, "t_mask": t_mask}
+        brain_state_ctrnn = CTRNN.get_brain_state_from_masks(v_mask, w_mask, t_mask)
 
         # TODO check if this works regarding env_observation_size and env_action_size. I guess the CTRNN config
         #   needs to be careful with which enhancer they use, if any, since when creating the CTRNN here an enhancer
@@ -1,10 +1,12 @@
-from typing import List
+from typing import List, Optional, Sequence
 
 import numpy as np
 from attrs import define, field, validators
+from scipy.special import expit
 
 from naturalnets.brains.brain_utils import assign_individual_to_brain_weights, validate_list_of_ints_larger_zero
-from naturalnets.brains.i_brain import register_brain_class, IBrain, IBrainCfg
+from naturalnets.brains.i_brain import (register_brain_class, IBrain, IBrainCfg, IBatchedBrain,
+                                        register_batched_brain_class)
 
 
 @define(slots=True, auto_attribs=True, frozen=True, kw_only=True)
@@ -13,6 +15,11 @@ class LSTMConfig(IBrainCfg):
     use_bias: bool = field(validator=validators.instance_of(bool))
 
 
+# Order of the gates in the fused weights of LSTM: input, forget and output gate (which all use the sigmoid), and the
+# cell gate (which uses tanh)
+FUSED_GATE_ORDER = [0, 1, 3, 2]
+
+
 @register_brain_class
 class LSTM(IBrain):
     def __init__(self, input_size: int, output_size: int, individual: np.ndarray, configuration: dict,
@@ -39,55 +46,108 @@ class LSTM(IBrain):
         self.weights_hidden_to_output = brain_weights[3]
         self.output_bias = brain_weights[4]
 
+        # The input-to-hidden and hidden-to-hidden weights of the four gates of a layer are fused into one
+        # (4 * hidden_size, input_size + hidden_size) matrix, such that a layer only needs one matrix-vector product
+        # per step (with the concatenation of the input and the hidden state) instead of eight
+        self.fused_weights = [
+            np.concatenate([w_ih, w_hh], axis=2)[FUSED_GATE_ORDER].reshape(-1, w_ih.shape[2] + w_hh.shape[2])
+            for w_ih, w_hh in zip(self.weights_input_to_hidden, self.weights_hidden_to_hidden)
+        ]
+        self.fused_biases = [np.ascontiguousarray(b[FUSED_GATE_ORDER].reshape(-1), dtype=individual.dtype)
+                             for b in self.biases]
+
+        # The concatenated inputs, gates and hidden states are computed in place in these arrays, which are allocated
+        # for the data type of the inputs in the first step, see allocate_buffers()
+        self.input_dtype: Optional[np.dtype] = None
+        self.concatenated_inputs: List[np.ndarray] = []
+        self.gates: List[np.ndarray] = []
+        self.hidden_states: List[np.ndarray] = []
+        self.cell_states: List[np.ndarray] = []
+
         self.hidden = []
+        self.reset()
+
+    def allocate_buffers(self, input_dtype: np.dtype):
+        self.input_dtype = input_dtype
+        dtype = np.result_type(self.fused_weights[0], input_dtype)
+        self.concatenated_inputs = []
+        self.gates = []
+        self.hidden_states = []
+        self.cell_states = []
+
+        current_input_size = self.input_size
+        for (h, c), hidden_size in zip(self.hidden, self.configuration.hidden_layers):
+            concatenated_input = np.zeros(current_input_size + hidden_size, dtype=dtype)
+
+            # The hidden state is the second part of the concatenated input of its layer, thus it does not have to be
+            # copied into it in each step
+            hidden_state = concatenated_input[current_input_size:]
+            hidden_state[:] = h
+
+            self.concatenated_inputs.append(concatenated_input)
+            self.gates.append(np.empty(4 * hidden_size, dtype=dtype))
+            self.hidden_states.append(hidden_state)
+            self.cell_states.append(c.astype(dtype))
 
-        for hidden_size in self.configuration.hidden_layers:
-            self.hidden.append([
-                np.zeros(hidden_size, dtype=np.float32),
-                np.zeros(hidden_size, dtype=np.float32)
-            ])
+            current_input_size = hidden_size
+
+        self.hidden = [[h, c] for h, c in zip(self.hidden_states, self.cell_states)]
 
     def step(self, inputs: np.ndarray) -> np.ndarray:
+        # Note that a comparison of a data type with None compares it with float64
+        if self.input_dtype is None or inputs.dtype != self.input_dtype:
+            self.allocate_buffers(inputs.dtype)
+
         current_input = inputs
-        for i in range(len(self.configuration.hidden_layers)):
-            w_ih = self.weights_input_to_hidden[i]
-            b_ih = self.biases[i]
-            w_hh = self.weights_hidden_to_hidden[i]
-            h_old = self.hidden[i][0]
-            c_old = self.hidden[i][1]
+        for i, hidden_size in enumerate(self.configuration.hidden_layers):
+            h = self.hidden_states[i]
+            c = self.cell_states[i]
 
-            i_t = self.sigmoid(
-                np.dot(w_ih[0], current_input)
-                + b_ih[0]
-                + np.dot(w_hh[0], h_old)
-            )
+            if self.hidden[i][0] is not h or self.hidden[i][1] is not c:
+                # The state was replaced from outside, copy it into the buffers
+                h[:], c[:] = self.hidden[i]
+                self.hidden[i] = [h, c]
 
-            f_t = self.sigmoid(
-                np.dot(w_ih[1], current_input)
-                + b_ih[1]
-                + np.dot(w_hh[1], h_old)
-            )
+            concatenated_input = self.concatenated_inputs[i]
+            gates = self.gates[i]
 
-            c_new = f_t * c_old + i_t * self.tanh(
-                np.dot(w_ih[2], current_input)
-                + b_ih[2]
-                + np.dot(w_hh[2], h_old)
-            )
+            concatenated_input[:-hidden_size] = current_input
 
-            o_t = self.sigmoid(
-                np.dot(w_ih[3], current_input)
-                + + b_ih[3]
-                + np.dot(w_hh[3], h_old)
-            )
+            np.dot(self.fused_weights[i], concatenated_input, out=gates)
+            gates += self.fused_biases[i]
 
-            h_new = o_t * self.tanh(c_new)
+            sigmoid_gates = gates[:3 * hidden_size]
+            expit(sigmoid_gates, out=sigmoid_gates)
 
-            self.hidden[i] = [h_new, c_new]
-            current_input = h_new
+            i_t = gates[:hidden_size]
+            f_t = gates[hidden_size:2 * hidden_size]
+            o_t = gates[2 * hidden_size:3 * hidden_size]
+            g_t = gates[3 * hidden_size:]
+            np.tanh(g_t, out=g_t)
+
+            # c = f_t * c + i_t * g_t
+            c *= f_t
+            i_t *= g_t
+            c += i_t
+
+            # h = o_t * tanh(c), the cell gate is not needed anymore and holds tanh(c)
+            np.tanh(c, out=g_t)
+            np.multiply(o_t, g_t, out=h)
+
+            current_input = h
 
         return np.tanh(np.dot(self.weights_hidden_to_output, current_input) + self.output_bias)
 
     def reset(self):
+        if self.input_dtype is not None:
+            # The state arrays are reused
+            for h, c in zip(self.hidden_states, self.cell_states):
+                h.fill(0)
+                c.fill(0)
+
+            self.hidden = [[h, c] for h, c in zip(self.hidden_states, self.cell_states)]
+            return
+
         self.hidden = []
         for hidden_size in self.configuration.hidden_layers:
             self.hidden.append([
@@ -139,3 +199,77 @@ class LSTM(IBrain):
         parameter_dict["output_layer"] = output_layer_dict
 
         return parameter_dict, output_neurons_start_index, output_neurons_end_index
+
+
+@register_batched_brain_class(LSTM)
+class BatchedLSTM(IBatchedBrain):
+    def __init__(self, input_size: int, output_size: int, individuals: Sequence[np.ndarray], configuration: dict,
+                 brain_state: dict):
+        super().__init__(input_size, output_size, individuals, configuration, brain_state)
+
+        self.configuration = LSTMConfig(**configuration)
+
+        # Decode the genomes with the single brain implementation, and stack the weights of all brains. The gate
+        # weights of one layer then have the shape (batch_size, 4, hidden_size, input_size).
+        brains = [LSTM(input_size, output_size, individual, self.configuration, brain_state)
+                  for individual in individuals]
+
+        number_layers = len(self.configuration.hidden_layers)
+        self.weights_input_to_hidden = [np.stack([b.weights_input_to_hidden[i] for b in brains])
+                                        for i in range(number_layers)]
+        self.weights_hidden_to_hidden = [np.stack([b.weights_hidden_to_hidden[i] for b in brains])
+                                         for i in range(number_layers)]
+        self.biases = [np.stack([b.biases[i] for b in brains]) for i in range(number_layers)]
+        self.weights_hidden_to_output = np.stack([b.weights_hidden_to_output for b in brains])
+        self.output_bias = np.stack([b.output_bias for b in brains])
+
+        self.hidden = []
+        self.reset()
+
+    def step(self, inputs: np.ndarray) -> np.ndarray:
+        current_input = inputs
+        for i in range(len(self.configuration.hidden_layers)):
+            w_ih = self.weights_input_to_hidden[i]
+            b_ih = self.biases[i]
+            w_hh = self.weights_hidden_to_hidden[i]
+            h_old = self.hidden[i][0]
+            c_old = self.hidden[i][1]
+
+            i_t = LSTM.sigmoid(
+                self.matvec(w_ih[:, 0], current_input)
+                + b_ih[:, 0]
+                + self.matvec(w_hh[:, 0], h_old)
+            )
+
+            f_t = LSTM.sigmoid(
+                self.matvec(w_ih[:, 1], current_input)
+                + b_ih[:, 1]
+                + self.matvec(w_hh[:, 1], h_old)
+            )
+
+            c_new = f_t * c_old + i_t * np.tanh(
+                self.matvec(w_ih[:, 2], current_input)
+                + b_ih[:, 2]
+                + self.matvec(w_hh[:, 2], h_old)
+            )
+
+            o_t = LSTM.sigmoid(
+                self.matvec(w_ih[:, 3], current_input)
+                + b_ih[:, 3]
+                + self.matvec(w_hh[:, 3], h_old)
+            )
+
+            h_new = o_t * np.tanh(c_new)
+
+            self.hidden[i] = [h_new, c_new]
+            current_input = h_new
+
+        return np.tanh(self.matvec(self.weights_hidden_to_output, current_input) + self.output_bias)
+
+    def reset(self):
+        self.hidden = []
+        for hidden_size in self.configuration.hidden_layers:
+            self.hidden.append([
+                np.zeros((self.batch_size, hidden_size), dtype=np.float32),
+                np.zeros((self.batch_size, hidden_size), dtype=np.float32)
+            ])
@@ -1,10 +1,11 @@
-from typing import List, Tuple
+from typing import List, Tuple, Sequence
 
 import numpy as np
 from attrs import define, field, validators
 
 from naturalnets.brains.brain_utils import assign_individual_to_brain_weights, validate_list_of_ints_larger_zero
-from naturalnets.brains.i_brain import register_brain_class, IBrain, IBrainCfg
+from naturalnets.brains.i_brain import (register_brain_class, IBrain, IBrainCfg, IBatchedBrain,
+                                        register_batched_brain_class)
 
 
 @define(slots=True, auto_attribs=True, frozen=True, kw_only=True)
@@ -117,3 +118,49 @@ class RNN(IBrain):
         parameter_dict["output_layer"] = output_layer_dict
 
         return parameter_dict, output_neurons_start_index, output_neurons_end_index
+
+
+@register_batched_brain_class(RNN)
+class BatchedRNN(IBatchedBrain):
+    def __init__(self, input_size: int, output_size: int, individuals: Sequence[np.ndarray], configuration: dict,
+                 brain_state: dict):
+        super().__init__(input_size, output_size, individuals, configuration, brain_state)
+
+        self.configuration = RNNConfig(**configuration)
+
+        # Decode the genomes with the single brain implementation, and stack the weights of all brains
+        brains = [RNN(input_size, output_size, individual, self.configuration, brain_state)
+                  for individual in individuals]
+
+        number_layers = len(self.configuration.hidden_layers)
+        self.weights_input_to_hidden = [np.stack([b.weights_input_to_hidden[i] for b in brains])
+                                        for i in range(number_layers)]
+        self.weights_hidden_to_hidden = [np.stack([b.weights_hidden_to_hidden[i] for b in brains])
+                                         for i in range(number_layers)]
+        self.biases = [np.stack([b.biases[i] for b in brains]) for i in range(number_layers)]
+        self.weights_hidden_to_output = np.stack([b.weights_hidden_to_output for b in brains])
+        self.output_bias = np.stack([b.output_bias for b in brains])
+
+        self.hidden = []
+        self.reset()
+
+    def step(self, inputs: np.ndarray) -> np.ndarray:
+        current_input = inputs
+        for i in range(len(self.configuration.hidden_layers)):
+            h_new = np.tanh(
+                self.matvec(self.weights_input_to_hidden[i], current_input)
+                + self.biases[i]
+                + self.matvec(self.weights_hidden_to_hidden[i], self.hidden[i])
+            )
+
+            self.hidden[i] = h_new
+            current_input = h_new
+
+        return np.tanh(self.matvec(self.weights_hidden_to_output, current_input) + self.output_bias)
+
+    def reset(self):
+        self.hidden = []
+        for hidden_size in self.configuration.hidden_layers:
+            self.hidden.append(
+                np.zeros((self.batch_size, hidden_size), dtype=np.float32)
+            )
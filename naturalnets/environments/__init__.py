@@ -5,7 +5,9 @@ from naturalnets.environments.reacher_memory import ReacherMemory
 from naturalnets.environments.gym_environments import GeneralGymEnvironment
 from naturalnets.environments.challenger_neural_network import ChallengerNeuralNetwork
 from naturalnets.environments.dummy_app.dummy_app import DummyApp
+from naturalnets.environments.dummy_app.vec_dummy_app import VecDummyApp
 from naturalnets.environments.gui_app.gui_app import GUIApp
+from naturalnets.environments.gui_app.compiled_gui_app import GUIAppCompiled
 from naturalnets.environments.passlock_app.passlock_app import PasslockApp
 from naturalnets.environments.anki.anki_app import AnkiApp
 from naturalnets.environments.password_manager_app.password_manager_app import PasswordManagerApp
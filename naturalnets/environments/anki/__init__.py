@@ -7,6 +7,7 @@ from naturalnets.environments.anki.constants import (DeckNames, DeckImportName,
                                                      VoiceRecorder)
 from naturalnets.environments.anki.deck import Deck
 from naturalnets.environments.anki.deck import DeckDatabase
+from naturalnets.environments.anki.deck_storage import IDeckStorage, InMemoryDeckStorage, FileDeckStorage
 from naturalnets.environments.anki.pages.choose_deck_page import ChooseDeckPage
 from naturalnets.environments.anki.pages.add_card_page import AddCardPage
 from naturalnets.environments.anki.pages.about_page import AboutPage
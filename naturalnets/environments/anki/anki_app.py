@@ -1,13 +1,15 @@
 import logging
 import time
 from attrs import define, field, validators
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 import cv2
 from naturalnets.enhancers.random_enhancer import RandomEnhancer
 from naturalnets.environments.gui_app.enums import Color
 
 import numpy as np
 from naturalnets.environments.anki.app_controller import AppController
+from naturalnets.environments.anki.deck_storage import deck_storage_classes
+from naturalnets.environments.app_components.utils import get_app_episode_reward_bounds
 from naturalnets.environments.i_environment import IGUIEnvironment, register_environment_class
 
 
@@ -16,6 +18,8 @@ class AnkiAppCfg:
     type: str = field(validator=validators.instance_of(str))
     number_time_steps: int = field(
         validator=[validators.instance_of(int), validators.gt(0)])
+    # Where the exported decks are stored, "memory" keeps them in the AnkiApp instance, "file" writes them to disk
+    deck_storage: str = field(default="memory", validator=validators.in_(deck_storage_classes.keys()))
 
 
 @register_environment_class
@@ -24,6 +28,9 @@ class AnkiApp(IGUIEnvironment):
     Copied from the gui_app.py and adapted with small changes.
     """
 
+    # reset() restores the snapshot of the app that is recorded after the first reset
+    REUSABLE = True
+
     screen_width = 834
     screen_height = 834
 
@@ -35,7 +42,7 @@ class AnkiApp(IGUIEnvironment):
 
         self.config = AnkiAppCfg(**configuration)
 
-        self.app_controller = AppController()
+        self.app_controller = AppController(deck_storage_classes[self.config.deck_storage]())
 
         self.t = 0
 
@@ -125,6 +132,9 @@ class AnkiApp(IGUIEnvironment):
     def get_number_outputs(self) -> int:
         return 2
 
+    def get_episode_reward_bounds(self) -> Tuple[float, float]:
+        return get_app_episode_reward_bounds(self.config.number_time_steps, self.max_reward)
+
     def reset(self, env_seed: int = None) -> np.ndarray:
         self.app_controller.reset()
         self.t = 0
@@ -1,9 +1,10 @@
-from copy import copy
-
 import numpy as np
-from naturalnets.environments.app_components.reward_element import RewardElement
+from naturalnets.environments.app_components.reward_element import RewardCounter, RewardElement
+from naturalnets.environments.app_components.snapshot import AppSnapshot, get_state_elements
 from naturalnets.environments.app_components.state_element import StateElement
 from naturalnets.environments.anki.pages.main_page import MainPage
+from naturalnets.environments.anki.deck_storage import IDeckStorage
+from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -12,8 +13,11 @@ class AppController:
     Copied from the app_controller.py of GUIApp and adapted with small changes.
     """
 
-    def __init__(self):
-        self.main_page = MainPage()
+    def __init__(self, deck_storage: IDeckStorage):
+        # The profiles and decks of this app, which are shared by all of its pages. Each AppController has its own
+        # ProfileDatabase, so that multiple apps in the same process do not influence each other.
+        self.profile_database = ProfileDatabase(deck_storage)
+        self.main_page = MainPage(self.profile_database)
 
         self._total_state_len = self.get_element_state_len(self.main_page)
 
@@ -24,8 +28,12 @@ class AppController:
         self._states_info = states_info
 
         self.reward_array = None
+        self.reward_counter = None
         self.reset_reward_array()
 
+        # Recorded after the first reset, all further resets restore it
+        self._initial_snapshot = None
+
     def calculate_reward_count(self, reward_count, reward_element: RewardElement):
         reward_count += reward_element.get_reward_count()
 
@@ -37,13 +45,14 @@ class AppController:
     def reset_reward_array(self):
         reward_count = self.calculate_reward_count(0, self.main_page)
         self.reward_array = np.zeros(reward_count, dtype=np.uint8)
+        self.reward_counter = RewardCounter()
         last_reward_index: int = self.assign_reward(0, self.main_page)
         assert last_reward_index == reward_count
 
     def assign_reward(self, current_index, reward_element: RewardElement):
         reward_count = reward_element.get_reward_count()
         reward_element.assign_reward_slice(
-            self.reward_array[current_index:current_index + reward_count])
+            self.reward_array[current_index:current_index + reward_count], self.reward_counter)
         current_index += reward_count
 
         for reward_child in reward_element.get_reward_children():
@@ -52,12 +61,22 @@ class AppController:
         return current_index
 
     def reset(self):
+        if self._initial_snapshot is not None:
+            self._initial_snapshot.restore()
+            # The exported decks may be stored outside of the app (see FileDeckStorage)
+            self.profile_database.deck_database.reset_exported_decks()
+            return
+
         self.reset_reward_array()
         self.main_page.reset_all()
         self._state = np.zeros(self._total_state_len, dtype=np.int8)
         self._last_allocated_state_index: int = 0
         self.assign_state(self.main_page, 0, [])
 
+        self._initial_snapshot = AppSnapshot(
+            [self._state, self.reward_array],
+            [self.reward_counter, self.profile_database] + get_state_elements([self.main_page]))
+
     def get_element_state_len(self, state_element: StateElement) -> int:
         accumulated_len = 0
         for child in state_element.get_children():
@@ -111,9 +130,9 @@ class AppController:
         return self._total_state_len
 
     def handle_click(self, click_position: np.ndarray):
-        previous_reward_array = copy(self.reward_array)
+        previous_reward_count = self.reward_counter.count
         self.main_page.handle_click(click_position)
-        reward = np.count_nonzero(previous_reward_array != self.reward_array)
+        reward = self.reward_counter.count - previous_reward_count
         return reward
 
     def render(self, img: np.ndarray):
@@ -17,6 +17,12 @@ class Card:
     def get_tag(self):
         return self.tag
 
+    def snapshot(self) -> tuple:
+        return self.front, self.back, self.tag
+
+    def restore(self, record: tuple) -> None:
+        self.front, self.back, self.tag = record
+
     """
     Check if the front side includes substring "edited"
     """
@@ -1,7 +1,7 @@
 from typing import List
 from naturalnets.environments.anki.card import Card
-from naturalnets.environments.anki.constants import DeckNames, DeckImportName, PREDEFINED_DECKS_PATH, EXPORTED_DECKS_PATH
-import os
+from naturalnets.environments.anki.constants import DeckNames, DeckImportName
+from naturalnets.environments.anki.deck_storage import IDeckStorage
 
 
 class Deck:
@@ -27,6 +27,16 @@ class Deck:
 
     def get_is_answer_shown(self):
         return self.is_answer_shown
+
+    def snapshot(self) -> tuple:
+        return [(card, card.snapshot()) for card in self.cards], self.study_index, self.is_answer_shown
+
+    def restore(self, record: tuple) -> None:
+        card_records, self.study_index, self.is_answer_shown = record
+        self.cards = [card for card, _ in card_records]
+
+        for card, card_record in card_records:
+            card.restore(card_record)
             
     """
     Proceed to the next card. If the user is at the end of the deck then go back to the first card
@@ -61,19 +71,13 @@ class Deck:
 class DeckDatabase:
 
     """
-    This class holds the currently selected decks, up to a maximum of 5
+    This class holds the currently selected decks, up to a maximum of 5. It is owned by the ProfileDatabase of an
+    AnkiApp, i.e. every AnkiApp has its own decks.
     """
 
-    """
-    Singleton design pattern to ensure that at most one
-    ProfileDatabase is present
-    """
-    def __new__(cls):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(DeckDatabase, cls).__new__(cls)
-        return cls.instance
-    
-    def __init__(self):
+    def __init__(self, deck_storage: IDeckStorage):
+        # Provides the predefined decks and stores the exported decks
+        self.deck_storage = deck_storage
 
         # The names which a deck can get
         self.deck_names = [DeckNames.DECK_NAME_1.value, DeckNames.DECK_NAME_2.value, DeckNames.DECK_NAME_3.value,
@@ -81,11 +85,30 @@ class DeckDatabase:
         # The names of predefined decks
         self.deck_import_names = [DeckImportName.DUTCH_NUMBERS.value, DeckImportName.GERMAN_NUMBERS.value,
                                   DeckImportName.ITALIAN_NUMBERS.value]
+        self.decks: List[Deck] = []
+        self.current_index: int = 0
+
+        self.reset()
+
+    """
+    Sets the decks to three empty decks and selects the first one
+    """
+    def reset(self) -> None:
         # Current decks
-        self.decks: List[Deck] = [Deck(DeckNames.DECK_NAME_1.value), Deck(DeckNames.DECK_NAME_2.value),
-                                  Deck(DeckNames.DECK_NAME_3.value)]
+        self.decks = [Deck(DeckNames.DECK_NAME_1.value), Deck(DeckNames.DECK_NAME_2.value),
+                      Deck(DeckNames.DECK_NAME_3.value)]
         # Index of the currently selected deck
-        self.current_index: int = 0
+        self.current_index = 0
+
+    def snapshot(self) -> tuple:
+        return [(deck, deck.snapshot()) for deck in self.decks], self.current_index
+
+    def restore(self, record: tuple) -> None:
+        deck_records, self.current_index = record
+        self.decks = [deck for deck, _ in deck_records]
+
+        for deck, deck_record in deck_records:
+            deck.restore(deck_record)
 
     deck_names_to_index = {
         "Deck_Name_1": 1,
@@ -147,21 +170,11 @@ class DeckDatabase:
     """
     
     def import_deck(self, deck_import_name: str):
-        path = os.path.join(PREDEFINED_DECKS_PATH, deck_import_name + ".txt")
-        file = open(path, "r", encoding='utf-8')
         deck = Deck(deck_import_name)
-        for line in file.readlines():
-            if '\t' in line:
-                line = line.split('\t')
-                if len(line) == 2:
-                    deck.add_card(Card(line[0], line[1].rstrip("\n"), ""))
-            elif ' ' in line:
-                line = line.split(' ')
-                if len(line) == 2:
-                    deck.add_card(Card(line[0], line[1].rstrip("\n"), ""))
+        for card in self.deck_storage.load_cards(deck_import_name):
+            deck.add_card(card)
         if not (self.is_included(deck_import_name)) and self.is_deck_length_allowed():
             self.decks.append(deck)
-        file.close()
         return deck
 
     """
@@ -196,49 +209,27 @@ class DeckDatabase:
         self.current_index = index
 
     """
-    Provides the number of the files within a directory. It is used for importing and exporting decks.
-    """
-    @staticmethod
-    def count_number_of_files(dir_path: str) -> int:
-        count = 0
-        for path in os.scandir(dir_path):
-            if path.is_file():
-                count += 1
-        return count
-
-    """
-    Deletes all of the files in the exported decks directory
+    Deletes all of the exported decks
     """
-    @staticmethod
-    def reset_exported_decks() -> None:
-        for file in os.scandir(EXPORTED_DECKS_PATH):
-            if file.is_file():
-                os.remove(file)
+    def reset_exported_decks(self) -> None:
+        self.deck_storage.reset_exported_decks()
 
     """
-    Returns true if directory has a .txt file of file_name
+    Returns true if a deck with deck_name has already been exported
     """
-    @staticmethod
-    def is_file_exist(file_name: str, directory: str) -> bool:
-        return os.path.exists(directory + '/' + file_name + '.txt')
+    def is_exported(self, deck_name: str) -> bool:
+        return self.deck_storage.is_exported(deck_name)
 
     """
-    Returns true if number of files in exported decks path is less than 5
+    Returns true if less than 5 decks have been exported
     """
-    @staticmethod
-    def is_exporting_allowed() -> bool:
-        return DeckDatabase.count_number_of_files(EXPORTED_DECKS_PATH) < 5
+    def is_exporting_allowed(self) -> bool:
+        return self.deck_storage.count_exported_decks() < 5
 
     """
-    Converts a deck to a .txt file
+    Exports the deck to the deck storage
     """
-    @staticmethod
-    def export_deck(deck: Deck) -> int:
-        if not (DeckDatabase.is_file_exist(deck.name, EXPORTED_DECKS_PATH)) and (DeckDatabase.is_exporting_allowed()):
-            path = os.path.join(EXPORTED_DECKS_PATH, f"{deck.name}.txt")
-            file = open(path, "w", encoding='utf-8')
-            for card in deck.cards:
-                file.write(card.get_front() + " " + card.back)
-                file.write("\n")
-            file.close()
+    def export_deck(self, deck: Deck) -> int:
+        if not (self.is_exported(deck.name)) and (self.is_exporting_allowed()):
+            self.deck_storage.export_deck(deck.name, deck.cards)
         return DeckDatabase.deck_names_to_index[deck.name]
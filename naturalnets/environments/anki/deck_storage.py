@@ -0,0 +1,121 @@
+import abc
+import os
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from naturalnets.environments.anki.card import Card
+from naturalnets.environments.anki.constants import PREDEFINED_DECKS_PATH, EXPORTED_DECKS_PATH
+
+
+@lru_cache(maxsize=None)
+def load_predefined_deck(deck_import_name: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Parses the predefined deck with the given name and returns the front and back side of its cards. The file is only
+    read once per process, the result is immutable and shared by all decks that are imported from it.
+    """
+    path = os.path.join(PREDEFINED_DECKS_PATH, deck_import_name + ".txt")
+    cards = []
+
+    with open(path, "r", encoding='utf-8') as file:
+        for line in file.readlines():
+            if '\t' in line:
+                line = line.split('\t')
+                if len(line) == 2:
+                    cards.append((line[0], line[1].rstrip("\n")))
+            elif ' ' in line:
+                line = line.split(' ')
+                if len(line) == 2:
+                    cards.append((line[0], line[1].rstrip("\n")))
+
+    return tuple(cards)
+
+
+class IDeckStorage(abc.ABC):
+    """
+    Storage backend of the DeckDatabase, which provides the predefined decks that can be imported and stores the
+    exported decks.
+    """
+
+    def load_cards(self, deck_import_name: str) -> List[Card]:
+        """
+        Returns new cards with the content of the predefined deck with the given name.
+        """
+        return [Card(front, back, "") for front, back in load_predefined_deck(deck_import_name)]
+
+    @abc.abstractmethod
+    def export_deck(self, deck_name: str, cards: List[Card]) -> None:
+        pass
+
+    @abc.abstractmethod
+    def is_exported(self, deck_name: str) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def count_exported_decks(self) -> int:
+        pass
+
+    @abc.abstractmethod
+    def reset_exported_decks(self) -> None:
+        pass
+
+
+class InMemoryDeckStorage(IDeckStorage):
+    """
+    Keeps the exported decks in memory. This is the default, because each AnkiApp has its own storage and no files
+    are written, i.e. many AnkiApps can be used in parallel.
+    """
+
+    def __init__(self):
+        # Maps the name of an exported deck to its content, one line per card
+        self.exported_decks: Dict[str, List[str]] = {}
+
+    def export_deck(self, deck_name: str, cards: List[Card]) -> None:
+        self.exported_decks[deck_name] = [card.get_front() + " " + card.back for card in cards]
+
+    def is_exported(self, deck_name: str) -> bool:
+        return deck_name in self.exported_decks
+
+    def count_exported_decks(self) -> int:
+        return len(self.exported_decks)
+
+    def reset_exported_decks(self) -> None:
+        self.exported_decks.clear()
+
+
+class FileDeckStorage(IDeckStorage):
+    """
+    Writes the exported decks as .txt files into the exported decks directory. Note that this directory is shared by
+    all AnkiApps that use this storage.
+    """
+
+    def __init__(self, exported_decks_path: str = EXPORTED_DECKS_PATH):
+        self.exported_decks_path = exported_decks_path
+        os.makedirs(self.exported_decks_path, exist_ok=True)
+
+    def export_deck(self, deck_name: str, cards: List[Card]) -> None:
+        path = os.path.join(self.exported_decks_path, f"{deck_name}.txt")
+        with open(path, "w", encoding='utf-8') as file:
+            for card in cards:
+                file.write(card.get_front() + " " + card.back)
+                file.write("\n")
+
+    def is_exported(self, deck_name: str) -> bool:
+        return os.path.exists(os.path.join(self.exported_decks_path, deck_name + '.txt'))
+
+    def count_exported_decks(self) -> int:
+        count = 0
+        for path in os.scandir(self.exported_decks_path):
+            if path.is_file():
+                count += 1
+        return count
+
+    def reset_exported_decks(self) -> None:
+        for file in os.scandir(self.exported_decks_path):
+            if file.is_file():
+                os.remove(file)
+
+
+deck_storage_classes = {
+    "memory": InMemoryDeckStorage,
+    "file": FileDeckStorage
+}
@@ -1,5 +1,4 @@
 import os
-import cv2
 import numpy as np
 from naturalnets.environments.anki import ChooseDeckPage
 from naturalnets.environments.anki.pages.main_page_popups.front_and_backside_popup import FrontAndBacksidePopup
@@ -8,7 +7,7 @@ from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.anki.constants import IMAGES_PATH
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 from naturalnets.environments.anki import Card
 
@@ -46,7 +45,7 @@ class AddCardPage(Page, RewardElement):
     TAG_TEXT_X = 198
     TAG_TEXT_Y = 507
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
         # Temporarily set strings
@@ -55,12 +54,12 @@ class AddCardPage(Page, RewardElement):
         self.tag_clipboard_temporary_string = None
 
         # Profile database to fetch the current profile
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         # Deck database of the current profile to add card to the current deck
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
         # Choose deck page enables changing the current deck as well as adding a new deck
-        self.choose_deck = ChooseDeckPage()
+        self.choose_deck = ChooseDeckPage(profile_database)
         # Warning popup that front- and backside strings must be present at the same time to be able to add a new card.
         self.front_and_backside_popup = FrontAndBacksidePopup()
 
@@ -190,6 +189,16 @@ class AddCardPage(Page, RewardElement):
         self.tag_clipboard_temporary_string = None
         self.get_state()[1:4] = 0
 
+    def snapshot(self) -> tuple:
+        return (self.front_side_clipboard_temporary_string, self.back_side_clipboard_temporary_string,
+                self.tag_clipboard_temporary_string, self.front_side_counter, self.back_side_counter,
+                self.tag_counter)
+
+    def restore(self, record: tuple) -> None:
+        (self.front_side_clipboard_temporary_string, self.back_side_clipboard_temporary_string,
+         self.tag_clipboard_temporary_string, self.front_side_counter, self.back_side_counter,
+         self.tag_counter) = record
+
     """
     Checks if the condition for creating a card is satisfied and if yes
     creates a card and adds it to the current deck and resets the string
@@ -230,7 +239,7 @@ class AddCardPage(Page, RewardElement):
     def render(self, img: np.ndarray):
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         # Render choose deck page if open
         if self.choose_deck.is_open():
@@ -1,5 +1,4 @@
 import os
-import cv2
 import numpy as np
 from naturalnets.environments.anki import AnkiAccount
 from naturalnets.environments.anki.constants import IMAGES_PATH
@@ -7,7 +6,7 @@ from naturalnets.environments.anki.pages.main_page_popups.failed_login_popup imp
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -156,12 +155,20 @@ class AnkiLoginPage(Page, RewardElement):
         self.password_clipboard = None
         self.get_state()[1:12] = 0
 
+    def snapshot(self) -> tuple:
+        return (self.current_anki_account, self.username_iterate_index, self.password_iterate_index,
+                self.username_clipboard, self.password_clipboard)
+
+    def restore(self, record: tuple) -> None:
+        (self.current_anki_account, self.username_iterate_index, self.password_iterate_index,
+         self.username_clipboard, self.password_clipboard) = record
+
     """
     Renders anki login page with the failed login popup if open
     """
 
     def render(self, img: np.ndarray):
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         if self.failed_login.is_open():
             img = self.failed_login.render(img)
@@ -1,12 +1,11 @@
 from math import floor
 import os
-import cv2
 import numpy as np
 from naturalnets.environments.anki.pages.main_page_popups.add_deck_popup import AddDeckPopup
 from naturalnets.environments.anki.constants import IMAGES_PATH
 from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.anki.utils import calculate_current_bounding_box
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
 from naturalnets.environments.app_components.bounding_box import BoundingBox
@@ -40,17 +39,17 @@ class ChooseDeckPage(Page, RewardElement):
     TEXT_X = 211
     TEXT_Y = 243
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
         # Profile database to display all the present profiles
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         # Deck database to display all the present decks of the profile
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
 
         # Popup for adding a new deck.
-        self.add_deck_popup = AddDeckPopup()
+        self.add_deck_popup = AddDeckPopup(profile_database)
         self.add_child(self.add_deck_popup)
 
         # Index of the currently selected deck in range [0..4]
@@ -136,6 +135,12 @@ class ChooseDeckPage(Page, RewardElement):
     def reset_index(self):
         self.current_index: int = 0
 
+    def snapshot(self) -> tuple:
+        return self.current_index,
+
+    def restore(self, record: tuple) -> None:
+        self.current_index, = record
+
     """
     Renders the choose deck page with it's add deck popup if open
     """
@@ -143,7 +148,7 @@ class ChooseDeckPage(Page, RewardElement):
     def render(self, img: np.ndarray):
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         if self.add_deck_popup.is_open():
             img = self.add_deck_popup.render(img)
@@ -1,6 +1,5 @@
 from math import floor
 import os
-import cv2
 import numpy as np
 from naturalnets.environments.anki.pages.main_page_popups.add_deck_popup import AddDeckPopup
 from naturalnets.environments.anki.pages.main_page_popups.leads_to_external_website_popup import \
@@ -8,7 +7,7 @@ from naturalnets.environments.anki.pages.main_page_popups.leads_to_external_webs
 from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.anki.utils import calculate_current_bounding_box
 from naturalnets.environments.app_components.bounding_box import BoundingBox
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
 from naturalnets.environments.anki.constants import IMAGES_PATH
@@ -47,7 +46,7 @@ class ChooseDeckStudyPage(Page, RewardElement):
     TEXT_X = 200
     TEXT_Y = 231
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
 
@@ -55,14 +54,14 @@ class ChooseDeckStudyPage(Page, RewardElement):
         self.leads_to_external_website_popup = LeadsToExternalWebsitePopup()
 
         # Popup that appears when add button is clicked
-        self.add_deck_popup = AddDeckPopup()
+        self.add_deck_popup = AddDeckPopup(profile_database)
         self.add_child(self.add_deck_popup)
         self.add_child(self.leads_to_external_website_popup)
 
         # Index of the currently selected deck
         self.current_index: int = 0
 
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
 
@@ -154,6 +153,12 @@ class ChooseDeckStudyPage(Page, RewardElement):
     def reset_index(self):
         self.current_index: int = 0
 
+    def snapshot(self) -> tuple:
+        return self.current_index,
+
+    def restore(self, record: tuple) -> None:
+        self.current_index, = record
+
     """
     Renders the choose deck study page with it's popups if one of them is open
     """
@@ -162,7 +167,7 @@ class ChooseDeckStudyPage(Page, RewardElement):
         # Updates the deck database of the current profile.
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         put_text(img, f"{self.deck_database.get_decks()[self.current_index].get_name()}",
                  (self.CURRENT_DECK_X, self.CURRENT_DECK_Y), font_scale=0.5)
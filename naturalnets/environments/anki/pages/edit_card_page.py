@@ -4,10 +4,9 @@ from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 from naturalnets.environments.anki.utils import print_non_ascii
-import cv2
 import numpy as np
 
 
@@ -32,12 +31,12 @@ class EditCardPage(RewardElement, Page):
     BACK_TEXT_PRINT_BB = BoundingBox(225, 350, 300, 40)
     TAGS_TEXT_PRINT_BB = BoundingBox(225, 485, 300, 36)
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
 
         # Profile database to fetch the currently active profile
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         # Deck database to fetch the currently active deck of the current profile
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
@@ -130,7 +129,7 @@ class EditCardPage(RewardElement, Page):
         # Updates the deck database of the current profile.
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         image = render_onto_bb(image, self.get_bb(), to_render)
         if self.deck_database.get_decks()[self.deck_database.get_current_index()].get_cards()[self.deck_database.get_decks()[self.deck_database.get_current_index()].get_study_index()].get_front() is not None:
             print_non_ascii(img=image,
@@ -1,15 +1,13 @@
 import os
-import cv2
 import numpy as np
-from naturalnets.environments.anki.constants import EXPORTED_DECKS_PATH, IMAGES_PATH
-from naturalnets.environments.anki.deck import DeckDatabase
+from naturalnets.environments.anki.constants import IMAGES_PATH
 from naturalnets.environments.anki.pages.main_page_popups.five_decks_popup import FiveDecksPopup
 from naturalnets.environments.anki.pages.name_exists_popup import NameExistsPopup
 from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.dropdown import Dropdown, DropdownItem
 from naturalnets.environments.app_components.widgets.button import Button
 
@@ -39,11 +37,11 @@ class ExportDeckPage(Page, RewardElement):
     DECK_NUMBER_X = 260
     DECK_NUMBER_Y = 320
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
         # Current profile to select the deck from
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         # Decks of the current profile
         self.deck_database = self.profile_database.get_profiles()[
             self.profile_database.get_current_index()].get_deck_database()
@@ -155,19 +153,18 @@ class ExportDeckPage(Page, RewardElement):
 
     def export_deck(self):
         # Faked version of exporting a deck
-        # if DeckDatabase.count_number_of_files(EXPORTED_DECKS_PATH) == 5:
+        # if not self.deck_database.is_exporting_allowed():
         #    self.five_decks_popup.open()
         if len(self.exported_decks_array) == 5:
             self.five_decks_popup.open()
         elif self.include_dropdown.get_selected_item() is None:
             return
-        # elif DeckDatabase.is_file_exist(self.include_dropdown.get_selected_item().get_value().name,
-        #                                EXPORTED_DECKS_PATH):
+        # elif self.deck_database.is_exported(self.include_dropdown.get_selected_item().get_value().name):
         #    self.name_exists_popup.open()
         elif self.is_exported():
             self.name_exists_popup.open()
         else:
-            # deck_index = DeckDatabase.export_deck(self.include_dropdown.get_selected_item().get_value())
+            # deck_index = self.deck_database.export_deck(self.include_dropdown.get_selected_item().get_value())
             # self.get_state()[deck_index] = 1
             self.exported_decks_array.append(self.current_deck)
             self.register_selected_reward(["exported"])
@@ -179,11 +176,11 @@ class ExportDeckPage(Page, RewardElement):
     """
 
     def render(self, img: np.ndarray):
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         put_text(img, "" if self.current_deck is None else f"{self.current_deck}", (self.DECK_TEXT_X, self.DECK_TEXT_Y),
                  font_scale=0.4)
-        # put_text(img, f"Number of exported decks: {DeckDatabase.count_number_of_files(EXPORTED_DECKS_PATH)}",
+        # put_text(img, f"Number of exported decks: {self.deck_database.deck_storage.count_exported_decks()}",
         #         (self.DECK_NUMBER_X, self.DECK_NUMBER_Y), font_scale=0.5)
         put_text(img, f"Number of exported decks: {len(self.exported_decks_array)}",
                  (self.DECK_NUMBER_X, self.DECK_NUMBER_Y), font_scale=0.5)
@@ -209,7 +206,7 @@ class ExportDeckPage(Page, RewardElement):
     """
     Delete all exported decks
     def reset_exported_decks(self):
-        DeckDatabase.reset_exported_decks()
+        self.deck_database.reset_exported_decks()
         self.get_state()[1:9] = 0
         self.register_selected_reward(["reset"])
     """
@@ -222,3 +219,12 @@ class ExportDeckPage(Page, RewardElement):
 
     def reset_exported_decks_array(self):
         self.exported_decks_array = []
+
+    def snapshot(self) -> tuple:
+        # Opening this page creates a new dropdown (with new items), thus the current dropdown is recorded as well
+        return self.current_deck, list(self.exported_decks_array), self.dropdown_items, self.include_dropdown
+
+    def restore(self, record: tuple) -> None:
+        self.current_deck, exported_decks_array, self.dropdown_items, self.include_dropdown = record
+        # The exported decks are appended in place, thus they must not be the recorded list
+        self.exported_decks_array = list(exported_decks_array)
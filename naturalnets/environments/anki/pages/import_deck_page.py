@@ -1,6 +1,5 @@
 from math import floor
 import os
-import cv2
 import numpy as np
 from naturalnets.environments.anki import NameExistsPopup
 from naturalnets.environments.anki.pages.main_page_popups.five_decks_popup import FiveDecksPopup
@@ -12,8 +11,10 @@ from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.anki.constants import IMAGES_PATH
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
+from naturalnets.environments.app_components.snapshot import (restore_detached_state_elements,
+                                                              snapshot_detached_state_elements)
 from naturalnets.environments.app_components.widgets.button import Button
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 
 
 class ImportDeckPage(Page, RewardElement):
@@ -34,12 +35,12 @@ class ImportDeckPage(Page, RewardElement):
     CURRENT_DECK_NAME_X = 95
     CURRENT_DECK_NAME_Y = 120
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
 
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
 
-        self.import_deck_popup = ImportDeckSelectPage()
+        self.import_deck_popup = ImportDeckSelectPage(profile_database)
         self.name_exists_popup = NameExistsPopup()
         self.five_decks_popup = FiveDecksPopup()
         self.leads_to_external_website_popup = LeadsToExternalWebsitePopup()
@@ -47,7 +48,7 @@ class ImportDeckPage(Page, RewardElement):
         self.add_children([self.import_deck_popup, self.name_exists_popup,
                            self.five_decks_popup, self.leads_to_external_website_popup])
         # Profile database to fetch the currently active profile
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
 
@@ -180,7 +181,7 @@ class ImportDeckPage(Page, RewardElement):
     def render(self, img: np.ndarray):
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         put_text(img, f"Current import deck: {self.import_deck_popup.get_current_import_name()}", (self.CURRENT_DECK_NAME_X, self.CURRENT_DECK_NAME_Y),
                  font_scale=0.5)
@@ -223,14 +224,14 @@ class ImportDeckSelectPage(Page, RewardElement):
     FIRST_DECK_X = 191
     FIRST_DECK_Y = 225
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
 
         self.current_index = 0
         self.leads_to_external_website_popup = LeadsToExternalWebsitePopup()
         # Profile database to fetch current profile
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         # Deck database to fetch the decks of the current profile
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
@@ -344,12 +345,21 @@ class ImportDeckSelectPage(Page, RewardElement):
     def reset_current_index(self):
         self.current_index = 0
 
+    def snapshot(self) -> tuple:
+        # The popup is no child of this page, thus it is recorded here with its state
+        return (self.current_index, self.current_import_name,
+                snapshot_detached_state_elements([self.leads_to_external_website_popup]))
+
+    def restore(self, record: tuple) -> None:
+        self.current_index, self.current_import_name, detached_records = record
+        restore_detached_state_elements(detached_records)
+
     """
     Renders the image of this popup
     """
 
     def render(self, img: np.ndarray):
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         if self.leads_to_external_website_popup.is_open():
             img = self.leads_to_external_website_popup.render(img)
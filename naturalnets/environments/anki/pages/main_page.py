@@ -1,7 +1,6 @@
 from math import floor
 import os
 from typing import List
-import cv2
 import numpy as np
 
 from naturalnets.environments.anki.utils import calculate_current_bounding_box, print_non_ascii
@@ -22,7 +21,7 @@ from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.anki.constants import IMAGES_PATH
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.dropdown import Dropdown, DropdownItem
 from naturalnets.environments.anki import ChooseDeckStudyPage
 from naturalnets.environments.anki import CheckMediaPage
@@ -93,46 +92,36 @@ class MainPage(Page, RewardElement):
     DECKS_X = 126
     DECKS_Y = 271
 
-    """
-    Singleton design pattern to ensure that at most one
-    MainPage is present
-    """
-
-    def __new__(cls):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(MainPage, cls).__new__(cls)
-        return cls.instance
-
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
 
         # All the pages that can be directly accessed from the main page
-        self.profile_page = ProfilePage()
-        self.import_deck_page = ImportDeckPage()
-        self.export_deck_page = ExportDeckPage()
+        self.profile_page = ProfilePage(profile_database)
+        self.import_deck_page = ImportDeckPage(profile_database)
+        self.export_deck_page = ExportDeckPage(profile_database)
         self.check_media_page = CheckMediaPage()
         self.preferences_page = PreferencesPage()
         self.about_page = AboutPage()
-        self.add_card_page = AddCardPage()
+        self.add_card_page = AddCardPage(profile_database)
         self.anki_login = AnkiLoginPage()
-        self.add_deck_popup_page = AddDeckPopup()
-        self.edit_card_page = EditCardPage()
+        self.add_deck_popup_page = AddDeckPopup(profile_database)
+        self.edit_card_page = EditCardPage(profile_database)
 
         # Profile database to access the currently active profile
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         # Deck database to fetch the decks of a profile
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
 
         # Popups that can be opened from the main page
         self.leads_to_external_website_popup_page = LeadsToExternalWebsitePopup()
-        self.delete_current_deck_check_popup_page = DeleteCurrentDeckPopup()
+        self.delete_current_deck_check_popup_page = DeleteCurrentDeckPopup(profile_database)
         self.at_least_one_deck_popup_page = AtLeastOneDeckPopup()
-        self.reset_collection_popup_page = ResetCollectionPopup()
+        self.reset_collection_popup_page = ResetCollectionPopup(profile_database)
         self.no_card_popup_page = NoCardPopup()
         self.at_least_one_card_popup_page = AtLeastOneCardPopup()
-        self.choose_deck_study_page = ChooseDeckStudyPage()
+        self.choose_deck_study_page = ChooseDeckStudyPage(profile_database)
 
         self.pages: List[Page] = [self.profile_page, self.import_deck_page, self.export_deck_page,
                                   self.choose_deck_study_page,
@@ -515,10 +504,10 @@ class MainPage(Page, RewardElement):
     """
 
     def render_deck_page(self, img: np.ndarray):
-        frame = cv2.imread(self.IMG_PATH)
+        frame = load_image(self.IMG_PATH)
         render_onto_bb(img, self.WINDOW_BB, frame)
 
-        book_logo = cv2.imread(os.path.join(IMAGES_PATH, "book_logo.png"))
+        book_logo = load_image(os.path.join(IMAGES_PATH, "book_logo.png"))
 
         if self.is_logo_enabled:
             render_onto_bb(img, self.BOOK_LOGO, book_logo)
@@ -544,11 +533,11 @@ class MainPage(Page, RewardElement):
     """
 
     def render_study_page(self, image: np.ndarray):
-        frame = cv2.imread(self.IMG_PATH_STUDY)
+        frame = load_image(self.IMG_PATH_STUDY)
         render_onto_bb(image, self.WINDOW_BB, frame)
-        decks_button = cv2.imread(self.DECKS_BUTTON_PATH)
+        decks_button = load_image(self.DECKS_BUTTON_PATH)
         render_onto_bb(image, BoundingBox(501, 46, 132, 30), decks_button)
-        book_logo = cv2.imread(os.path.join(IMAGES_PATH, "book_logo.png"))
+        book_logo = load_image(os.path.join(IMAGES_PATH, "book_logo.png"))
         if self.is_logo_enabled:
             render_onto_bb(image, self.BOOK_LOGO, book_logo)
         put_text(image, f"Current deck: {self.deck_database.get_decks()[self.deck_database.get_current_index()].get_name()}", (484, 142),
@@ -567,7 +556,7 @@ class MainPage(Page, RewardElement):
             print_non_ascii(img=image,
                             text=f"Answer : {self.deck_database.get_decks()[self.deck_database.get_current_index()].get_cards()[self.deck_database.get_decks()[self.deck_database.get_current_index()].get_study_index()].get_back()}",
                             bounding_box=BoundingBox(42, 332, 600, 100), font_size=25, dimension=(100, 600, 3))
-            next_button = cv2.imread(self.NEXT_BUTTON_PATH)
+            next_button = load_image(self.NEXT_BUTTON_PATH)
             render_onto_bb(image, BoundingBox(327, 747, 164, 30), next_button)
         if self.edit_card_page.is_open():
             image = self.edit_card_page.render(image)
@@ -685,3 +674,9 @@ class MainPage(Page, RewardElement):
             profile.deck_database.default_decks()
         self.get_state()[1:self.deck_database.decks_length()+1] = 1
         self.get_state()[self.deck_database.decks_length()+1:6] = 0
+
+    def snapshot(self) -> tuple:
+        return self.opened_dd, self.is_logo_enabled
+
+    def restore(self, record: tuple) -> None:
+        self.opened_dd, self.is_logo_enabled = record
@@ -1,5 +1,4 @@
 import os
-import cv2
 import numpy as np
 from naturalnets.environments.anki.pages.main_page_popups.five_decks_popup import FiveDecksPopup
 from naturalnets.environments.anki.pages.name_exists_popup import NameExistsPopup
@@ -8,7 +7,7 @@ from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
 from naturalnets.environments.app_components.bounding_box import BoundingBox
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -35,7 +34,7 @@ class AddDeckPopup(Page, RewardElement):
     TEXT_POSITION_X = 181
     TEXT_POSITION_Y = 302
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
 
@@ -44,7 +43,7 @@ class AddDeckPopup(Page, RewardElement):
         # pops up when the name of the deck already exists
         self.name_exists_popup = NameExistsPopup()
         # database containing current profiles
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         # database containing current decks
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
@@ -130,7 +129,7 @@ class AddDeckPopup(Page, RewardElement):
         # First line synchronizes the self.deck_database attribute with the current database.
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         if self.current_field_string is not None:
             put_text(img, f"{self.current_field_string}",
@@ -163,3 +162,9 @@ class AddDeckPopup(Page, RewardElement):
 
     def reset_iterate_index(self):
         self.deck_iterate_index = 0
+
+    def snapshot(self) -> tuple:
+        return self.deck_iterate_index, self.current_field_string
+
+    def restore(self, record: tuple) -> None:
+        self.deck_iterate_index, self.current_field_string = record
@@ -1,11 +1,10 @@
 import os
-import cv2
 import numpy as np
 from naturalnets.environments.anki.constants import IMAGES_PATH
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -61,6 +60,6 @@ class AtLeastOneCardPopup(Page, RewardElement):
     """
 
     def render(self, img: np.ndarray):
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         return img
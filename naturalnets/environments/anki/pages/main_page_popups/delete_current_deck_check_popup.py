@@ -1,5 +1,4 @@
 import os
-import cv2
 
 import numpy as np
 from naturalnets.environments.anki.constants import IMAGES_PATH
@@ -7,7 +6,7 @@ from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -28,11 +27,11 @@ class DeleteCurrentDeckPopup(Page, RewardElement):
     YES_BB = BoundingBox(448, 347, 85, 24)
     NO_BB = BoundingBox(559, 347, 85, 24)
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
         # Profile database is necessary to fetch the currently active profile
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         # Deck database is necessary to fetch the decks of a profile
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
@@ -88,6 +87,6 @@ class DeleteCurrentDeckPopup(Page, RewardElement):
         # Updates the current deck database.
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         return img
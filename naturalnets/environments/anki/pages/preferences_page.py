@@ -1,6 +1,5 @@
 import os
 from typing import List
-import cv2
 import numpy as np
 from naturalnets.environments.anki.constants import IMAGES_PATH, AnkiLanguages, DeckAddType, VideoDriver, VoiceRecorder
 from naturalnets.environments.anki.pages.main_page_popups.leads_to_external_website_popup \
@@ -8,7 +7,9 @@ from naturalnets.environments.anki.pages.main_page_popups.leads_to_external_webs
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page, Widget
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import render_onto_bb, put_text
+from naturalnets.environments.app_components.snapshot import (restore_detached_state_elements,
+                                                              snapshot_detached_state_elements)
+from naturalnets.environments.app_components.utils import render_onto_bb, put_text, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 from naturalnets.environments.app_components.widgets.check_box import CheckBox
 from naturalnets.environments.app_components.widgets.dropdown import Dropdown, DropdownItem
@@ -99,15 +100,6 @@ class PreferencesPage(RewardElement, Page):
     BACKUP_NUMBER_X = 255
     BACKUP_NUMBER_Y = 208
 
-    """
-       Singleton design pattern to ensure that at most one
-       PreferencesPage is present
-    """
-    def __new__(cls):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(PreferencesPage, cls).__new__(cls)
-        return cls.instance
-
     def __init__(self):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB,
                       self.PREFERENCES_BASIC_IMG_PATH)
@@ -655,7 +647,7 @@ class PreferencesPage(RewardElement, Page):
 
     def render(self, img: np.ndarray):
         if self.get_state()[1] == 1:
-            to_render = cv2.imread(self.PREFERENCES_BASIC_IMG_PATH)
+            to_render = load_image(self.PREFERENCES_BASIC_IMG_PATH)
             img = render_onto_bb(img, self.get_bb(), to_render)
             put_text(img, f"{self.user_interface}",
                      (self.USER_INTERFACE_X, self.USER_INTERFACE_Y), font_scale=0.4)
@@ -671,7 +663,7 @@ class PreferencesPage(RewardElement, Page):
             if self.open_dd is not None:
                 img = self.open_dd.render(img)
         elif self.get_state()[2] == 1:
-            to_render = cv2.imread(self.PREFERENCES_SCHEDULING_IMG_PATH)
+            to_render = load_image(self.PREFERENCES_SCHEDULING_IMG_PATH)
             img = render_onto_bb(img, self.get_bb(), to_render)
             for widget in self.scheduling_window_widgets:
                 if isinstance(widget, CheckBox):
@@ -683,13 +675,13 @@ class PreferencesPage(RewardElement, Page):
             put_text(img, f"{self.timebox_time}",
                      (self.TIMEBOX_TIME_X, self.TIMEBOX_TIME_Y), font_scale=0.4)
         elif self.get_state()[3] == 1:
-            to_render = cv2.imread(self.PREFERENCES_NETWORK_IMG_PATH)
+            to_render = load_image(self.PREFERENCES_NETWORK_IMG_PATH)
             img = render_onto_bb(img, self.get_bb(), to_render)
             for widget in self.network_window_widgets:
                 if isinstance(widget, CheckBox):
                     img = widget.render(img)
         elif self.get_state()[4] == 1:
-            to_render = cv2.imread(self.PREFERENCES_BACKUP_IMG_PATH)
+            to_render = load_image(self.PREFERENCES_BACKUP_IMG_PATH)
             img = render_onto_bb(img, self.get_bb(), to_render)
             put_text(img, f"{self.backup_number}",
                      (self.BACKUP_NUMBER_X, self.BACKUP_NUMBER_Y), font_scale=0.4)
@@ -722,3 +714,14 @@ class PreferencesPage(RewardElement, Page):
         for widget in self.network_window_widgets:
             if isinstance(widget, CheckBox):
                 widget.get_state()[0] = 0
+
+    def snapshot(self) -> tuple:
+        # The dropdowns and checkboxes are no children of this page, thus they are recorded here with their states
+        return (self.current_search_text, self.open_dd, self.backup_number, self.user_interface, self.next_day,
+                self.learn_ahead, self.timebox_time,
+                snapshot_detached_state_elements(self.basic_window_dropdowns + list(self.checkboxes_to_str)))
+
+    def restore(self, record: tuple) -> None:
+        (self.current_search_text, self.open_dd, self.backup_number, self.user_interface, self.next_day,
+         self.learn_ahead, self.timebox_time, detached_records) = record
+        restore_detached_state_elements(detached_records)
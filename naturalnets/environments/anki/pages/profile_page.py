@@ -1,5 +1,4 @@
 from math import floor
-import cv2
 import numpy as np
 import os
 from naturalnets.environments.anki.pages.profile_page_popups.add_profile_popup import AddProfilePopup
@@ -9,7 +8,7 @@ from naturalnets.environments.anki.pages.profile_page_popups.downgrade_popup imp
 from naturalnets.environments.anki.pages.profile_page_popups.at_least_one_profile_popup import AtLeastOneProfilePopup
 from naturalnets.environments.anki.pages.reset_collection_popup import ResetCollectionPopup
 from naturalnets.environments.anki.utils import calculate_current_bounding_box
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.widgets.button import Button
 from naturalnets.environments.app_components.page import Page
@@ -50,28 +49,19 @@ class ProfilePage(Page, RewardElement):
     PROFILE_TEXT_X = 152
     PROFILE_TEXT_Y = 189
 
-    """
-       Singleton design pattern to ensure that at most one
-       ProfilePage is present
-    """
-    def __new__(cls):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(ProfilePage, cls).__new__(cls)
-        return cls.instance
-
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
 
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
         self.current_index = 0
         # Popups of this page
-        self.add_profile_popup_page = AddProfilePopup()
-        self.rename_profile_page = RenameProfilePopup()
-        self.delete_profile_popup_page = DeleteProfilePopup()
-        self.reset_collection_popup_page = ResetCollectionPopup()
+        self.add_profile_popup_page = AddProfilePopup(profile_database)
+        self.rename_profile_page = RenameProfilePopup(profile_database)
+        self.delete_profile_popup_page = DeleteProfilePopup(profile_database)
+        self.reset_collection_popup_page = ResetCollectionPopup(profile_database)
         self.downgrade_popup_page = DowngradePopup()
         self.at_least_one_profile_popup = AtLeastOneProfilePopup()
         # To display the current profiles profile database is necessary
@@ -172,7 +162,7 @@ class ProfilePage(Page, RewardElement):
         # Updates the deck database
         self.deck_database = self.profile_database.get_profiles(
         )[self.profile_database.get_current_index()].get_deck_database()
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         put_text(img, f"Selected profile: {self.profile_database.get_profiles()[self.profile_database.get_current_index()].get_name()}",
                  (self.CURRENT_PROFILE_X, self.CURRENT_PROFILE_Y), font_scale=0.4)
@@ -219,3 +209,9 @@ class ProfilePage(Page, RewardElement):
         self.get_state()[4:6] = 0
         self.get_state()[6] = 1
         self.get_state()[7:11] = 0
+
+    def snapshot(self) -> tuple:
+        return self.current_index,
+
+    def restore(self, record: tuple) -> None:
+        self.current_index, = record
@@ -1,5 +1,4 @@
 import os
-import cv2
 
 import numpy as np
 from naturalnets.environments.anki.constants import IMAGES_PATH
@@ -9,7 +8,7 @@ from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -30,14 +29,14 @@ class AddProfilePopup(Page, RewardElement):
     TEXT_X = 191
     TEXT_Y = 359
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
         # Popups warning that the profile cannot be created
         self.name_exists_popup = NameExistsPopup()
         self.five_profiles_popup = FiveProfilesPopup()
         # Contains the current profiles
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         self.add_child(self.name_exists_popup)
         self.add_child(self.five_profiles_popup)
         self.profile_iterate_index = 0
@@ -138,7 +137,7 @@ class AddProfilePopup(Page, RewardElement):
     """
 
     def render(self, img: np.ndarray):
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         put_text(img, "" if self.current_field_string is None else self.current_field_string,
                  (self.TEXT_X, self.TEXT_Y), font_scale=0.5)
@@ -156,3 +155,9 @@ class AddProfilePopup(Page, RewardElement):
 
     def reset_iterate_index(self):
         self.profile_iterate_index = 0
+
+    def snapshot(self) -> tuple:
+        return self.profile_iterate_index, self.current_field_string
+
+    def restore(self, record: tuple) -> None:
+        self.profile_iterate_index, self.current_field_string = record
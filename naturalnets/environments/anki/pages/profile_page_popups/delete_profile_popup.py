@@ -1,5 +1,4 @@
 import os
-import cv2
 
 import numpy as np
 from naturalnets.environments.anki.constants import IMAGES_PATH
@@ -7,7 +6,7 @@ from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -23,10 +22,10 @@ class DeleteProfilePopup(Page, RewardElement):
     YES_BUTTON_BB = BoundingBox(478, 376, 84, 26)
     NO_BUTTON_BB = BoundingBox(586, 375, 84, 26)
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         self.yes_button: Button = Button(
             self.YES_BUTTON_BB, self.delete_profile)
         self.no_button: Button = Button(self.NO_BUTTON_BB, self.close)
@@ -87,6 +86,6 @@ class DeleteProfilePopup(Page, RewardElement):
     """
 
     def render(self, img: np.ndarray):
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         return img
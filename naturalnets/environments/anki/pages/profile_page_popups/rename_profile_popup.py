@@ -1,5 +1,4 @@
 import os
-import cv2
 
 import numpy as np
 from naturalnets.environments.anki.constants import IMAGES_PATH
@@ -8,7 +7,7 @@ from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -30,12 +29,12 @@ class RenameProfilePopup(RewardElement, Page):
     TEXT_X = 191
     TEXT_Y = 359
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.WINDOW_BB, self.IMG_PATH)
         RewardElement.__init__(self)
 
         # Database of the profiles
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         self.name_exists_popup_page = NameExistsPopup()
 
         self.profile_iterate_index = 0
@@ -135,7 +134,7 @@ class RenameProfilePopup(RewardElement, Page):
     """
 
     def render(self, img: np.ndarray):
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         if self.name_exists_popup_page.is_open():
             img = self.name_exists_popup_page.render(img)
@@ -145,3 +144,9 @@ class RenameProfilePopup(RewardElement, Page):
 
     def reset_iterate_index(self):
         self.profile_iterate_index = 0
+
+    def snapshot(self) -> tuple:
+        return self.profile_iterate_index, self.current_field_string
+
+    def restore(self, record: tuple) -> None:
+        self.profile_iterate_index, self.current_field_string = record
@@ -1,12 +1,11 @@
 import os
-import cv2
 import numpy as np
 from naturalnets.environments.anki.constants import IMAGES_PATH
 from naturalnets.environments.anki.profile import ProfileDatabase
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -25,12 +24,12 @@ class ResetCollectionPopup(Page, RewardElement):
     YES_BUTTON_BB = BoundingBox(478, 377, 82, 24)
     NO_BUTTON_BB = BoundingBox(586, 377, 84, 24)
 
-    def __init__(self):
+    def __init__(self, profile_database: ProfileDatabase):
         Page.__init__(self, self.STATE_LEN, self.BOUNDING_BOX, self.IMG_PATH)
         RewardElement.__init__(self)
 
         # Profile database to set to the default profiles with default decks
-        self.profile_database = ProfileDatabase()
+        self.profile_database = profile_database
         self.no_button: Button = Button(self.NO_BUTTON_BB, self.close)
 
     """
@@ -79,6 +78,6 @@ class ResetCollectionPopup(Page, RewardElement):
     """
 
     def render(self, img: np.ndarray):
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         return img
@@ -1,6 +1,7 @@
 from typing import Final
 from naturalnets.environments.anki.constants import ProfileNames
 from naturalnets.environments.anki.deck import DeckDatabase
+from naturalnets.environments.anki.deck_storage import IDeckStorage
 
 
 class Profile:
@@ -8,9 +9,9 @@ class Profile:
     A profile is composed of a name and it's decks aka DeckDatabase
     """
 
-    def __init__(self, profile_name: str):
+    def __init__(self, profile_name: str, deck_database: DeckDatabase):
         self.name = profile_name
-        self.deck_database = DeckDatabase()
+        self.deck_database = deck_database
 
     def get_name(self):
         return self.name
@@ -18,27 +19,29 @@ class Profile:
     def get_deck_database(self):
         return self.deck_database
 
+    def snapshot(self) -> tuple:
+        return self.name,
 
-class ProfileDatabase:
-    """
-    This database contains the current profiles
-    """
+    def restore(self, record: tuple) -> None:
+        self.name, = record
 
+
+class ProfileDatabase:
     """
-    Singleton design pattern to ensure that at most one
-    ProfileDatabase is present
+    This database contains the current profiles. Every AnkiApp creates its own ProfileDatabase and passes it to all of
+    its pages, so that multiple AnkiApp instances can be used independently of each other in the same process.
     """
-    def __new__(cls):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(ProfileDatabase, cls).__new__(cls)
-        return cls.instance
 
-    def __init__(self):
+    def __init__(self, deck_storage: IDeckStorage):
         self.profile_names: Final = [ProfileNames.ALICE.value, ProfileNames.BOB.value, ProfileNames.CAROL.value,
                                      ProfileNames.DENNIS.value, ProfileNames.EVA.value]
-        self.profiles = [Profile(ProfileNames.ALICE.value), Profile(ProfileNames.BOB.value), Profile(ProfileNames.CAROL.value)]
+        # The profiles of the app share their decks
+        self.deck_database = DeckDatabase(deck_storage)
+        self.profiles = [Profile(ProfileNames.ALICE.value, self.deck_database),
+                         Profile(ProfileNames.BOB.value, self.deck_database),
+                         Profile(ProfileNames.CAROL.value, self.deck_database)]
         self.current_index: int = 0
-        
+
         for profile in self.profiles:
             profile.deck_database.default_decks()
 
@@ -54,6 +57,20 @@ class ProfileDatabase:
     def set_current_index(self, index: int):
         self.current_index = index
 
+    def snapshot(self) -> tuple:
+        # The profiles share the DeckDatabase, thus it is recorded only once
+        return ([(profile, profile.snapshot()) for profile in self.profiles], self.current_index,
+                self.deck_database.snapshot())
+
+    def restore(self, record: tuple) -> None:
+        profile_records, self.current_index, deck_database_record = record
+        self.profiles = [profile for profile, _ in profile_records]
+
+        for profile, profile_record in profile_records:
+            profile.restore(profile_record)
+
+        self.deck_database.restore(deck_database_record)
+
     """
     Adding a profile is allowed if there are less than 5 profiles
     """
@@ -76,7 +93,8 @@ class ProfileDatabase:
     Creates a new profile with profile_name and appends it to the list of profiles.
     """
     def create_profile(self, profile_name: str) -> None:
-        profile = Profile(profile_name)
+        profile = Profile(profile_name, self.deck_database)
+        profile.get_deck_database().reset()
         profile.get_deck_database().default_decks()
         self.profiles.append(profile)
 
@@ -107,6 +125,8 @@ class ProfileDatabase:
     Sets the current profiles of the application to a predefined set of profiles
     """
     def default_profiles(self) -> None:
-        self.profiles = [Profile(ProfileNames.ALICE.value), Profile(ProfileNames.BOB.value),
-                         Profile(ProfileNames.CAROL.value)]
+        self.deck_database.reset()
+        self.profiles = [Profile(ProfileNames.ALICE.value, self.deck_database),
+                         Profile(ProfileNames.BOB.value, self.deck_database),
+                         Profile(ProfileNames.CAROL.value, self.deck_database)]
         self.current_index: int = 0
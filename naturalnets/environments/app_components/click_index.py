@@ -0,0 +1,147 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from naturalnets.environments.app_components.interfaces import Clickable
+
+
+class ClickIndex:
+    """Spatial index over the bounding-boxes of a list of Clickables, used for hit-testing and for finding the
+    nearest Clickable to a click position.
+
+    For hit-testing, the screen is divided into a grid of square cells, and each cell holds the (few) elements whose
+    bounding-box overlaps the cell. A click is thus only tested against the elements of its cell instead of all
+    elements. The coordinates of the bounding-boxes are stored as plain integers, such that neither get_bb() nor
+    BoundingBox.distance_to_point() have to be called for each element when searching the nearest element.
+
+    The index is built for the current bounding-boxes of the elements, i.e. a new index has to be built if the elements
+    or their bounding-boxes change. It is therefore meant for groups of elements with a fixed layout, e.g. the menu
+    buttons of a window, or for the clickable elements of a single step.
+    """
+
+    def __init__(self, elements: Sequence[Clickable], cell_size: int = 32):
+        """
+        Args:
+            elements (Sequence[Clickable]): The indexed elements. If the bounding-boxes of multiple elements contain
+                a click position, they are returned in the order of this sequence.
+            cell_size (int): The width and height of the grid cells in pixels.
+        """
+        # The index is immutable (apart from the lazily built grid), thus an AppSnapshot does not need to restore it
+        self.elements: Tuple[Clickable, ...] = tuple(elements)
+        self.cell_size = cell_size
+
+        # (x1, y1, x2, y2) of the bounding-box of each element
+        self.coordinates: Tuple[Tuple[int, int, int, int], ...] = tuple(
+            (int(bb.x1), int(bb.y1), int(bb.x2), int(bb.y2)) for bb in (element.get_bb() for element in self.elements)
+        )
+
+        # Maps a grid cell (column, row) to the indices of the elements that overlap it, in ascending order. Only built
+        # on the first hit-test, since an index that is only used to find the nearest element does not need it.
+        self._cells: Optional[Dict[Tuple[int, int], Tuple[int, ...]]] = None
+
+    def _build_cells(self) -> Dict[Tuple[int, int], Tuple[int, ...]]:
+        cells: Dict[Tuple[int, int], List[int]] = {}
+        for i, (x1, y1, x2, y2) in enumerate(self.coordinates):
+            for column in range(x1 // self.cell_size, x2 // self.cell_size + 1):
+                for row in range(y1 // self.cell_size, y2 // self.cell_size + 1):
+                    cells.setdefault((column, row), []).append(i)
+
+        return {cell: tuple(indices) for cell, indices in cells.items()}
+
+    def get_clicked_elements(self, click_position: np.ndarray) -> List[Clickable]:
+        """Returns all elements whose bounding-box contains the given click position (including its borders), see
+        BoundingBox.is_point_inside()."""
+        if self._cells is None:
+            self._cells = self._build_cells()
+
+        x, y = int(click_position[0]), int(click_position[1])
+
+        try:
+            candidates = self._cells[(x // self.cell_size, y // self.cell_size)]
+        except KeyError:
+            return []
+
+        clicked_elements = []
+        for i in candidates:
+            x1, y1, x2, y2 = self.coordinates[i]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                clicked_elements.append(self.elements[i])
+
+        return clicked_elements
+
+    def get_clicked_element(self, click_position: np.ndarray) -> Optional[Clickable]:
+        """Returns the first element whose bounding-box contains the given click position, or None."""
+        clicked_elements = self.get_clicked_elements(click_position)
+
+        if len(clicked_elements) == 0:
+            return None
+
+        return clicked_elements[0]
+
+    def get_nearest_element(self, click_position: np.ndarray,
+                            nearest_label_image: Optional[np.ndarray] = None) -> Optional[Clickable]:
+        """Returns the element with the smallest distance between its bounding-box and the given click position
+        (see BoundingBox.distance_to_point()), or None if the index is empty. If multiple elements have the same
+        distance, the first one is returned.
+
+        Args:
+            click_position (np.ndarray): The click position.
+            nearest_label_image (Optional[np.ndarray]): The label image of the coordinates of this index, see
+                create_nearest_label_image(). If given, the nearest element of a click position inside the image is
+                looked up instead of calculated.
+        """
+        x, y = int(click_position[0]), int(click_position[1])
+
+        if nearest_label_image is not None and 0 <= y < nearest_label_image.shape[0] \
+                and 0 <= x < nearest_label_image.shape[1]:
+            return self.elements[nearest_label_image[y, x]]
+
+        nearest_element = None
+        minimal_squared_distance = None
+
+        for element, (x1, y1, x2, y2) in zip(self.elements, self.coordinates):
+            dx = max(x1 - x, 0, x - x2)
+            dy = max(y1 - y, 0, y - y2)
+
+            # The squared distance has the same order as the distance and is exact for integer coordinates
+            squared_distance = dx * dx + dy * dy
+
+            if minimal_squared_distance is None or squared_distance < minimal_squared_distance:
+                nearest_element = element
+                minimal_squared_distance = squared_distance
+
+        return nearest_element
+
+
+def create_nearest_label_image(coordinates: Sequence[Tuple[int, int, int, int]], width: int,
+                               height: int) -> np.ndarray:
+    """Returns an image of the given size, which holds for each pixel the index of the bounding-box (given by its
+    coordinates (x1, y1, x2, y2)) that is nearest to the pixel. If multiple bounding-boxes have the same distance, the
+    first one is used, like in ClickIndex.get_nearest_element().
+
+    The image only depends on the coordinates, thus it can be shared by all ClickIndices with the same coordinates,
+    e.g. by all states of an app that show the same clickable elements.
+    """
+    assert len(coordinates) > 0, "The nearest label image requires at least one bounding-box"
+
+    x = np.arange(width)
+    y = np.arange(height)[:, np.newaxis]
+
+    nearest_label_image = np.zeros((height, width), dtype=np.uint8 if len(coordinates) <= 256 else np.int32)
+    minimal_squared_distances = None
+
+    for i, (x1, y1, x2, y2) in enumerate(coordinates):
+        dx = np.maximum(np.maximum(x1 - x, 0), x - x2)
+        dy = np.maximum(np.maximum(y1 - y, 0), y - y2)
+        squared_distances = dx * dx + dy * dy
+
+        if minimal_squared_distances is None:
+            minimal_squared_distances = squared_distances
+            continue
+
+        nearer = squared_distances < minimal_squared_distances
+        nearest_label_image[nearer] = i
+        minimal_squared_distances[nearer] = squared_distances[nearer]
+
+    nearest_label_image.setflags(write=False)
+    return nearest_label_image
@@ -1,13 +1,12 @@
 from abc import abstractmethod
 from typing import List
 
-import cv2
 import numpy as np
 
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.interfaces import Clickable, HasPopups
 from naturalnets.environments.app_components.state_element import StateElement
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_image
 
 
 class Widget(StateElement, Clickable):
@@ -100,7 +99,7 @@ class Page(StateElement, Clickable, HasPopups):
 
     def render(self, img: np.ndarray):
         """Renders this page as well as all of its widgets to the given image."""
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
         for widget in self.get_widgets():
             img = widget.render(img)
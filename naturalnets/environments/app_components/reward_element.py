@@ -1,11 +1,28 @@
 import abc
-from typing import List
+from typing import List, Optional
 
 import numpy as np
 
 from naturalnets.environments.app_components.utils import generate_reward_mapping_from_template
 
 
+class RewardCounter:
+    """
+    Counts the rewards of an app that have been registered, i.e. the number of entries of the reward array that have
+    been set from 0 to 1. The reward of a click is then the difference of the count before and after the click, which
+    does not require copying and comparing the reward array.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def snapshot(self) -> tuple:
+        return self.count,
+
+    def restore(self, record: tuple) -> None:
+        self.count, = record
+
+
 class RewardElement(abc.ABC):
     """
     Elements that give out reward for actions should inherit this class.
@@ -27,6 +44,7 @@ class RewardElement(abc.ABC):
     def __init__(self):
         self.reward_mapping, self.reward_count = None, None
         self.reward_array = None
+        self.reward_counter: Optional[RewardCounter] = None
         self.create_reward_mapping()
 
         self._reward_children: List["RewardElement"] = []
@@ -43,14 +61,20 @@ class RewardElement(abc.ABC):
     def get_reward_count(self):
         return self.reward_count
 
-    def assign_reward_slice(self, reward_slice: np.ndarray):
+    def assign_reward_slice(self, reward_slice: np.ndarray, reward_counter: Optional[RewardCounter] = None):
         self.reward_array = reward_slice
+        self.reward_counter = reward_counter
 
     def register_selected_reward(self, reward_keys: List[str]):
         index = self.reward_mapping
         for key in reward_keys:
             index = index[key]
-        self.reward_array[index] = 1
+
+        if self.reward_array[index] == 0:
+            self.reward_array[index] = 1
+
+            if self.reward_counter is not None:
+                self.reward_counter.count += 1
 
     def set_reward_children(self, children: List["RewardElement"]):
         self._reward_children = children
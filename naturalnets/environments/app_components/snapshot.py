@@ -0,0 +1,79 @@
+from typing import Any, List, Tuple
+
+import numpy as np
+
+from naturalnets.environments.app_components.state_element import StateElement
+
+
+class AppSnapshot:
+    """Records the complete state of an app, i.e. the state vector, the reward array and the fields of all app
+    components that may change during an episode, so that the app can later be restored to exactly this state.
+
+    Each component records its own fields with snapshot() and restores them with restore(), see
+    StateElement.snapshot(). Components without such fields return None and are not recorded, thus restoring only
+    copies the arrays back in place and assigns the few recorded fields. This is much faster than resetting all
+    components and re-assigning the state vector and reward array to the component tree.
+    """
+
+    def __init__(self, arrays: List[np.ndarray], components: List[Any]):
+        """
+        Args:
+            arrays (List[np.ndarray]): The arrays which are shared by the components, i.e. the state vector and the
+                reward array of the app. They are restored in place, because the components hold views of them.
+            components (List[Any]): The components of the app, each having a snapshot() and restore() method, e.g.
+                the state-elements returned by get_state_elements().
+        """
+        self._arrays: List[Tuple[np.ndarray, np.ndarray]] = [(array, array.copy()) for array in arrays]
+        self._records: List[Tuple[Any, tuple]] = []
+
+        for component in components:
+            record = component.snapshot()
+
+            if record is not None:
+                self._records.append((component, record))
+
+    def restore(self):
+        """Restores the app to the recorded state."""
+        for array, recorded_array in self._arrays:
+            np.copyto(array, recorded_array)
+
+        for component, record in self._records:
+            component.restore(record)
+
+
+def get_state_elements(root_elements: List[StateElement]) -> List[StateElement]:
+    """Returns the given state-elements and all of their (recursive) children, each state-element once."""
+    state_elements = []
+    visited = set()
+    to_visit = list(root_elements)
+
+    while to_visit:
+        state_element = to_visit.pop()
+
+        # Buttons may be added as children, but they are no state-elements
+        if not isinstance(state_element, StateElement) or id(state_element) in visited:
+            continue
+        visited.add(id(state_element))
+
+        state_elements.append(state_element)
+        to_visit.extend(state_element.get_children())
+
+    return state_elements
+
+
+def snapshot_detached_state_elements(root_elements: List[StateElement]) -> list:
+    """Records the given state-elements and their children, including their states, for state-elements that are not
+    part of the component tree of the app (e.g. widgets that are not added as children to their page). Their states
+    are not views of the state vector of the app, thus they are not restored together with the state vector.
+    """
+    return [(state_element, state_element.get_state().copy(), state_element.snapshot())
+            for state_element in get_state_elements(root_elements)]
+
+
+def restore_detached_state_elements(records: list) -> None:
+    """Restores the state-elements recorded by snapshot_detached_state_elements()."""
+    for state_element, state, record in records:
+        if record is not None:
+            state_element.restore(record)
+
+        np.copyto(state_element.get_state(), state)
@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List
+from typing import List, Optional
 
 import numpy as np
 
@@ -54,6 +54,20 @@ class StateElement(Renderable):
         self._state = state_sector
         self._state[:] = current_state[:]
 
+    def snapshot(self) -> Optional[tuple]:
+        """Returns a record of the fields of this state-element that may change during an episode, apart from its
+        state (the state vector is recorded as a whole, see AppSnapshot). State-elements with such fields override
+        this method and restore().
+
+        Returns:
+            Optional[tuple]: the recorded fields, or None if this state-element has no fields to record.
+        """
+        return None
+
+    def restore(self, record: tuple) -> None:
+        """Restores the fields of this state-element from a record created by snapshot()."""
+        pass
+
     def get_children(self) -> List['StateElement']:
         """Returns all children of this StateElement."""
         return self._children
@@ -1,4 +1,5 @@
 from cmath import inf
+from functools import lru_cache
 from importlib.resources import path as res_path
 from typing import List, Tuple, Dict
 
@@ -15,6 +16,36 @@ def get_image_path(module: str, file_name: str):
         return p.__str__()
 
 
+# Maximum number of images that are kept in the image caches of a process, the GUI apps use less than that
+IMAGE_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def load_image(img_path: str) -> np.ndarray:
+    """Loads the image at the given path. The image is only read and decoded from disk once per process, all following
+    calls return the cached image.
+
+    The returned image is read-only, because it is shared by all callers. Use np.copy() to get a writable image.
+    """
+    image = cv2.imread(img_path)
+
+    if image is None:
+        raise FileNotFoundError(f"Could not read the image '{img_path}'")
+
+    image.setflags(write=False)
+    return image
+
+
+@lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def load_resized_image(img_path: str, width: int, height: int) -> np.ndarray:
+    """Same as load_image(), but the image is resized to the given width and height. The resized image is cached as
+    well, i.e. the image is only resized once per process and size.
+    """
+    image = cv2.resize(load_image(img_path), (width, height))
+    image.setflags(write=False)
+    return image
+
+
 def render_onto_bb(img: np.ndarray, bounding_box: BoundingBox, to_render: np.ndarray) -> np.ndarray:
     """Renders the given to_render onto the given img in bounding_box position.
 
@@ -77,6 +108,16 @@ def put_text(img: np.ndarray, text: str, bottom_left_corner: Tuple[int, int], fo
                 font_scale, font_color, thickness, line_type)
 
 
+def get_app_episode_reward_bounds(number_time_steps: int, max_reward: int) -> Tuple[float, float]:
+    """Returns the bounds of the total reward of one episode of an app that gives a reward of number_time_steps in the
+    first time step, subtracts 1 in each time step, and gives each of its max_reward rewards at most once.
+
+    The time step rewards sum up to number_time_steps minus the length of the episode, which is at least one time step,
+    thus the total reward is at most number_time_steps - 1 + max_reward, and it is never negative.
+    """
+    return 0.0, float(number_time_steps - 1 + max_reward)
+
+
 def generate_reward_mapping_from_template(reward_template: Dict, reward_mapping: Dict, running_index: int = 0):
     """
     Creates a mapping from strings, indicating a specific reward, to an index that can be used to index a NumPy array.
@@ -1,13 +1,12 @@
 import os
 from typing import Callable
-import cv2
 
 import numpy as np
 
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.interfaces import Clickable
 from naturalnets.environments.app_components.page import Widget
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_resized_image
 from naturalnets.environments.app_components.widgets.textfield import Textfield
 
 
@@ -68,9 +67,8 @@ class ToggleButton(Widget, Button):
         '''
         if self.IMG_PATH is not None:
             if self.is_selected():
-                to_render = cv2.imread(self.IMG_PATH)
-                to_render = cv2.resize(
-                    to_render, (self._bounding_box.width, self._bounding_box.height))
+                to_render = load_resized_image(
+                    self.IMG_PATH, self._bounding_box.width, self._bounding_box.height)
                 img = render_onto_bb(img, self._bounding_box, to_render)
 
         return img
@@ -99,6 +97,12 @@ class ToggleButton(Widget, Button):
         '''
         self.set_selected(False)
 
+    def snapshot(self) -> tuple:
+        return self.toggle_on,
+
+    def restore(self, record: tuple) -> None:
+        self.toggle_on, = record
+
     def set_img_path(self, path):
         '''
         Sets the path of the image to be rendered.
@@ -51,6 +51,12 @@ class DropdownItem(Widget):
         """
         self._is_visible = visible
 
+    def snapshot(self) -> tuple:
+        return self._is_visible,
+
+    def restore(self, record: tuple) -> None:
+        self._is_visible, = record
+
     def handle_click(self, click_position: np.ndarray) -> None:
         self.click_action()
 
@@ -106,6 +112,11 @@ class Dropdown(Widget):
         self.add_children(self._all_items)
         self._selected_item: DropdownItem = None
         self.clickable = True
+
+        # The layout of the visible items, which is only recalculated if the visibility of the items changes
+        self._item_visibility: Optional[tuple] = None
+        self._visible_items: List[DropdownItem] = []
+        self._items_bb: Optional[BoundingBox] = None
         self._update_item_bounding_boxes()
 
     def is_open(self) -> int:
@@ -144,13 +155,22 @@ class Dropdown(Widget):
         if not self.is_open():
             return self._dropdown_button_bb
 
-        return get_group_bounding_box(self._update_item_bounding_boxes())
+        self._update_item_bounding_boxes()
+        if self._items_bb is None:
+            self._items_bb = get_group_bounding_box(self._visible_items)
+        return self._items_bb
 
     def _update_item_bounding_boxes(self) -> List[DropdownItem]:
         """Recalculates the bounding-boxes of the visible items in this Dropdown
-        (bounding-boxes/positions of the items depend on which items are shown)
+        (bounding-boxes/positions of the items depend on which items are shown), if the
+        visibility of the items changed since the last calculation. Otherwise, the items keep
+        their bounding-boxes, i.e. the bounding-box objects only change if the layout changes.
 
         Returns the visible items."""
+        item_visibility = tuple(item.is_visible() for item in self._all_items)
+        if item_visibility == self._item_visibility:
+            return self._visible_items
+
         i: int = 0
         first_bb = self._dropdown_button_bb
         visible_items: List[DropdownItem] = []
@@ -166,14 +186,16 @@ class Dropdown(Widget):
                 item.set_bb(next_bb)
                 visible_items.append(item)
                 i += 1
+
+        self._item_visibility = item_visibility
+        self._visible_items = visible_items
+        self._items_bb = None
         return visible_items
 
     def get_visible_items(self) -> List[DropdownItem]:
-        visible_items: List[DropdownItem] = []
-        for item in self._all_items:
-            if item.is_visible():
-                visible_items.append(item)
-        return visible_items
+        # The visibility of the items may have changed since the bounding-boxes were last calculated (e.g. when an
+        # environment is reset), thus always return the items with up-to-date bounding-boxes
+        return list(self._update_item_bounding_boxes())
 
     def get_all_items(self):
         return self._all_items
@@ -204,6 +226,13 @@ class Dropdown(Widget):
                 self.set_selected_item(item)
                 return
 
+    def snapshot(self) -> tuple:
+        # The layout of the visible items is not recorded, as it is recalculated from the restored visibility
+        return self._selected_item, self.clickable
+
+    def restore(self, record: tuple) -> None:
+        self._selected_item, self.clickable = record
+
     def set_clickable(self, clickable: bool) -> None:
         self.clickable = clickable
 
@@ -56,6 +56,13 @@ class PasswordCard(Widget, Button):
         '''
         self.showing_passwordcard = selected
 
+
+    def snapshot(self) -> tuple:
+        # The bounding-box is shifted depending on the other password cards on the page (see SearchPage)
+        return self.showing_passwordcard, self._bounding_box
+
+    def restore(self, record: tuple) -> None:
+        self.showing_passwordcard, self._bounding_box = record
     def reset(self):
         '''
         Resets the button.
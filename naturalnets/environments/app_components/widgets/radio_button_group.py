@@ -140,6 +140,12 @@ class RadioButtonGroup(Widget):
         selected_button.set_selected(1)
         self._selected_radio_button = selected_button
 
+    def snapshot(self) -> tuple:
+        return self._selected_radio_button,
+
+    def restore(self, record: tuple) -> None:
+        self._selected_radio_button, = record
+
     def get_selected_radio_button(self) -> RadioButton:
         return self._selected_radio_button
 
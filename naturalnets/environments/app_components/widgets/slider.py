@@ -79,6 +79,13 @@ class Slider(Widget):
         '''
         return np.argmax(self.get_state())
 
+    def snapshot(self) -> tuple:
+        # handle_click() replaces the state, thus the assigned state sector is recorded as well
+        return self._state,
+
+    def restore(self, record: tuple) -> None:
+        self._state, = record
+
     def reset(self):
         '''
         Resets the slider to the first state.
@@ -69,6 +69,12 @@ class Textfield(Widget):
         '''
         self.text = text
 
+    def snapshot(self) -> tuple:
+        return self.text,
+
+    def restore(self, record: tuple) -> None:
+        self.text, = record
+
     def render(self, img: np.ndarray) -> np.ndarray:
         '''
         Renders the textfield onto the given image.
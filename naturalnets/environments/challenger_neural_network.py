@@ -20,6 +20,9 @@ class ChallengerNeuralNetworkCfg:
 @register_environment_class
 class ChallengerNeuralNetwork(IEnvironment):
 
+    # The challenger brain is created from scratch on each reset
+    REUSABLE = True
+
     def __init__(self, configuration: dict, **kwargs):
         self.config = ChallengerNeuralNetworkCfg(**configuration)
 
@@ -1,6 +1,6 @@
 import math
 from cmath import inf
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import cv2
 import numpy as np
@@ -43,6 +43,8 @@ class DummyAppCfg:
 @register_environment_class
 class DummyApp(IGUIEnvironment):
 
+    REUSABLE = True
+
     def __init__(self, configuration: dict, **kwargs):
         self.config = DummyAppCfg(**configuration)
         self.number_buttons = self.config.number_button_columns * self.config.number_button_rows
@@ -85,6 +87,10 @@ class DummyApp(IGUIEnvironment):
     def get_number_outputs(self):
         return 2
 
+    def get_episode_reward_bounds(self) -> Tuple[float, float]:
+        # Each button gives a reward of 1 at most once, and at most one button is pressed per time step
+        return 0.0, float(min(self.number_buttons, self.config.number_time_steps))
+
     def reset(self, env_seed: Optional[int] = None):
         if self.config.fixed_env_seed:
             self.rng = default_rng(seed=FIXED_ENV_SEED)
@@ -0,0 +1,154 @@
+from typing import Optional, Sequence
+
+import numpy as np
+from numpy.random import default_rng
+
+from naturalnets.environments.dummy_app.dummy_app import DummyApp, FIXED_ENV_SEED
+from naturalnets.environments.i_environment import IVectorizedEnvironment, register_vectorized_environment_class
+
+
+@register_vectorized_environment_class(DummyApp)
+class VecDummyApp(IVectorizedEnvironment):
+    """
+    Holds a number of independent DummyApp instances, which are stepped in lockstep.
+
+    All instances share the configuration, but each instance has its own environment seed, and thus its own shuffled
+    button layout and button states. These are stored in arrays of shape (number_instances, number_buttons), such that
+    the clicked buttons and the rewards of all instances are calculated in one pass. Each instance behaves exactly like
+    a DummyApp that is reset with the same environment seed and receives the same actions.
+    """
+
+    def __init__(self, configuration: dict, number_instances: int):
+        # A single DummyApp validates the configuration and calculates the geometry of the button grid
+        dummy_app = DummyApp(configuration)
+
+        self.config = dummy_app.config
+        self.number_instances = number_instances
+        self.number_buttons = dummy_app.number_buttons
+
+        # x and y coordinates of the upper left point of each cell of the button grid (plus the offset to center the
+        # button), in the order in which DummyApp.reset() places the shuffled buttons
+        self.cell_positions = np.zeros((self.number_buttons, 2), dtype=np.int64)
+        n = 0
+        for j in range(self.config.number_button_rows):
+            for i in range(self.config.number_button_columns):
+                x = dummy_app.grid_cell_horizontal_size * i + dummy_app.grid_cell_horizontal_offset
+                y = dummy_app.grid_cell_vertical_size * j + dummy_app.grid_cell_vertical_offset
+                self.cell_positions[n] = [x, y]
+                n += 1
+
+        self.instance_indices = np.arange(self.number_instances)
+
+        # Upper left point of the button rectangles, indexed by instance and button
+        self.button_rectangle_x = np.zeros((self.number_instances, self.number_buttons), dtype=np.int64)
+        self.button_rectangle_y = np.zeros((self.number_instances, self.number_buttons), dtype=np.int64)
+
+        self.button_states = np.zeros((self.number_instances, self.number_buttons), dtype=np.uint8)
+
+        self.click_positions_x = np.zeros(self.number_instances, dtype=np.int64)
+        self.click_positions_y = np.zeros(self.number_instances, dtype=np.int64)
+
+        self.t = 0
+
+    def get_number_instances(self) -> int:
+        return self.number_instances
+
+    def get_number_inputs(self) -> int:
+        return self.number_buttons
+
+    def get_number_outputs(self) -> int:
+        return 2
+
+    def reset(self, env_seeds: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Resets all instances.
+
+        :param env_seeds: One environment seed per instance, or None to use random layouts. Ignored, if
+            fixed_env_seed is set in the configuration.
+        :return: The observations of all instances, with shape (number_instances, number_buttons)
+        """
+        if env_seeds is None:
+            env_seeds = [None] * self.number_instances
+
+        assert len(env_seeds) == self.number_instances
+
+        for k, env_seed in enumerate(env_seeds):
+            # Same as DummyApp.reset(), i.e. the instance has the same layout as a DummyApp with this seed
+            rng = default_rng(seed=FIXED_ENV_SEED if self.config.fixed_env_seed else env_seed)
+
+            buttons = np.arange(self.number_buttons)
+            rng.shuffle(buttons)
+
+            self.button_rectangle_x[k, buttons] = self.cell_positions[:, 0]
+            self.button_rectangle_y[k, buttons] = self.cell_positions[:, 1]
+
+        self.click_positions_x[:] = 0
+        self.click_positions_y[:] = 0
+
+        self.button_states[:] = 0
+
+        self.t = 0
+
+        return self.get_observation()
+
+    def step(self, actions: np.ndarray):
+        """
+        Clicks once in each instance.
+
+        :param actions: Actions in [-1, 1] with shape (number_instances, 2)
+        :return: Observations with shape (number_instances, number_buttons), rewards with shape (number_instances,),
+            done (shared by all instances, since they are stepped in lockstep) and an info dict
+        """
+        # Convert from [-1, 1] continuous values to pixel coordinates, truncating like int() in DummyApp.step()
+        self.click_positions_x = (0.5 * (actions[:, 0] + 1.0) * self.config.screen_width).astype(np.int64)
+        self.click_positions_y = (0.5 * (actions[:, 1] + 1.0) * self.config.screen_height).astype(np.int64)
+
+        # Distance from each click to each button rectangle, see DummyApp.rect_distance(). The squared distance is
+        # sufficient to find the nearest button, and is exact since all values are integers.
+        click_x = self.click_positions_x[:, np.newaxis]
+        click_y = self.click_positions_y[:, np.newaxis]
+
+        dx = np.maximum(
+            np.maximum(self.button_rectangle_x - click_x, 0),
+            click_x - self.button_rectangle_x - self.config.button_width
+        )
+        dy = np.maximum(
+            np.maximum(self.button_rectangle_y - click_y, 0),
+            click_y - self.button_rectangle_y - self.config.button_height
+        )
+
+        # argmin returns the first button with the minimal distance, which is the same button DummyApp chooses
+        buttons = np.argmin(dx * dx + dy * dy, axis=1)
+
+        return self.step_widgets(buttons)
+
+    def step_widgets(self, widget_ids: np.ndarray):
+        """
+        Same as DummyApp.step_widget(), but for all instances at once.
+
+        :param widget_ids: The clicked button of each instance, with shape (number_instances,)
+        """
+        buttons = widget_ids
+        not_pressed = self.button_states[self.instance_indices, buttons] == 0
+
+        if self.config.force_consecutive_click_order:
+            # Button 0 can always be pressed, all other buttons only if their predecessor is already pressed
+            predecessor_pressed = self.button_states[self.instance_indices, buttons - 1] == 1
+            rewarded = not_pressed & ((buttons == 0) | predecessor_pressed)
+        else:
+            rewarded = not_pressed
+
+        self.button_states[self.instance_indices, buttons] |= rewarded.astype(np.uint8)
+        rew = rewarded.astype(np.float64)
+
+        self.t += 1
+
+        done = self.t >= self.config.number_time_steps
+
+        ob = self.get_observation()
+        info = {"action": buttons}
+
+        return ob, rew, done, info
+
+    def get_observation(self) -> np.ndarray:
+        return self.button_states
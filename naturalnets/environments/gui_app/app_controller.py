@@ -1,12 +1,14 @@
-from copy import copy
-from typing import List
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
 from naturalnets.environments.app_components.bounding_box import BoundingBox
+from naturalnets.environments.app_components.click_index import ClickIndex, create_nearest_label_image
 from naturalnets.environments.app_components.interfaces import Clickable
 from naturalnets.environments.gui_app.main_window import MainWindow
-from naturalnets.environments.app_components.reward_element import RewardElement
+from naturalnets.environments.app_components.reward_element import RewardCounter, RewardElement
+from naturalnets.environments.app_components.snapshot import AppSnapshot, get_state_elements
 from naturalnets.environments.gui_app.settings_window import SettingsWindow
 from naturalnets.environments.app_components.state_element import StateElement
 from naturalnets.environments.app_components.widgets.button import Button
@@ -18,6 +20,12 @@ class AppController:
     """
     SETTINGS_BUTTON_BB = BoundingBox(8, 0, 49, 18)
 
+    # Maximum number of app states for which the clickable elements are cached
+    CLICKABLE_ELEMENTS_CACHE_SIZE = 1024
+
+    # Clicks are at pixel coordinates in [0, 448] (see GUIApp.step())
+    NEAREST_LABEL_IMAGE_SIZE = 449
+
     def __init__(self, nearest_widget_click: bool):
         self.nearest_widget_click = nearest_widget_click
 
@@ -41,8 +49,21 @@ class AppController:
         self._states_info = states_info
 
         self.reward_array = None
+        self.reward_counter = None
         self.reset_reward_array()
 
+        # Recorded after the first reset, all further resets restore it
+        self._initial_snapshot = None
+
+        # The clickable elements (and their ClickIndex and nearest label image) only depend on the app state, thus they
+        # are cached for the most recently visited states, keyed by the bytes of the state-vector
+        self._clickable_elements_cache: OrderedDict[
+            bytes, Tuple[List[Clickable], ClickIndex, Optional[np.ndarray]]] = OrderedDict()
+
+        # Maps the coordinates of the clickable elements to their nearest label image, which is shared by all states
+        # with the same clickable elements (there are only a few dozen different ones)
+        self._nearest_label_images: Dict[tuple, np.ndarray] = {}
+
     def calculate_reward_count(self, reward_count, reward_element: RewardElement):
         reward_count += reward_element.get_reward_count()
 
@@ -57,16 +78,23 @@ class AppController:
             reward_count, self.settings_window)
 
         self.reward_array = np.zeros(reward_count, dtype=np.uint8)
+        self.reward_counter = RewardCounter()
 
         last_reward_index = self.assign_reward(0, self.main_window)
         last_reward_index = self.assign_reward(
             last_reward_index, self.settings_window)
         assert last_reward_index == reward_count
 
+    def clear_rewards(self):
+        """Sets all entries of the reward array back to 0 and resets the RewardCounter accordingly, such that the
+        rewards are registered again."""
+        self.reward_array[:] = 0
+        self.reward_counter.count = 0
+
     def assign_reward(self, current_index, reward_element: RewardElement):
         reward_count = reward_element.get_reward_count()
         reward_element.assign_reward_slice(
-            self.reward_array[current_index:current_index + reward_count])
+            self.reward_array[current_index:current_index + reward_count], self.reward_counter)
         current_index += reward_count
 
         for reward_child in reward_element.get_reward_children():
@@ -75,6 +103,10 @@ class AppController:
         return current_index
 
     def reset(self):
+        if self._initial_snapshot is not None:
+            self._initial_snapshot.restore()
+            return
+
         self.main_window.reset()
 
         self.settings_window.close()
@@ -88,6 +120,10 @@ class AppController:
         self.assign_state(self.main_window, 0, [])
         self.assign_state(self.settings_window, 0, [])
 
+        self._initial_snapshot = AppSnapshot(
+            [self._state, self.reward_array],
+            [self.reward_counter] + get_state_elements([self.main_window, self.settings_window]))
+
     def get_element_state_len(self, state_element: StateElement) -> int:
         """Collects the total state length of the given StateElement and all its children.
 
@@ -157,18 +193,11 @@ class AppController:
     def handle_click(self, click_position: np.ndarray):
         """Delegates click-handling to the clicked component.
         """
-        previous_reward_array = copy(self.reward_array)
+        previous_reward_count = self.reward_counter.count
 
         if self.nearest_widget_click:
-            current_minimal_distance, current_clickable = np.inf, None
-
-            for clickable_element in self.get_clickable_elements():
-                clickable_distance = clickable_element.calculate_distance_to_click(
-                    click_position)
-
-                if clickable_distance < current_minimal_distance:
-                    current_minimal_distance = clickable_distance
-                    current_clickable = clickable_element
+            _, click_index, nearest_label_image = self._get_cached_clickable_elements()
+            current_clickable = click_index.get_nearest_element(click_position, nearest_label_image)
 
             if current_clickable is None:
                 raise RuntimeError("GUIApp landed in a state where no clickable element was found. This should not "
@@ -185,7 +214,7 @@ class AppController:
         else:
             self.main_window.handle_click(click_position)
 
-        reward = np.count_nonzero(previous_reward_array != self.reward_array)
+        reward = self.reward_counter.count - previous_reward_count
 
         return reward
 
@@ -202,6 +231,47 @@ class AppController:
         return img
 
     def get_clickable_elements(self) -> List[Clickable]:
+        clickable_elements, _, _ = self._get_cached_clickable_elements()
+
+        # Return a copy, so that the cached list can not be changed by the caller
+        return list(clickable_elements)
+
+    def _get_cached_clickable_elements(self) -> Tuple[List[Clickable], ClickIndex, Optional[np.ndarray]]:
+        """Returns the clickable elements of the current app state, their ClickIndex and its nearest label image,
+        which are only collected if the current state is not cached.
+        """
+        key = self._state.tobytes()
+
+        try:
+            cached_clickable_elements = self._clickable_elements_cache[key]
+        except KeyError:
+            clickable_elements = self._collect_clickable_elements()
+            click_index = ClickIndex(clickable_elements)
+            nearest_label_image = self._get_nearest_label_image(click_index) if self.nearest_widget_click else None
+            cached_clickable_elements = (clickable_elements, click_index, nearest_label_image)
+
+            self._clickable_elements_cache[key] = cached_clickable_elements
+
+            if len(self._clickable_elements_cache) > self.CLICKABLE_ELEMENTS_CACHE_SIZE:
+                self._clickable_elements_cache.popitem(last=False)
+        else:
+            self._clickable_elements_cache.move_to_end(key)
+
+        return cached_clickable_elements
+
+    def _get_nearest_label_image(self, click_index: ClickIndex) -> Optional[np.ndarray]:
+        if len(click_index.coordinates) == 0:
+            return None
+
+        try:
+            return self._nearest_label_images[click_index.coordinates]
+        except KeyError:
+            nearest_label_image = create_nearest_label_image(
+                click_index.coordinates, self.NEAREST_LABEL_IMAGE_SIZE, self.NEAREST_LABEL_IMAGE_SIZE)
+            self._nearest_label_images[click_index.coordinates] = nearest_label_image
+            return nearest_label_image
+
+    def _collect_clickable_elements(self) -> List[Clickable]:
         if self.settings_window.is_open():
             return self.settings_window.get_clickable_elements()
 
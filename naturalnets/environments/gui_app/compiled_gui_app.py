@@ -0,0 +1,392 @@
+"""Table-driven version of the GUIApp with nearest widget clicks.
+
+With nearest widget clicks, the behavior of the GUIApp is a deterministic function of its state-vector and the
+clicked element: the clickable elements only depend on the state, and clicking one of them always leads to the same
+next state and registers the same rewards. A TransitionTable stores these transitions, such that GUIAppCompiled can
+step by table lookups instead of delegating each click through the components of the app.
+
+The state space of the GUIApp is too large to be explored completely, therefore GUIAppCompiled also fills the table
+while stepping: Only if a transition is not yet known, the clicks since the last unknown transition are replayed on a
+GUIApp to calculate it. A table can additionally be compiled in advance by a breadth-first search over the states,
+e.g. with: python -m naturalnets.tools.compile_gui_app --max-states 10000 -o gui_app_table.npz
+"""
+import logging
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from attrs import define, field, validators
+
+from naturalnets.environments.app_components.click_index import ClickIndex, create_nearest_label_image
+from naturalnets.environments.app_components.utils import get_app_episode_reward_bounds
+from naturalnets.environments.gui_app.app_controller import AppController
+from naturalnets.environments.gui_app.gui_app import GUIApp
+from naturalnets.environments.i_environment import IEnvironment, register_environment_class
+
+# Next state id and the indices of the rewards in the reward array that are registered by the transition
+Transition = Tuple[int, Tuple[int, ...]]
+
+
+class TransitionTable:
+    """Stores the explored states of the GUIApp (with nearest widget clicks) and the transitions between them.
+
+    Each state has an id, which indexes the state-vector, the coordinates of the clickable elements (in the order of
+    AppController.get_clickable_elements()), their nearest label image and the known transitions of the state. The
+    transitions of a state map the index of the clicked element to the next state id and the registered rewards.
+    """
+
+    def __init__(self, state_len: int, reward_len: int):
+        self.state_len = state_len
+        self.reward_len = reward_len
+
+        self.states: List[np.ndarray] = []
+        self.state_ids: Dict[bytes, int] = {}
+        self.clickable_coordinates: List[Tuple[Tuple[int, int, int, int], ...]] = []
+        self.nearest_label_images: List[np.ndarray] = []
+        self.transitions: List[Dict[int, Transition]] = []
+
+        # The states share the nearest label images of their clickable coordinates
+        self._nearest_label_images: Dict[Tuple[Tuple[int, int, int, int], ...], np.ndarray] = {}
+
+    def get_number_states(self) -> int:
+        return len(self.states)
+
+    def get_number_transitions(self) -> int:
+        return sum(len(state_transitions) for state_transitions in self.transitions)
+
+    def add_state(self, state: np.ndarray, clickable_coordinates: Tuple[Tuple[int, int, int, int], ...]) -> int:
+        """Adds the given state (if it is not yet known) and returns its id."""
+        key = state.tobytes()
+
+        try:
+            return self.state_ids[key]
+        except KeyError:
+            pass
+
+        state_id = len(self.states)
+
+        # The state-vectors are returned as observations, thus they must not be changed
+        state = np.array(state, dtype=np.int8)
+        state.setflags(write=False)
+
+        self.states.append(state)
+        self.state_ids[key] = state_id
+        clickable_coordinates = tuple(clickable_coordinates)
+
+        try:
+            nearest_label_image = self._nearest_label_images[clickable_coordinates]
+        except KeyError:
+            # Clicks are at pixel coordinates in [0, 448] (see GUIApp.step())
+            nearest_label_image = create_nearest_label_image(
+                clickable_coordinates, GUIApp.screen_width + 1, GUIApp.screen_height + 1)
+            self._nearest_label_images[clickable_coordinates] = nearest_label_image
+
+        self.clickable_coordinates.append(clickable_coordinates)
+        self.nearest_label_images.append(nearest_label_image)
+        self.transitions.append({})
+
+        return state_id
+
+    def get_nearest_clickable(self, state_id: int, x: int, y: int) -> int:
+        """Returns the index of the clickable element of the given state, which is clicked with nearest widget clicks
+        at the given position (see ClickIndex.get_nearest_element())."""
+        nearest_label_image = self.nearest_label_images[state_id]
+
+        if 0 <= y < nearest_label_image.shape[0] and 0 <= x < nearest_label_image.shape[1]:
+            return int(nearest_label_image[y, x])
+
+        nearest_index = 0
+        minimal_squared_distance = None
+
+        for i, (x1, y1, x2, y2) in enumerate(self.clickable_coordinates[state_id]):
+            dx = max(x1 - x, 0, x - x2)
+            dy = max(y1 - y, 0, y - y2)
+            squared_distance = dx * dx + dy * dy
+
+            if minimal_squared_distance is None or squared_distance < minimal_squared_distance:
+                nearest_index = i
+                minimal_squared_distance = squared_distance
+
+        return nearest_index
+
+    def save(self, path: str):
+        coordinates = [c for state_coordinates in self.clickable_coordinates for c in state_coordinates]
+        coordinates_offsets = np.cumsum([0] + [len(c) for c in self.clickable_coordinates])
+
+        sources, elements, targets, reward_indices, reward_offsets = [], [], [], [], [0]
+        for state_id, state_transitions in enumerate(self.transitions):
+            for element_index, (next_state_id, transition_reward_indices) in state_transitions.items():
+                sources.append(state_id)
+                elements.append(element_index)
+                targets.append(next_state_id)
+                reward_indices.extend(transition_reward_indices)
+                reward_offsets.append(len(reward_indices))
+
+        np.savez_compressed(
+            path,
+            reward_len=self.reward_len,
+            states=np.array(self.states, dtype=np.int8).reshape(-1, self.state_len),
+            coordinates=np.array(coordinates, dtype=np.int32).reshape(-1, 4),
+            coordinates_offsets=coordinates_offsets,
+            sources=np.array(sources, dtype=np.int64),
+            elements=np.array(elements, dtype=np.int64),
+            targets=np.array(targets, dtype=np.int64),
+            reward_indices=np.array(reward_indices, dtype=np.int64),
+            reward_offsets=np.array(reward_offsets, dtype=np.int64)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "TransitionTable":
+        with np.load(path) as data:
+            states = data["states"]
+            table = cls(state_len=states.shape[1], reward_len=int(data["reward_len"]))
+
+            coordinates = [tuple(int(c) for c in row) for row in data["coordinates"]]
+            coordinates_offsets = data["coordinates_offsets"].tolist()
+            for state_id, state in enumerate(states):
+                start, end = coordinates_offsets[state_id], coordinates_offsets[state_id + 1]
+                table.add_state(state, tuple(coordinates[start:end]))
+
+            reward_indices = data["reward_indices"].tolist()
+            reward_offsets = data["reward_offsets"].tolist()
+            for i, (state_id, element_index, next_state_id) in enumerate(
+                    zip(data["sources"].tolist(), data["elements"].tolist(), data["targets"].tolist())):
+                transition_reward_indices = tuple(reward_indices[reward_offsets[i]:reward_offsets[i + 1]])
+                table.transitions[state_id][element_index] = (next_state_id, transition_reward_indices)
+
+        return table
+
+
+def add_current_state(table: TransitionTable, app_controller: AppController) -> int:
+    """Adds the current state of the given AppController to the table and returns its id."""
+    return table.add_state(app_controller.get_total_state(),
+                           ClickIndex(app_controller.get_clickable_elements()).coordinates)
+
+
+def record_click(table: TransitionTable, app_controller: AppController, state_id: int,
+                 click_position: np.ndarray) -> Transition:
+    """Clicks at the given position with the given AppController, which must be in the state with the given id, and
+    adds the resulting transition to the table.
+
+    Note that the rewards of the AppController are cleared before the click to find all rewards that are registered by
+    the click, i.e. the AppController does not give correct rewards anymore until it is reset.
+    """
+    element_index = table.get_nearest_clickable(state_id, int(click_position[0]), int(click_position[1]))
+
+    app_controller.clear_rewards()
+    reward = app_controller.handle_click(click_position)
+    reward_indices = tuple(int(i) for i in np.flatnonzero(app_controller.reward_array))
+    assert reward == len(reward_indices)
+
+    transition = (add_current_state(table, app_controller), reward_indices)
+    table.transitions[state_id][element_index] = transition
+
+    return transition
+
+
+def find_click_position(table: TransitionTable, state_id: int, element_index: int) -> Optional[np.ndarray]:
+    """Returns a position at which the given clickable element of the given state is clicked with nearest widget
+    clicks, or None if the element is completely covered by previous clickable elements."""
+    x1, y1, x2, y2 = table.clickable_coordinates[state_id][element_index]
+
+    for y in range(y1, y2 + 1):
+        for x in range(x1, x2 + 1):
+            if table.get_nearest_clickable(state_id, x, y) == element_index:
+                return np.array([x, y])
+
+    return None
+
+
+def compile_transition_table(max_states: int) -> TransitionTable:
+    """Explores the states of the GUIApp (with nearest widget clicks) by a breadth-first search, starting at the
+    initial state, until the given number of states is found. Each state is reached by resetting the app and
+    replaying the clicks of the shortest known path to the state.
+    """
+    app_controller = AppController(nearest_widget_click=True)
+    app_controller.reset()
+
+    table = TransitionTable(app_controller.get_total_state_len(), app_controller.get_total_reward_len())
+
+    initial_state_id = add_current_state(table, app_controller)
+    paths = {initial_state_id: []}
+    states_to_explore = deque([initial_state_id])
+
+    while states_to_explore and table.get_number_states() < max_states:
+        state_id = states_to_explore.popleft()
+
+        for element_index in range(len(table.clickable_coordinates[state_id])):
+            click_position = find_click_position(table, state_id, element_index)
+
+            if click_position is None:
+                continue
+
+            app_controller.reset()
+            for previous_click_position in paths[state_id]:
+                app_controller.handle_click(previous_click_position)
+
+            next_state_id, _ = record_click(table, app_controller, state_id, click_position)
+
+            if next_state_id not in paths:
+                paths[next_state_id] = paths[state_id] + [click_position]
+                states_to_explore.append(next_state_id)
+
+        logging.debug(f"Explored {len(paths) - len(states_to_explore)} of {table.get_number_states()} states.")
+
+    return table
+
+
+@define(slots=True, auto_attribs=True, frozen=True, kw_only=True)
+class GUIAppCompiledCfg:
+    type: str = field(validator=validators.instance_of(str))
+    number_time_steps: int = field(validator=[validators.instance_of(int), validators.gt(0)])
+
+    # Path to a TransitionTable that has been saved with TransitionTable.save(), e.g. one that was compiled in advance
+    # with compile_transition_table(). If None, the environment starts with an empty table
+    transition_table: Optional[str] = field(default=None, validator=validators.optional(validators.instance_of(str)))
+
+
+@register_environment_class
+class GUIAppCompiled(IEnvironment):
+    """Behaves exactly like the GUIApp with nearest widget clicks, but steps by lookups in a TransitionTable.
+
+    Unknown transitions are calculated with a GUIApp, which is therefore kept up to date lazily: the clicks of known
+    transitions are only stored, and are replayed on the GUIApp when it is needed (for an unknown transition or for
+    rendering). The table is kept over resets, thus the more episodes have been run, the fewer transitions are
+    unknown.
+    """
+
+    REUSABLE = True
+
+    screen_width: int = GUIApp.screen_width
+    screen_height: int = GUIApp.screen_height
+
+    def __init__(self, configuration: dict, **kwargs):
+        if "env_seed" in kwargs:
+            logging.warning("'env_seed' is not used in the GUIAppCompiled environment")
+
+        self.config = GUIAppCompiledCfg(**configuration)
+
+        self.gui_app = GUIApp({
+            "type": "GUIApp",
+            "number_time_steps": self.config.number_time_steps,
+            "include_fake_bug": False,
+            "return_clickable_elements": True,
+            "nearest_widget_click": True
+        })
+        self.gui_app.reset()
+        self.app_controller = self.gui_app.app_controller
+
+        state_len = self.app_controller.get_total_state_len()
+        reward_len = self.app_controller.get_total_reward_len()
+
+        if self.config.transition_table is not None:
+            self.transition_table = TransitionTable.load(self.config.transition_table)
+
+            if self.transition_table.state_len != state_len or self.transition_table.reward_len != reward_len:
+                raise RuntimeError(f"The transition table '{self.config.transition_table}' was not compiled for "
+                                   f"this version of the GUIApp.")
+        else:
+            self.transition_table = TransitionTable(state_len, reward_len)
+
+        self.initial_state_id = add_current_state(self.transition_table, self.app_controller)
+
+        # The clicks that have not yet been replayed on the GUIApp, and whether it has to be reset before
+        self._pending_click_positions: List[Tuple[int, int]] = []
+        self._gui_app_reset_pending = False
+
+        self.state_id = self.initial_state_id
+        self.achieved_rewards = bytearray(reward_len)
+
+        self.t = 0
+        self.click_position_x = 0
+        self.click_position_y = 0
+
+        self.running_reward = 0
+        self.max_reward = reward_len
+
+    def _synchronize_gui_app(self):
+        """Brings the GUIApp into the current state of this environment."""
+        if self._gui_app_reset_pending:
+            self.app_controller.reset()
+            self._gui_app_reset_pending = False
+
+        for click_position in self._pending_click_positions:
+            self.app_controller.handle_click(np.array(click_position))
+
+        self._pending_click_positions.clear()
+
+    def get_number_inputs(self) -> int:
+        return self.transition_table.state_len
+
+    def get_number_outputs(self) -> int:
+        return 2
+
+    def get_episode_reward_bounds(self) -> Tuple[float, float]:
+        return get_app_episode_reward_bounds(self.config.number_time_steps, self.max_reward)
+
+    def get_state(self) -> np.ndarray:
+        return self.transition_table.states[self.state_id]
+
+    def reset(self, env_seed: int = None) -> np.ndarray:
+        self._pending_click_positions.clear()
+        self._gui_app_reset_pending = True
+
+        self.state_id = self.initial_state_id
+        self.achieved_rewards = bytearray(self.transition_table.reward_len)
+
+        self.t = 0
+        self.click_position_x = 0
+        self.click_position_y = 0
+
+        self.running_reward = 0
+
+        return self.get_state()
+
+    def step(self, action: np.ndarray):
+        # Same as GUIApp.step()
+        self.click_position_x = int(0.5 * (action[0] + 1.0) * self.screen_width)
+        self.click_position_y = int(0.5 * (action[1] + 1.0) * self.screen_height)
+
+        element_index = self.transition_table.get_nearest_clickable(
+            self.state_id, self.click_position_x, self.click_position_y)
+
+        try:
+            self.state_id, reward_indices = self.transition_table.transitions[self.state_id][element_index]
+            self._pending_click_positions.append((self.click_position_x, self.click_position_y))
+        except KeyError:
+            self._synchronize_gui_app()
+            self.state_id, reward_indices = record_click(
+                self.transition_table, self.app_controller, self.state_id,
+                np.array([self.click_position_x, self.click_position_y]))
+
+        rew = 0
+        for i in reward_indices:
+            if not self.achieved_rewards[i]:
+                self.achieved_rewards[i] = 1
+                rew += 1
+
+        self.running_reward += rew
+
+        if self.t == 0:
+            rew += self.config.number_time_steps
+
+        rew -= 1
+
+        done = False
+
+        self.t += 1
+
+        if self.t >= self.config.number_time_steps or self.running_reward >= self.max_reward:
+            done = True
+
+        info = {"states_info": self.app_controller.get_states_info()}
+
+        return self.get_state(), rew, done, info
+
+    def render(self, enhancer_info: Optional[Dict[str, np.ndarray]] = None):
+        self._synchronize_gui_app()
+
+        self.gui_app.click_position_x = self.click_position_x
+        self.gui_app.click_position_y = self.click_position_y
+        self.gui_app.render(enhancer_info)
+
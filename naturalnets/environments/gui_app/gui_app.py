@@ -1,7 +1,7 @@
 import enum
 import logging
 import time
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
 import cv2
 import numpy as np
@@ -11,6 +11,7 @@ from naturalnets.enhancers import RandomEnhancer
 from naturalnets.environments.gui_app.app_controller import AppController
 from naturalnets.environments.gui_app.enums import Color
 from naturalnets.environments.app_components.interfaces import Clickable
+from naturalnets.environments.app_components.utils import get_app_episode_reward_bounds
 from naturalnets.environments.i_environment import register_environment_class, IGUIEnvironment
 
 
@@ -53,6 +54,8 @@ class AppCfg:
 @register_environment_class
 class GUIApp(IGUIEnvironment):
 
+    REUSABLE = True
+
     screen_width: int = 448
     screen_height: int = 448
 
@@ -161,6 +164,9 @@ class GUIApp(IGUIEnvironment):
     def get_number_outputs(self) -> int:
         return 2
 
+    def get_episode_reward_bounds(self) -> Tuple[float, float]:
+        return get_app_episode_reward_bounds(self.config.number_time_steps, self.max_reward)
+
     def reset(self, env_seed: int = None) -> np.ndarray:
         self.app_controller.reset()
 
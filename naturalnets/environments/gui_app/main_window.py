@@ -1,9 +1,9 @@
 from typing import List, Optional
 
-import cv2
 import numpy as np
 
 from naturalnets.environments.app_components.bounding_box import BoundingBox
+from naturalnets.environments.app_components.click_index import ClickIndex
 from naturalnets.environments.gui_app.constants import IMAGES_PATH
 from naturalnets.environments.app_components.interfaces import Clickable
 from naturalnets.environments.gui_app.main_window_pages.calculator import Calculator
@@ -13,7 +13,7 @@ from naturalnets.environments.gui_app.main_window_pages.text_printer import Text
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
 from naturalnets.environments.app_components.state_element import StateElement
-from naturalnets.environments.app_components.utils import render_onto_bb, get_image_path
+from naturalnets.environments.app_components.utils import render_onto_bb, get_image_path, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -78,6 +78,7 @@ class MainWindow(StateElement, Clickable, RewardElement):
             self.car_configurator_btn,
             self.figure_printer_btn
         ]
+        self.buttons_index = ClickIndex(self.buttons)
 
         self.add_children([self.text_printer, self.calculator,
                           self.car_configurator, self.figure_printer])
@@ -106,6 +107,12 @@ class MainWindow(StateElement, Clickable, RewardElement):
         self.is_figure_printer_button_visible = 0
         self.set_current_page(self.text_printer)
 
+    def snapshot(self) -> tuple:
+        return self.current_page, self.is_figure_printer_button_visible
+
+    def restore(self, record: tuple) -> None:
+        self.current_page, self.is_figure_printer_button_visible = record
+
     def enable_figure_printer(self, visible: int) -> None:
         self.is_figure_printer_button_visible = visible
 
@@ -159,22 +166,21 @@ class MainWindow(StateElement, Clickable, RewardElement):
         Args:
             click_position (np.ndarray): the click position (inside the menu-bounding-box).
         """
-        for button in self.buttons:
-            if button.is_clicked_by(click_position):
-                # check if figure printer button is visible
-                if button != self.figure_printer_btn or self.is_figure_printer_button_visible:
-                    button.handle_click(click_position)
-                    break
+        for button in self.buttons_index.get_clicked_elements(click_position):
+            # check if figure printer button is visible
+            if button != self.figure_printer_btn or self.is_figure_printer_button_visible:
+                button.handle_click(click_position)
+                break
 
     def render(self, img: np.ndarray):
         """ Renders the main window and all its children onto the given image.
         """
-        to_render = cv2.imread(self.IMG_PATH)
+        to_render = load_image(self.IMG_PATH)
         img = render_onto_bb(img, self.get_bb(), to_render)
         img = self.current_page.render(img)
 
         if self.is_figure_printer_button_visible:
-            figure_printer_img = cv2.imread(
+            figure_printer_img = load_image(
                 self.FIGURE_PRINTER_BUTTON_IMG_PATH)
             img = render_onto_bb(
                 img, self.FIGURE_PRINTER_BUTTON_BB, figure_printer_img)
@@ -124,12 +124,20 @@ class Calculator(Page, RewardElement):
         self.current_result = 0
 
         self.operator_dd.set_selected_item(self.addition_ddi)
+        self.operand_1_dd.set_selected_item(self.operand_1_dd.get_all_items()[0])
+        self.operand_2_dd.set_selected_item(self.operand_2_dd.get_all_items()[0])
 
         self.addition_ddi.set_visible(1)
         self.subtraction_ddi.set_visible(1)
         self.multiplication_ddi.set_visible(0)
         self.division_ddi.set_visible(0)
 
+    def snapshot(self) -> tuple:
+        return self.opened_dd, self.base, self.current_result
+
+    def restore(self, record: tuple) -> None:
+        self.opened_dd, self.base, self.current_result = record
+
     def set_operator_dd_item_visible(self, item: DropdownItem, visible: int):
         """Sets the given operator dropdown-item's visibility. Used by
         calculator-settings."""
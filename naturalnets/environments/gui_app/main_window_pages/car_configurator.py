@@ -1,6 +1,5 @@
 from typing import Dict, List
 
-import cv2
 import numpy as np
 
 from naturalnets.environments.app_components.bounding_box import BoundingBox
@@ -9,7 +8,7 @@ from naturalnets.environments.gui_app.enums import Car, TireSize, Interior, Prop
 from naturalnets.environments.app_components.interfaces import Clickable
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb, get_image_path
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, get_image_path, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 from naturalnets.environments.app_components.widgets.dropdown import Dropdown, DropdownItem
 
@@ -221,6 +220,12 @@ class CarConfigurator(Page, RewardElement):
 
         self.reset_car_configurator_dropdowns()
 
+    def snapshot(self) -> tuple:
+        return self.opened_dd_index, self.ddi_state_from_settings
+
+    def restore(self, record: tuple) -> None:
+        self.opened_dd_index, self.ddi_state_from_settings = record
+
     def set_selectable_options(self, dropdown_item: DropdownItem, selected: int):
         dropdown_item.set_visible(selected)
 
@@ -419,23 +424,23 @@ class CarConfigurator(Page, RewardElement):
         return self.popup.is_open()
 
     def render(self, img: np.ndarray):
-        to_render = cv2.imread(self._img_path)
+        to_render = load_image(self._img_path)
         img = render_onto_bb(img, self.get_bb(), to_render)
 
         if self.get_state()[0]:
-            frame = cv2.imread(self.TIRE_FRAME_IMG_PATH)
+            frame = load_image(self.TIRE_FRAME_IMG_PATH)
             render_onto_bb(img, self.TIRE_FRAME_BB, frame)
 
         if self.get_state()[1]:
-            frame = cv2.imread(self.INTERIOR_FRAME_IMG_PATH)
+            frame = load_image(self.INTERIOR_FRAME_IMG_PATH)
             render_onto_bb(img, self.INTERIOR_FRAME_BB, frame)
 
         if self.get_state()[2]:
-            frame = cv2.imread(self.PROP_FRAME_IMG_PATH)
+            frame = load_image(self.PROP_FRAME_IMG_PATH)
             render_onto_bb(img, self.PROP_FRAME_BB, frame)
 
         if self.get_state()[3]:
-            frame = cv2.imread(self.BUTTON_IMG_PATH)
+            frame = load_image(self.BUTTON_IMG_PATH)
             render_onto_bb(img, self.BUTTON_BB, frame)
 
         # only render dropdowns if the previous dropdown value was selected
@@ -1,6 +1,5 @@
 from typing import List
 
-import cv2
 import numpy as np
 
 from naturalnets.environments.app_components.bounding_box import BoundingBox
@@ -9,7 +8,7 @@ from naturalnets.environments.gui_app.enums import Color, Figure
 from naturalnets.environments.app_components.interfaces import Clickable
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
-from naturalnets.environments.app_components.utils import put_text, render_onto_bb, get_image_path
+from naturalnets.environments.app_components.utils import put_text, render_onto_bb, get_image_path, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 from naturalnets.environments.app_components.widgets.dropdown import Dropdown, DropdownItem
 
@@ -92,10 +91,19 @@ class FigurePrinter(Page, RewardElement):
         self.current_figure = None
 
         self._figure_color_from_settings: Color = Color.BLACK
+        self._rendered_figure_color = None
 
         # Initially, the figure is not printed, thus reset the state using this function
         self._show_figure(0)
 
+    def snapshot(self) -> tuple:
+        return (self.dropdown_opened, self.current_figure, self._figure_color_from_settings,
+                self._rendered_figure_color)
+
+    def restore(self, record: tuple) -> None:
+        (self.dropdown_opened, self.current_figure, self._figure_color_from_settings,
+         self._rendered_figure_color) = record
+
     def _draw_figure(self):
         figure = self.dropdown.get_current_value()
         if figure is None:
@@ -181,7 +189,7 @@ class FigurePrinter(Page, RewardElement):
             figure_img_path = get_image_path(
                 IMAGES_PATH, self.current_figure.value)
             img = render_onto_bb(img, self.FIGURE_CANVAS_BB,
-                                 cv2.imread(figure_img_path))
+                                 load_image(figure_img_path))
 
             # Indicate the selected color of the figure with a text string
             x, y, _, height = self.FIGURE_CANVAS_BB.get_as_tuple()
@@ -78,6 +78,14 @@ class TextPrinter(Page, RewardElement):
         # Initially the output is not printed, thus set the state to 0
         self.get_state()[0] = 0
 
+    def snapshot(self) -> tuple:
+        return self.display_dict, list(self._font_styles), self._font, self._font_size, self._color, self._n_words
+
+    def restore(self, record: tuple) -> None:
+        self.display_dict, font_styles, self._font, self._font_size, self._color, self._n_words = record
+        # The font styles are changed in place, thus they must not be the recorded list
+        self._font_styles = list(font_styles)
+
     def set_font_style(self, style: FontStyle, enabled: int) -> None:
         if enabled:
             self._font_styles.append(style)
@@ -1,9 +1,9 @@
 from typing import Dict, List
 
-import cv2
 import numpy as np
 
 from naturalnets.environments.app_components.bounding_box import BoundingBox
+from naturalnets.environments.app_components.click_index import ClickIndex
 from naturalnets.environments.app_components.interfaces import Clickable
 from naturalnets.environments.gui_app.main_window import MainWindow
 from naturalnets.environments.app_components.page import Page
@@ -13,7 +13,7 @@ from naturalnets.environments.gui_app.settings_window_pages.car_configurator_set
 from naturalnets.environments.gui_app.settings_window_pages.figure_printer_settings import FigurePrinterSettings
 from naturalnets.environments.gui_app.settings_window_pages.text_printer_settings import TextPrinterSettings
 from naturalnets.environments.app_components.state_element import StateElement
-from naturalnets.environments.app_components.utils import get_group_bounding_box, render_onto_bb
+from naturalnets.environments.app_components.utils import get_group_bounding_box, render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -68,6 +68,7 @@ class SettingsWindow(StateElement, Clickable, RewardElement):
                    lambda: self.set_current_tab(self.figure_printer_settings)),
         ]
 
+        self.tab_buttons_index = ClickIndex(self.tab_buttons)
         self.tabs_bb: BoundingBox = self.get_tabs_bb(self.tab_buttons)
         self.tabs_to_state_index: Dict[Page, int] = {
             tab: index + 1 for index, tab in enumerate(self.tabs)
@@ -112,6 +113,12 @@ class SettingsWindow(StateElement, Clickable, RewardElement):
 
         self.set_current_tab(self.text_printer_settings)
 
+    def snapshot(self) -> tuple:
+        return self.current_tab,
+
+    def restore(self, record: tuple) -> None:
+        self.current_tab, = record
+
     def is_open(self) -> int:
         """Returns if the settings window is open."""
         return self.get_state()[0]
@@ -161,9 +168,8 @@ class SettingsWindow(StateElement, Clickable, RewardElement):
         Args:
             click_position (np.ndarray): the click position (inside the menu-bounding-box).
         """
-        for tab in self.tab_buttons:
-            if tab.is_clicked_by(click_position):
-                tab.handle_click(click_position)
+        for tab in self.tab_buttons_index.get_clicked_elements(click_position):
+            tab.handle_click(click_position)
 
     def set_current_tab(self, current_tab: Page):
         """Sets the currently selected/shown page/tab, setting the respective
@@ -189,7 +195,7 @@ class SettingsWindow(StateElement, Clickable, RewardElement):
     def render(self, img: np.ndarray) -> np.ndarray:
         """ Renders the main window and all its children onto the given image.
         """
-        to_render = cv2.imread(self.current_tab.get_img_path())
+        to_render = load_image(self.current_tab.get_img_path())
         img = render_onto_bb(img, self.get_bb(), to_render)
         self.current_tab.render(img)
         return img
@@ -107,6 +107,12 @@ class CalculatorSettings(Page, RewardElement):
         self.multiplication.set_selected(0)
         self.division.set_selected(0)
 
+    def snapshot(self) -> tuple:
+        return self.opened_dd,
+
+    def restore(self, record: tuple) -> None:
+        self.opened_dd, = record
+
     def handle_click(self, click_position: np.ndarray):
         if self.is_popup_open():
             self.popup.handle_click(click_position)
@@ -226,6 +232,12 @@ class CalculatorSettingsPopup(Page, RewardElement):
 
         self.dropdown.set_selected_item(self.addition_ddi)
 
+    def snapshot(self) -> tuple:
+        return self.dropdown_opened,
+
+    def restore(self, record: tuple) -> None:
+        self.dropdown_opened, = record
+
     def handle_click(self, click_position: np.ndarray = None) -> None:
         # Check dropdown first, may obscure apply-button when opened
         if self.dropdown_opened:
@@ -402,6 +402,14 @@ class CarDisabledPopup(Page, RewardElement):
     def reset(self):
         self.disabled_cars: List[str] = []
 
+    def snapshot(self) -> tuple:
+        return list(self.disabled_cars),
+
+    def restore(self, record: tuple) -> None:
+        disabled_cars, = record
+        # The disabled cars are appended in place, thus they must not be the recorded list
+        self.disabled_cars = list(disabled_cars)
+
     def _get_disabled_cars_str(self) -> str:
         disabled_cars_str = "Disabled "
         for car in self.disabled_cars:
@@ -281,6 +281,12 @@ class FigureCheckboxesPopup(Page, RewardElement):
         self.dropdown_opened = False
         self.dropdown.set_selected_item(self.christmas_tree_ddi)
 
+    def snapshot(self) -> tuple:
+        return self.dropdown_opened,
+
+    def restore(self, record: tuple) -> None:
+        self.dropdown_opened, = record
+
     def handle_click(self, click_position: np.ndarray) -> None:
         # Check dropdown first, may obscure apply-button when opened
         if self.dropdown_opened:
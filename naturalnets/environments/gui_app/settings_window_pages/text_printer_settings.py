@@ -171,6 +171,12 @@ class TextPrinterSettings(Page, RewardElement):
         self.italic.set_selected(0)
         self.underline.set_selected(0)
 
+    def snapshot(self) -> tuple:
+        return self.opened_dd,
+
+    def restore(self, record: tuple) -> None:
+        self.opened_dd, = record
+
     def open_popup(self):
         """Opens the text-printer settings popup, if the green radio-button is not
         selected. Should only be called when the green radio button is clicked."""
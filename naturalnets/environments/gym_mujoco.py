@@ -17,6 +17,9 @@ class GymMujocoCfg:
 @register_environment_class
 class GymMujoco(IEnvironment):
 
+    # The environment is seeded on each reset
+    REUSABLE = True
+
     def __init__(self, configuration: dict, *, render_mode: str = None, **kwargs):
 
         self.config = GymMujocoCfg(**configuration)
@@ -1,9 +1,10 @@
 import abc
-from typing import Optional, Dict, Type, Union
+from typing import Optional, Dict, Sequence, Tuple, Type, Union
 
 import numpy as np
 
 registered_environment_classes = {}
+registered_vectorized_environment_classes = {}
 
 
 def get_environment_class(environment_class_name: str) -> Union[Type["IEnvironment"], Type["IGUIEnvironment"]]:
@@ -19,8 +20,29 @@ def register_environment_class(environment_class):
     return environment_class
 
 
+def get_vectorized_environment_class(environment_class_name: str) -> Optional[Type["IVectorizedEnvironment"]]:
+    """Returns the vectorized implementation of the environment, or None if it has none."""
+    return registered_vectorized_environment_classes.get(environment_class_name)
+
+
+def register_vectorized_environment_class(environment_class: Type["IEnvironment"]):
+    """
+    Registers the decorated IVectorizedEnvironment as the vectorized implementation of the given environment class,
+    i.e. it can be retrieved with get_vectorized_environment_class() using the name of the environment class.
+    """
+    def register(vectorized_environment_class):
+        registered_vectorized_environment_classes[environment_class.__name__] = vectorized_environment_class
+        return vectorized_environment_class
+
+    return register
+
+
 class IEnvironment(abc.ABC):
 
+    # True if reset() restores exactly the state of a newly created instance, such that one instance can be used for
+    # many episodes instead of creating a new one for each episode (see EpisodeRunner.eval_fitness())
+    REUSABLE: bool = False
+
     @abc.abstractmethod
     def __init__(self, configuration: dict, **kwargs):
         pass
@@ -45,6 +67,14 @@ class IEnvironment(abc.ABC):
     def render(self, enhancer_info: Optional[Dict[str, np.ndarray]] = None):
         pass
 
+    def get_episode_reward_bounds(self) -> Optional[Tuple[float, float]]:
+        """
+        Returns the lower and upper bound of the total reward of one episode, or None if they are not known. The
+        bounds do not need to be tight, but no episode may exceed them (see the racing of the training evaluations in
+        train()).
+        """
+        return None
+
 
 class IGUIEnvironment(IEnvironment):
     @abc.abstractmethod
@@ -74,3 +104,32 @@ class IGUIEnvironment(IEnvironment):
     @abc.abstractmethod
     def get_observation_dict(self) -> dict:
         pass
+
+
+class IVectorizedEnvironment(abc.ABC):
+    """
+    Holds a number of independent instances of an environment, which are stepped in lockstep (see
+    EpisodeRunner.eval_fitness_batched()). Each instance behaves exactly like the environment that is reset with the
+    same environment seed and receives the same actions.
+    """
+
+    @abc.abstractmethod
+    def __init__(self, configuration: dict, number_instances: int):
+        pass
+
+    @abc.abstractmethod
+    def reset(self, env_seeds: Sequence[int]) -> np.ndarray:
+        """
+        :param env_seeds: One environment seed per instance
+        :return: The observations of all instances, with shape (number_instances, number_inputs)
+        """
+        pass
+
+    @abc.abstractmethod
+    def step(self, actions: np.ndarray):
+        """
+        :param actions: The actions of all instances, with shape (number_instances, number_outputs)
+        :return: The observations, the rewards with shape (number_instances,), the done flags (either one per instance,
+            or one that is shared by all instances) and an info dict
+        """
+        pass
@@ -1,7 +1,7 @@
 """The controller for the Passlock App."""
-from copy import copy
 import numpy as np
-from naturalnets.environments.app_components.reward_element import RewardElement
+from naturalnets.environments.app_components.reward_element import RewardCounter, RewardElement
+from naturalnets.environments.app_components.snapshot import AppSnapshot, get_state_elements
 from naturalnets.environments.app_components.state_element import StateElement
 from naturalnets.environments.passlock_app.auth_window import AuthenticationWindow
 from naturalnets.environments.passlock_app.home_window import HomeWindow
@@ -30,8 +30,12 @@ class PasslockAppController:
         self._states_info = states_info
 
         self.reward_array = None
+        self.reward_counter = None
         self.reset_reward_array()
 
+        # Recorded after the first reset, all further resets restore it
+        self._initial_snapshot = None
+
     def calculate_reward_count(self, reward_count, reward_element: RewardElement):
         '''
         Calculates the total number of rewards in the reward tree.
@@ -52,6 +56,7 @@ class PasslockAppController:
             reward_count, self.auth_window)
 
         self.reward_array = np.zeros(reward_count, dtype=np.uint8)
+        self.reward_counter = RewardCounter()
 
         last_reward_index = self.assign_reward(0, self.home_window)
         last_reward_index = self.assign_reward(
@@ -64,7 +69,7 @@ class PasslockAppController:
         '''
         reward_count = reward_element.get_reward_count()
         reward_element.assign_reward_slice(
-            self.reward_array[current_index:current_index + reward_count])
+            self.reward_array[current_index:current_index + reward_count], self.reward_counter)
         current_index += reward_count
 
         for reward_child in reward_element.get_reward_children():
@@ -76,6 +81,10 @@ class PasslockAppController:
         '''
         Resets the app.
         '''
+        if self._initial_snapshot is not None:
+            self._initial_snapshot.restore()
+            return
+
         self.home_window.reset()
         self.auth_window.reset()
 
@@ -87,6 +96,10 @@ class PasslockAppController:
         self.assign_state(self.home_window, 0, [])
         self.assign_state(self.auth_window, 0, [])
 
+        self._initial_snapshot = AppSnapshot(
+            [self._state, self.reward_array],
+            [self.reward_counter] + get_state_elements([self.home_window, self.auth_window]))
+
     def get_element_state_len(self, state_element: StateElement) -> int:
         """Collects the total state length of the given StateElement and all its children.
 
@@ -156,7 +169,7 @@ class PasslockAppController:
     def handle_click(self, click_position: np.ndarray):
         """Delegates click-handling to the clicked component.
         """
-        previous_reward_array = copy(self.reward_array)
+        previous_reward_count = self.reward_counter.count
 
         if self.auth_window.is_open():
             if self.auth_window.handle_click(click_position):
@@ -165,7 +178,7 @@ class PasslockAppController:
             if self.home_window.handle_click(click_position):
                 self.log_out()
 
-        reward = np.count_nonzero(previous_reward_array != self.reward_array)
+        reward = self.reward_counter.count - previous_reward_count
 
         return reward
 
@@ -88,6 +88,12 @@ class AuthenticationWindow(StateElement, Clickable, RewardElement):
         self.open()
         self.current_page = self.signup
 
+    def snapshot(self) -> tuple:
+        return self.current_page,
+
+    def restore(self, record: tuple) -> None:
+        self.current_page, = record
+
     def is_open(self) -> int:
         """Returns if the settings window is open."""
         return self.get_state()[0]
@@ -6,6 +6,7 @@ from typing import Dict, List
 import numpy as np
 
 from naturalnets.environments.app_components.bounding_box import BoundingBox
+from naturalnets.environments.app_components.click_index import ClickIndex
 from naturalnets.environments.app_components.interfaces import Clickable
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.app_components.reward_element import RewardElement
@@ -82,6 +83,7 @@ class HomeWindow(StateElement, Clickable, RewardElement):
             self.darkmode_button,
             Button(self.SYNC_BUTTON_BB, self.syncpopup.open_popup)
         ]
+        self.buttons_index = ClickIndex(self.buttons)
 
         self.add_children(
             [self.manual, self.auto, self.search, self.settings, self.syncpopup])
@@ -111,9 +113,17 @@ class HomeWindow(StateElement, Clickable, RewardElement):
         self.auto.reset()
         self.search.reset()
         self.settings.reset()
+        self.syncpopup.reset()
+        self.darkmode_button.reset()
         self.current_page = None
         self.get_state()[:] = 0
 
+    def snapshot(self) -> tuple:
+        return self.current_page,
+
+    def restore(self, record: tuple) -> None:
+        self.current_page, = record
+
     def close(self):
         """Closes the home window."""
         self.register_selected_reward(["home_window", "close"])
@@ -203,11 +213,9 @@ class HomeWindow(StateElement, Clickable, RewardElement):
         Args:
             click_position (np.ndarray): the click position (inside the menu-bounding-box).
         """
-        for button in self.buttons:
-            if button.is_clicked_by(click_position):
-
-                button.handle_click(click_position)
-                break
+        button = self.buttons_index.get_clicked_element(click_position)
+        if button is not None:
+            button.handle_click(click_position)
 
     def is_popup_open(self) -> bool:
         '''
@@ -172,6 +172,13 @@ class SearchPage(Page, RewardElement):
         self.reset_bounding_boxes_to_original()
         self.get_state()[:] = 0
 
+    def snapshot(self) -> tuple:
+        # The image depends on the selected widgets, see render()
+        return self._img_path,
+
+    def restore(self, record: tuple) -> None:
+        self._img_path, = record
+
     def reset_search_text(self):
         '''
         Resets the search textfield to its default state.
@@ -1,12 +1,13 @@
 import logging
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 from attr import define, field, validators
 
 from naturalnets.enhancers.random_enhancer import RandomEnhancer
+from naturalnets.environments.app_components.utils import get_app_episode_reward_bounds
 from naturalnets.environments.gui_app.enums import Color
 from naturalnets.environments.gui_app.gui_app import FakeBugOptions
 from naturalnets.environments.i_environment import IGUIEnvironment, register_environment_class
@@ -32,6 +33,8 @@ class PasslockAppCfg:
 @register_environment_class
 class PasslockApp(IGUIEnvironment):
 
+    REUSABLE = True
+
     screen_width: int = 1920
     screen_height: int = 987
 
@@ -140,6 +143,9 @@ class PasslockApp(IGUIEnvironment):
     def get_number_outputs(self) -> int:
         return 2
 
+    def get_episode_reward_bounds(self) -> Tuple[float, float]:
+        return get_app_episode_reward_bounds(self.config.number_time_steps, self.max_reward)
+
     def reset(self, env_seed: int = None) -> np.ndarray:
         self.app_controller.reset()
 
@@ -5,66 +5,55 @@ from naturalnets.environments.password_manager_app.page_manager import PageManag
 
 
 class AccountManager:
-    """The account manager manages all existing accounts."""
-    instance = None
+    """The account manager manages all existing accounts of one PasswordManagerApp."""
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(AccountManager, cls).__new__(cls)
+    def __init__(self, page_manager: PageManager):
+        self.page_manager = page_manager
+        self.currentAccounts: List[Account] = []
 
-        return cls._instance
-
-    currentAccounts: List[Account] = []
-
-    @staticmethod
-    def add_account(account: Account) -> None:
-        if len(AccountManager.currentAccounts) < 3:
-            if not AccountManager.is_in_current_accounts(account.get_account_name()):
-                AccountManager.currentAccounts.append(account)
-                PageManager.return_to_main_page()
+    def add_account(self, account: Account) -> None:
+        if len(self.currentAccounts) < 3:
+            if not self.is_in_current_accounts(account.get_account_name()):
+                self.currentAccounts.append(account)
+                self.page_manager.return_to_main_page()
             else:
-                PageManager.error(account.get_account_name())
+                self.page_manager.error(account.get_account_name())
 
-    @staticmethod
-    def edit_account(account: Account, old_account: Account) -> None:
-        AccountManager.delete_account(old_account.get_account_name())
-        AccountManager.add_account(account)
+    def edit_account(self, account: Account, old_account: Account) -> None:
+        self.delete_account(old_account.get_account_name())
+        self.add_account(account)
 
-    @staticmethod
-    def delete_account(account_name: str) -> None:
-        for current_account in AccountManager.currentAccounts:
+    def delete_account(self, account_name: str) -> None:
+        for current_account in self.currentAccounts:
             if current_account.get_account_name() == account_name:
-                AccountManager.currentAccounts.remove(current_account)
+                self.currentAccounts.remove(current_account)
 
-    @staticmethod
-    def get_account_by_name(account_name: str) -> Union[Account, None]:
-        for current_account in AccountManager.currentAccounts:
+    def get_account_by_name(self, account_name: str) -> Union[Account, None]:
+        for current_account in self.currentAccounts:
             if current_account.get_account_name() == account_name:
                 return current_account
         return None
 
-    @staticmethod
-    def is_in_current_accounts(account_name: str) -> bool:
-        if AccountManager.currentAccounts is None:
+    def is_in_current_accounts(self, account_name: str) -> bool:
+        if self.currentAccounts is None:
             return False
-        for currentAccount in AccountManager.currentAccounts:
+        for currentAccount in self.currentAccounts:
             if account_name == currentAccount.get_account_name():
                 return True
         return False
 
-    @staticmethod
-    def current_state() -> Union[List[int], None]:
+    def current_state(self) -> Union[List[int], None]:
         "The state of all existing accounts. Is the same as state_img in the main window."
-        if AccountManager.currentAccounts is None:
+        if self.currentAccounts is None:
             return [0, 0]
-        len_current_accounts = len(AccountManager.currentAccounts)
+        len_current_accounts = len(self.currentAccounts)
 
         # No account exists
         if len_current_accounts == 0:
             return [0, 0]
         # Only one account exists
         elif len_current_accounts == 1:
-            name = AccountManager.currentAccounts[0].get_account_name()
+            name = self.currentAccounts[0].get_account_name()
             # Only Hanna exists
             if name == NAME_ONE:
                 return [1, 1]
@@ -76,23 +65,23 @@ class AccountManager:
                 return [3, 1]
         # Only two account exist
         elif len_current_accounts == 2:
-            name = AccountManager.currentAccounts[0].get_account_name()
+            name = self.currentAccounts[0].get_account_name()
             if name == NAME_ONE:
-                if AccountManager.currentAccounts[1].get_account_name() == NAME_TWO:
+                if self.currentAccounts[1].get_account_name() == NAME_TWO:
                     # Only Hanna and Klaus exist
                     return [4, 0]
                 else:
                     # Only Hanna and Mariam exist
                     return [5, 0]
             elif name == NAME_TWO:
-                if AccountManager.currentAccounts[1].get_account_name() == NAME_ONE:
+                if self.currentAccounts[1].get_account_name() == NAME_ONE:
                     # Only Hanna and Klaus exist
                     return [4, 0]
                 else:
                     # Only Klaus and Mariam exist
                     return [6, 0]
             else:
-                if AccountManager.currentAccounts[1].get_account_name() == NAME_ONE:
+                if self.currentAccounts[1].get_account_name() == NAME_ONE:
                     # Only Hanna and Mariam exist
                     return [5, 0]
                 else:
@@ -104,6 +93,5 @@ class AccountManager:
         else:
             raise RuntimeError("Account structure should not exist.")
 
-    @staticmethod
-    def reset() -> None:
-        AccountManager.currentAccounts = []
+    def reset(self) -> None:
+        self.currentAccounts = []
@@ -1,6 +1,6 @@
-from coverage import Coverage
 import numpy as np
 
+from naturalnets.environments.password_manager_app.coverage_measurer import ICoverageMeasurer
 from naturalnets.environments.password_manager_app.main_window import MainWindow
 from naturalnets.environments.app_components.state_element import StateElement
 
@@ -11,28 +11,29 @@ class AppController:
     click- and render-root of the app).
     """
 
-    main_window = MainWindow()
+    def __init__(self, coverage_measurer: ICoverageMeasurer):
+        self.main_window = MainWindow()
 
-    def __init__(self, coverage_measurer: Coverage):
         self._total_state_len = 0
-        self._total_state_len += self.get_element_state_len(AppController.main_window)
+        self._total_state_len += self.get_element_state_len(self.main_window)
 
         self._state = np.zeros(self._total_state_len, dtype=np.int8)
         self._last_allocated_state_index = 0
 
         states_info = []
-        self.assign_state(AppController.main_window, 0, states_info)
+        self.assign_state(self.main_window, 0, states_info)
         self._states_info = states_info
 
         self.coverage_measurer = coverage_measurer
 
     def reset(self):
-        AppController.main_window.reset()
+        self.main_window.reset()
+        self.coverage_measurer.reset()
 
         self._state = np.zeros(self._total_state_len, dtype=np.int8)
         self._last_allocated_state_index = 0
 
-        self.assign_state(AppController.main_window, 0, [])
+        self.assign_state(self.main_window, 0, [])
 
     def get_element_state_len(self, state_element: StateElement) -> int:
         """Collects the total state length of the given StateElement and
@@ -108,18 +109,10 @@ class AppController:
         """Delegates click-handling to the clicked component."""
 
         self.coverage_measurer.start()
-        AppController.main_window.handle_click(click_position)
+        self.main_window.handle_click(click_position)
         self.coverage_measurer.stop()
 
-        coverage_data = self.coverage_measurer.get_data()
-        measured_files = coverage_data.measured_files()
-
-        measured_lines = 0
-
-        for measured_file in measured_files:
-            measured_lines += len(coverage_data.lines(measured_file))
-
-        return measured_lines
+        return self.coverage_measurer.get_number_covered_lines()
 
     def render(self, img: np.ndarray) -> np.ndarray:
         """Calls the main window rendering method.
@@ -127,5 +120,5 @@ class AppController:
         Args:
             img (np.ndarray): The cv2 image to render onto.
         """
-        img = AppController.main_window.render(img)
+        img = self.main_window.render(img)
         return img
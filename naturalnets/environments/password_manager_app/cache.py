@@ -1,10 +1,11 @@
 class Cache:
-    cache: str = ""
+    """The clipboard of one PasswordManagerApp."""
 
-    @staticmethod
-    def get_cache() -> str:
-        return Cache.cache
+    def __init__(self):
+        self.cache: str = ""
 
-    @staticmethod
-    def set_cache(newCache: str) -> None:
-        Cache.cache = newCache
+    def get_cache(self) -> str:
+        return self.cache
+
+    def set_cache(self, newCache: str) -> None:
+        self.cache = newCache
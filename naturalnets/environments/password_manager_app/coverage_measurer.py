@@ -0,0 +1,128 @@
+import abc
+import os
+import sys
+from typing import Dict, Set, Tuple
+
+from coverage import Coverage
+
+import naturalnets
+
+# Only the code of the naturalnets package is measured, which is the same code that coverage.py measures when clicking
+# (the standard library and installed packages are excluded by coverage.py)
+MEASURED_DIRECTORY = os.path.dirname(os.path.abspath(naturalnets.__file__))
+
+
+class ICoverageMeasurer(abc.ABC):
+    """
+    Measures the code coverage of the PasswordManagerApp, which is used as its reward. The measurement is started and
+    stopped around each click, and the number of distinct lines that have been executed since the app was reset is the
+    running reward of the app.
+    """
+
+    @abc.abstractmethod
+    def start(self):
+        pass
+
+    @abc.abstractmethod
+    def stop(self):
+        pass
+
+    @abc.abstractmethod
+    def get_number_covered_lines(self) -> int:
+        pass
+
+    @abc.abstractmethod
+    def reset(self):
+        pass
+
+
+class LineTracer(ICoverageMeasurer):
+    """
+    Records the executed lines with a minimal trace function. Each executed (file, line) pair is added to a set, thus
+    the running reward is only the size of this set and does not need to be recalculated after each click. Gives the
+    same line counts as CoveragePyMeasurer, but is much faster.
+    """
+
+    def __init__(self):
+        self.covered_lines: Set[Tuple[str, int]] = set()
+
+        # Caches for each file name if it is measured
+        self._measured_files: Dict[str, bool] = {}
+
+        self._previous_trace_function = None
+
+    def _is_measured(self, file_name: str) -> bool:
+        try:
+            return self._measured_files[file_name]
+        except KeyError:
+            absolute_file_name = os.path.abspath(file_name)
+
+            # The lines of this module (for example the ones of stop()) are not part of the app
+            is_measured = (absolute_file_name.startswith(MEASURED_DIRECTORY + os.sep)
+                           and absolute_file_name != os.path.abspath(__file__))
+
+            self._measured_files[file_name] = is_measured
+            return is_measured
+
+    def _trace_call(self, frame, event, arg):
+        if self._is_measured(frame.f_code.co_filename):
+            return self._trace_line
+
+        # Do not trace the lines of functions that are not measured
+        return None
+
+    def _trace_line(self, frame, event, arg):
+        if event == "line":
+            self.covered_lines.add((frame.f_code.co_filename, frame.f_lineno))
+
+        return self._trace_line
+
+    def start(self):
+        self._previous_trace_function = sys.gettrace()
+        sys.settrace(self._trace_call)
+
+    def stop(self):
+        sys.settrace(self._previous_trace_function)
+        self._previous_trace_function = None
+
+    def get_number_covered_lines(self) -> int:
+        return len(self.covered_lines)
+
+    def reset(self):
+        self.covered_lines.clear()
+
+
+class CoveragePyMeasurer(ICoverageMeasurer):
+    """
+    Measures the code coverage with coverage.py. This was originally used for the reward of the PasswordManagerApp,
+    but is slow since the coverage data of all measured files is collected and counted again after each click.
+    """
+
+    def __init__(self):
+        # Omit this module, otherwise the line of stop() which stops the measurement would be counted
+        self.coverage = Coverage(data_file=None, config_file=True, omit=[os.path.abspath(__file__)])
+
+    def start(self):
+        self.coverage.start()
+
+    def stop(self):
+        self.coverage.stop()
+
+    def get_number_covered_lines(self) -> int:
+        coverage_data = self.coverage.get_data()
+
+        measured_lines = 0
+
+        for measured_file in coverage_data.measured_files():
+            measured_lines += len(coverage_data.lines(measured_file))
+
+        return measured_lines
+
+    def reset(self):
+        self.coverage.erase()
+
+
+coverage_measurer_classes = {
+    "line_tracer": LineTracer,
+    "coverage_py": CoveragePyMeasurer
+}
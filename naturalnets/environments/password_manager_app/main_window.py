@@ -2,7 +2,6 @@ import logging
 import os
 from typing import List, Union
 
-import cv2
 import numpy as np
 from naturalnets.environments.password_manager_app.window_pages.account_window_pages.account_error import AccountError
 from naturalnets.environments.password_manager_app.account_manager.account_manager import AccountManager
@@ -12,7 +11,7 @@ from naturalnets.environments.password_manager_app.constants import IMAGES_PATH,
 from naturalnets.environments.app_components.interfaces import Clickable
 from naturalnets.environments.app_components.page import Page, Widget
 from naturalnets.environments.app_components.state_element import StateElement
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 from naturalnets.environments.app_components.widgets.dropdown import Dropdown, DropdownItem
 from naturalnets.environments.password_manager_app.window_pages.account_window_pages.add_account import AddAccount
@@ -35,6 +34,7 @@ from naturalnets.environments.password_manager_app.window_pages.function_bar_win
 )
 from naturalnets.environments.password_manager_app.window_pages.options import Options
 from naturalnets.environments.password_manager_app.cache import Cache
+from naturalnets.environments.password_manager_app.page_manager import PageManager
 
 
 class MainWindow(StateElement, Clickable):
@@ -84,18 +84,24 @@ class MainWindow(StateElement, Clickable):
         self.current_page = None
         self.new_path = ""
 
-        self.add_account = AddAccount()
-        self.edit_account = EditAccount()
-        self.view_account = ViewAccount()
-        self.confirm_delete_account = ConfirmDeleteAccount()
-        self.options = Options()
-        self.database = Database()
-        self.account_bar = AccountBar()
-        self.help = Help()
-        self.about = About()
-        self.master_password = MasterPassword()
-        self.file_system = FileSystem()
-        self.account_error = AccountError()
+        # The page navigation, the accounts and the clipboard of this app, which are shared by its pages. Each
+        # MainWindow has its own, so that multiple apps in the same process do not influence each other.
+        self.page_manager = PageManager(self)
+        self.account_manager = AccountManager(self.page_manager)
+        self.cache = Cache()
+
+        self.add_account = AddAccount(self.account_manager, self.cache, self.page_manager)
+        self.edit_account = EditAccount(self.account_manager, self.cache, self.page_manager)
+        self.view_account = ViewAccount(self.cache, self.page_manager)
+        self.confirm_delete_account = ConfirmDeleteAccount(self.account_manager, self.page_manager)
+        self.options = Options(self.page_manager)
+        self.database = Database(self.page_manager)
+        self.account_bar = AccountBar(self.page_manager)
+        self.help = Help(self.page_manager)
+        self.about = About(self.page_manager)
+        self.master_password = MasterPassword(self.page_manager)
+        self.file_system = FileSystem(self.page_manager)
+        self.account_error = AccountError(self.page_manager)
 
         self.pages: List[Page] = [
             self.add_account,
@@ -148,7 +154,7 @@ class MainWindow(StateElement, Clickable):
         self.add_account.reset()
         self.edit_account.reset()
         self.view_account.reset()
-        AccountManager.reset()
+        self.account_manager.reset()
 
         self.set_current_page(None)
         self.refresh_state()
@@ -160,19 +166,19 @@ class MainWindow(StateElement, Clickable):
         self.set_current_page(self.add_account)
 
     def function_delete_account(self) -> None:
-        account_to_delete = AccountManager.get_account_by_name(self.get_selected_account_name())
+        account_to_delete = self.account_manager.get_account_by_name(self.get_selected_account_name())
         if account_to_delete is not None:
             self.confirm_delete_account.set_name(self.get_selected_account_name())
             self.set_current_page(self.confirm_delete_account)
 
     def function_edit_account(self) -> None:
-        account_to_edit = AccountManager.get_account_by_name(self.get_selected_account_name())
+        account_to_edit = self.account_manager.get_account_by_name(self.get_selected_account_name())
         if account_to_edit is not None:
             self.edit_account.set_account(account_to_edit)
             self.set_current_page(self.edit_account)
 
     def function_view_account(self) -> None:
-        account_to_view = AccountManager.get_account_by_name(self.get_selected_account_name())
+        account_to_view = self.account_manager.get_account_by_name(self.get_selected_account_name())
         if account_to_view is not None:
             self.view_account.set_account(account_to_view)
             self.set_current_page(self.view_account)
@@ -184,16 +190,16 @@ class MainWindow(StateElement, Clickable):
     def copy_username(self) -> None:
         selected_account_name = self.get_selected_account_name()
         if selected_account_name is not None:
-            selected_account = AccountManager.get_account_by_name(selected_account_name)
+            selected_account = self.account_manager.get_account_by_name(selected_account_name)
             if selected_account is not None:
-                Cache.set_cache(selected_account.get_user_id())
+                self.cache.set_cache(selected_account.get_user_id())
 
     def copy_password(self) -> None:
         selected_account_name = self.get_selected_account_name()
         if selected_account_name is not None:
-            selected_account = AccountManager.get_account_by_name(selected_account_name)
+            selected_account = self.account_manager.get_account_by_name(selected_account_name)
             if selected_account is not None:
-                Cache.set_cache(selected_account.get_password())
+                self.cache.set_cache(selected_account.get_password())
 
     def launch_url(self) -> None:
         logging.debug("launch_url")
@@ -295,7 +301,7 @@ class MainWindow(StateElement, Clickable):
     def render(self, img: np.ndarray):
         """Renders the main window and all its children onto the given image."""
 
-        to_render = cv2.imread(self.IMG_PATH)
+        to_render = load_image(self.IMG_PATH)
         img = render_onto_bb(img, self.get_bb(), to_render)
         if self.current_page is not None:
             img = self.current_page.render(img)
@@ -311,7 +317,7 @@ class MainWindow(StateElement, Clickable):
         self._bounding_box = bounding_box
 
     def refresh_state(self) -> None:
-        self.STATE_IMG = AccountManager.current_state()
+        self.STATE_IMG = self.account_manager.current_state()
 
         if self.STATE_IMG[0] == 0:
             self.get_state()[12] = 0
@@ -1,69 +1,48 @@
-class PageManager:
-    @staticmethod
-    def return_to_main_page() -> None:
-        from naturalnets.environments.password_manager_app.app_controller import AppController
-
-        AppController.main_window.set_current_page(None)
-
-    @staticmethod
-    def error(account_name: str) -> None:
-        "This opens the error page. Gets thrown when the username already exists."
-        from naturalnets.environments.password_manager_app.app_controller import AppController
-
-        AppController.main_window.function_account_error(account_name)
+from typing import TYPE_CHECKING
 
-    @staticmethod
-    def open_about() -> None:
-        from naturalnets.environments.password_manager_app.app_controller import AppController
+if TYPE_CHECKING:
+    from naturalnets.environments.password_manager_app.main_window import MainWindow
 
-        AppController.main_window.set_current_page(AppController.main_window.about)
 
-    @staticmethod
-    def open_file_system() -> None:
-        from naturalnets.environments.password_manager_app.app_controller import AppController
-
-        AppController.main_window.set_current_page(AppController.main_window.file_system)
-
-    @staticmethod
-    def open_master_password() -> None:
-        from naturalnets.environments.password_manager_app.app_controller import AppController
-
-        AppController.main_window.set_current_page(AppController.main_window.master_password)
+class PageManager:
+    """Opens the pages of the MainWindow of one PasswordManagerApp, for the pages and the AccountManager of the same
+    app."""
 
-    @staticmethod
-    def add_account() -> None:
-        from naturalnets.environments.password_manager_app.app_controller import AppController
+    def __init__(self, main_window: "MainWindow"):
+        self.main_window = main_window
 
-        AppController.main_window.function_add_account()
+    def return_to_main_page(self) -> None:
+        self.main_window.set_current_page(None)
 
-    @staticmethod
-    def delete_account() -> None:
-        from naturalnets.environments.password_manager_app.app_controller import AppController
+    def error(self, account_name: str) -> None:
+        "This opens the error page. Gets thrown when the username already exists."
+        self.main_window.function_account_error(account_name)
 
-        AppController.main_window.function_delete_account()
+    def open_about(self) -> None:
+        self.main_window.set_current_page(self.main_window.about)
 
-    @staticmethod
-    def edit_account() -> None:
-        from naturalnets.environments.password_manager_app.app_controller import AppController
+    def open_file_system(self) -> None:
+        self.main_window.set_current_page(self.main_window.file_system)
 
-        AppController.main_window.function_edit_account()
+    def open_master_password(self) -> None:
+        self.main_window.set_current_page(self.main_window.master_password)
 
-    @staticmethod
-    def view_account() -> None:
-        from naturalnets.environments.password_manager_app.app_controller import AppController
+    def add_account(self) -> None:
+        self.main_window.function_add_account()
 
-        AppController.main_window.function_view_account()
+    def delete_account(self) -> None:
+        self.main_window.function_delete_account()
 
-    @staticmethod
-    def copy_username() -> None:
-        from naturalnets.environments.password_manager_app.app_controller import AppController
+    def edit_account(self) -> None:
+        self.main_window.function_edit_account()
 
-        AppController.main_window.copy_username()
-        AppController.main_window.set_current_page(None)
+    def view_account(self) -> None:
+        self.main_window.function_view_account()
 
-    @staticmethod
-    def copy_password() -> None:
-        from naturalnets.environments.password_manager_app.app_controller import AppController
+    def copy_username(self) -> None:
+        self.main_window.copy_username()
+        self.main_window.set_current_page(None)
 
-        AppController.main_window.copy_password()
-        AppController.main_window.set_current_page(None)
+    def copy_password(self) -> None:
+        self.main_window.copy_password()
+        self.main_window.set_current_page(None)
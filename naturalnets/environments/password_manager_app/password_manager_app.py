@@ -2,13 +2,13 @@ import logging
 import time
 from typing import Optional, Dict, List, Tuple
 
-from coverage import Coverage
 import cv2
 import numpy as np
 from attrs import define, field, validators
 
 from naturalnets.enhancers import RandomEnhancer
 from naturalnets.environments.password_manager_app.app_controller import AppController
+from naturalnets.environments.password_manager_app.coverage_measurer import coverage_measurer_classes
 from naturalnets.environments.password_manager_app.enums import Color
 from naturalnets.environments.i_environment import (
     register_environment_class,
@@ -22,12 +22,17 @@ class PasswordManagerAppCfg:
     number_time_steps: int = field(validator=[validators.instance_of(int), validators.gt(0)])
     include_fake_bug: bool = False
     fake_bugs: List[str] = []
+    # How the code coverage, which is the reward, is measured. "line_tracer" gives the same reward as "coverage_py"
+    # (i.e. coverage.py), but is much faster.
+    coverage_measurer: str = field(default="line_tracer", validator=validators.in_(coverage_measurer_classes.keys()))
 
 
 @register_environment_class
 class PasswordManagerApp(IGUIEnvironment):
     """Starting point of the password manager app."""
 
+    REUSABLE = True
+
     screen_width: int = 448
     screen_height: int = 448
 
@@ -38,9 +43,9 @@ class PasswordManagerApp(IGUIEnvironment):
 
         self.config = PasswordManagerAppCfg(**configuration)
 
-        # Creates the measurment tool from coverage.py for the
-        # code coverage that is for the reward
-        coverage_measurer = Coverage(data_file=None, config_file=True)
+        # Creates the measurement tool for the code coverage that is used
+        # for the reward
+        coverage_measurer = coverage_measurer_classes[self.config.coverage_measurer]()
 
         self.app_controller = AppController(coverage_measurer)
 
@@ -1,5 +1,4 @@
 import os
-import cv2
 import numpy as np
 
 
@@ -14,7 +13,7 @@ from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.password_manager_app.page_manager import (
     PageManager
 )
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -32,8 +31,9 @@ class AccountError(Page):
     OK_BUTTON_BB = BoundingBox(188, 232, 73, 21)
     X_BUTTON_BB = BoundingBox(360, 148, 32, 31)
 
-    def __init__(self):
+    def __init__(self, page_manager: PageManager):
         Page.__init__(self, self.STATE_LEN, self.BOUNDING_BOX, self.IMG_PATH)
+        self.page_manager = page_manager
 
         self.buttons = [
             Button(self.OK_BUTTON_BB, self.yes),
@@ -41,10 +41,10 @@ class AccountError(Page):
         ]
 
     def yes(self) -> None:
-        PageManager.return_to_main_page()
+        self.page_manager.return_to_main_page()
 
     def no(self) -> None:
-        PageManager.return_to_main_page()
+        self.page_manager.return_to_main_page()
 
     def handle_click(self, click_position: np.ndarray = None) -> None:
         for button in self.buttons:
@@ -54,7 +54,7 @@ class AccountError(Page):
     def render(self, img: np.ndarray) -> np.ndarray:
         """Renders the main window and all its children onto the given
         image."""
-        to_render = cv2.imread(self.IMG_PATH)
+        to_render = load_image(self.IMG_PATH)
         img = render_onto_bb(img, self.BOUNDING_BOX, to_render)
         return img
 
@@ -1,5 +1,4 @@
 import os
-import cv2
 import numpy as np
 
 from naturalnets.environments.password_manager_app.account_manager.account_manager import (
@@ -16,7 +15,7 @@ from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.password_manager_app.page_manager import (
     PageManager
 )
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 
 
@@ -34,8 +33,10 @@ class ConfirmDeleteAccount(Page):
     NO_BUTTON_BB = BoundingBox(227, 233, 73, 24)
     X_BUTTON_BB = BoundingBox(374, 142, 26, 32)
 
-    def __init__(self):
+    def __init__(self, account_manager: AccountManager, page_manager: PageManager):
         Page.__init__(self, self.STATE_LEN, self.BOUNDING_BOX, self.IMG_PATH)
+        self.account_manager = account_manager
+        self.page_manager = page_manager
 
         self.buttons = [
             Button(self.YES_BUTTON_BB, self.yes),
@@ -44,11 +45,11 @@ class ConfirmDeleteAccount(Page):
         ]
 
     def yes(self) -> None:
-        AccountManager.delete_account(self.NAME_ACCOUNT_TO_DELETE)
-        PageManager.return_to_main_page()
+        self.account_manager.delete_account(self.NAME_ACCOUNT_TO_DELETE)
+        self.page_manager.return_to_main_page()
 
     def no(self) -> None:
-        PageManager.return_to_main_page()
+        self.page_manager.return_to_main_page()
 
     def handle_click(self, click_position: np.ndarray) -> None:
         for button in self.buttons:
@@ -58,7 +59,7 @@ class ConfirmDeleteAccount(Page):
     def render(self, img: np.ndarray) -> np.ndarray:
         """Renders this page onto the given image."""
 
-        to_render = cv2.imread(self.IMG_PATH)
+        to_render = load_image(self.IMG_PATH)
         img = render_onto_bb(img, self.BOUNDING_BOX, to_render)
         return img
 
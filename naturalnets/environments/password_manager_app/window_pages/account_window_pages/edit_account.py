@@ -1,6 +1,5 @@
 import logging
 import os
-import cv2
 import numpy as np
 from naturalnets.environments.password_manager_app.account_manager.account import Account
 from naturalnets.environments.password_manager_app.account_manager.account_manager import AccountManager
@@ -10,7 +9,7 @@ from naturalnets.environments.password_manager_app.constants import IMAGES_PATH,
 from naturalnets.environments.app_components.bounding_box import BoundingBox
 from naturalnets.environments.app_components.page import Page
 from naturalnets.environments.password_manager_app.page_manager import PageManager
-from naturalnets.environments.app_components.utils import render_onto_bb
+from naturalnets.environments.app_components.utils import render_onto_bb, load_image
 from naturalnets.environments.app_components.widgets.button import Button
 from naturalnets.environments.app_components.widgets.check_box import CheckBox
 from naturalnets.environments.app_components.widgets.dropdown import Dropdown, DropdownItem
@@ -49,8 +48,11 @@ class EditAccount(Page):
     URL_DD_BB = BoundingBox(77, 271, 265, 19)
     NOTES_DD_BB = BoundingBox(77, 350, 296, 24)
 
-    def __init__(self):
+    def __init__(self, account_manager: AccountManager, cache: Cache, page_manager: PageManager):
         Page.__init__(self, self.STATE_LEN, self.BOUNDING_BOX, self.IMG_PATH)
+        self.account_manager = account_manager
+        self.cache = cache
+        self.page_manager = page_manager
 
         self.account_to_edit = None
 
@@ -135,7 +137,7 @@ class EditAccount(Page):
             account_url = self.dropdown_url.get_current_value()
             account_notes = self.dropdown_notes.get_current_value()
 
-            AccountManager.edit_account(
+            self.account_manager.edit_account(
                 Account(account_name, account_user_id, account_password, account_url, account_notes),
                 self.account_to_edit,
             )
@@ -144,13 +146,13 @@ class EditAccount(Page):
 
     def cancel(self) -> None:
         self.reset()
-        PageManager.return_to_main_page()
+        self.page_manager.return_to_main_page()
 
     def copy(self, dropdownToCopy: Dropdown) -> None:
-        Cache.set_cache(dropdownToCopy.get_current_value())
+        self.cache.set_cache(dropdownToCopy.get_current_value())
 
     def past(self, dropdownToPast: Dropdown) -> None:
-        dropdownToPast.set_selected_value(Cache.get_cache())
+        dropdownToPast.set_selected_value(self.cache.get_cache())
 
     def generate(self) -> None:
         "Generates a random password (of all the three existing ones)."
@@ -223,7 +225,7 @@ class EditAccount(Page):
 
     def render(self, img: np.ndarray) -> np.ndarray:
         """Renders this page onto the given image."""
-        to_render = cv2.imread(self.IMG_PATH)
+        to_render = load_image(self.IMG_PATH)
         img = render_onto_bb(img, self.BOUNDING_BOX, to_render)
         for widget in self.get_widgets():
             img = widget.render(img)
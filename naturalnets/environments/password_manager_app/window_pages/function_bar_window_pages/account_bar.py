@@ -26,29 +26,30 @@ class AccountBar(Page):
     COPY_PASSWORD_BUTTON_BB = BoundingBox(60, 138, 170, 21)
     LAUNCH_URL_BUTTON_BB = BoundingBox(60, 160, 170, 20)
 
-    def __init__(self):
+    def __init__(self, page_manager: PageManager):
         Page.__init__(self, self.STATE_LEN, self.BOUNDING_BOX, self.IMG_PATH)
+        self.page_manager = page_manager
 
         self.buttons = [
-            Button(self.ADD_ACCOUNT_BUTTON_BB, PageManager.add_account),
-            Button(self.EDIT_ACCOUNT_BUTTON_BB, PageManager.edit_account),
-            Button(self.DELETE_ACCOUNT_BUTTON_BB, PageManager.delete_account),
-            Button(self.VIEW_ACCOUNT_BUTTON_BB, PageManager.view_account),
-            Button(self.COPY_USERNAME_BUTTON_BB, PageManager.copy_username),
-            Button(self.COPY_PASSWORD_BUTTON_BB, PageManager.copy_password),
+            Button(self.ADD_ACCOUNT_BUTTON_BB, self.page_manager.add_account),
+            Button(self.EDIT_ACCOUNT_BUTTON_BB, self.page_manager.edit_account),
+            Button(self.DELETE_ACCOUNT_BUTTON_BB, self.page_manager.delete_account),
+            Button(self.VIEW_ACCOUNT_BUTTON_BB, self.page_manager.view_account),
+            Button(self.COPY_USERNAME_BUTTON_BB, self.page_manager.copy_username),
+            Button(self.COPY_PASSWORD_BUTTON_BB, self.page_manager.copy_password),
             Button(self.LAUNCH_URL_BUTTON_BB, self.launch_url),
         ]
 
     def launch_url(self) -> None:
         logging.debug("launch_url")
-        PageManager.return_to_main_page()
+        self.page_manager.return_to_main_page()
 
     def handle_click(self, click_position: np.ndarray) -> None:
         if self.MENU_AREA_BB.is_point_inside(click_position):
             self.handle_menu_click(click_position)
             return
         else:
-            PageManager.return_to_main_page()
+            self.page_manager.return_to_main_page()
 
     def handle_menu_click(self, click_position: np.ndarray) -> None:
         for button in self.buttons:
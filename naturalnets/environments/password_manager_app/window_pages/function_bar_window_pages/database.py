@@ -23,15 +23,16 @@ class Database(Page):
     EXPORT_BUTTON_BB = BoundingBox(3, 178, 232, 22)
     IMPORT_BUTTON_BB = BoundingBox(3, 201, 232, 22)
 
-    def __init__(self):
+    def __init__(self, page_manager: PageManager):
         Page.__init__(self, self.STATE_LEN, self.BOUNDING_BOX, self.IMG_PATH)
+        self.page_manager = page_manager
 
         self.buttons = [
-            Button(self.NEW_DATABASE_BUTTON_BB, PageManager.open_file_system),
-            Button(self.OPEN_DATABASE_BUTTON_BB, PageManager.open_file_system),
-            Button(self.Change_MASTER_PASSWORD_BUTTON_BB, PageManager.open_master_password),
-            Button(self.EXPORT_BUTTON_BB, PageManager.open_file_system),
-            Button(self.IMPORT_BUTTON_BB, PageManager.open_file_system),
+            Button(self.NEW_DATABASE_BUTTON_BB, self.page_manager.open_file_system),
+            Button(self.OPEN_DATABASE_BUTTON_BB, self.page_manager.open_file_system),
+            Button(self.Change_MASTER_PASSWORD_BUTTON_BB, self.page_manager.open_master_password),
+            Button(self.EXPORT_BUTTON_BB, self.page_manager.open_file_system),
+            Button(self.IMPORT_BUTTON_BB, self.page_manager.open_file_system),
         ]
 
     def handle_click(self, click_position: np.ndarray) -> None:
@@ -39,7 +40,7 @@ class Database(Page):
             self.handle_menu_click(click_position)
             return
         else:
-            PageManager.return_to_main_page()
+            self.page_manager.return_to_main_page()
 
     def handle_menu_click(self, click_position: np.ndarray) -> None:
         for button in self.buttons:
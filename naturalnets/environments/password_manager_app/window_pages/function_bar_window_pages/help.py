@@ -19,11 +19,12 @@ class Help(Page):
 
     ABOUT_BUTTON_BB = BoundingBox(112, 25, 80, 22)
 
-    def __init__(self):
+    def __init__(self, page_manager: PageManager):
         Page.__init__(self, self.STATE_LEN, self.BOUNDING_BOX, self.IMG_PATH)
+        self.page_manager = page_manager
 
         self.buttons = [
-            Button(self.ABOUT_BUTTON_BB, PageManager.open_about),
+            Button(self.ABOUT_BUTTON_BB, self.page_manager.open_about),
         ]
 
     def handle_click(self, click_position: np.ndarray) -> None:
@@ -31,7 +32,7 @@ class Help(Page):
             self.handle_menu_click(click_position)
             return
         else:
-            PageManager.return_to_main_page()
+            self.page_manager.return_to_main_page()
 
     def handle_menu_click(self, click_position: np.ndarray) -> None:
         for button in self.buttons:
@@ -19,12 +19,13 @@ class About(Page):
     OK_BUTTON_BB = BoundingBox(201, 276, 45, 21)
     CLOSE_BUTTON_BB = BoundingBox(346, 112, 30, 30)
 
-    def __init__(self):
+    def __init__(self, page_manager: PageManager):
         Page.__init__(self, self.STATE_LEN, self.BOUNDING_BOX, self.IMG_PATH)
+        self.page_manager = page_manager
 
         self.buttons = [
-            Button(self.OK_BUTTON_BB, PageManager.return_to_main_page),
-            Button(self.CLOSE_BUTTON_BB, PageManager.return_to_main_page),
+            Button(self.OK_BUTTON_BB, self.page_manager.return_to_main_page),
+            Button(self.CLOSE_BUTTON_BB, self.page_manager.return_to_main_page),
         ]
 
     def handle_click(self, click_position: np.ndarray) -> None:
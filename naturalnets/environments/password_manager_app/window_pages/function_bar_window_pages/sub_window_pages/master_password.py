@@ -22,8 +22,9 @@ class MasterPassword(Page):
 
     PASSWORD_DD_BB = BoundingBox(115, 207, 265, 20)
 
-    def __init__(self):
+    def __init__(self, page_manager: PageManager):
         Page.__init__(self, self.STATE_LEN, self.BOUNDING_BOX, self.IMG_PATH)
+        self.page_manager = page_manager
 
         self.buttons = [
             Button(self.OK_BUTTON_BB, self.return_to_main_window),
@@ -39,7 +40,7 @@ class MasterPassword(Page):
         self.opened_dd = None
 
     def return_to_main_window(self) -> None:
-        PageManager.return_to_main_page()
+        self.page_manager.return_to_main_page()
 
         self.dropdown.set_selected_item(None)
         self.dropdown.close()
@@ -27,6 +27,13 @@ class CanonicalEs(IOptimizer):
         self.w = self.get_reward_weights(self.config.parent_population_size)
         self.genomes = []
 
+    def get_population_size(self) -> int:
+        return self.config.offspring_population_size
+
+    def get_number_selected(self) -> int:
+        # Only the best parent_population_size genomes are used to update the policy
+        return self.config.parent_population_size
+
     def ask(self) -> List[np.ndarray]:
         self.genomes = []
         for _ in range(self.config.offspring_population_size):
@@ -40,8 +40,17 @@ class CmaEsDeap(IOptimizer):
         self.toolbox.register("generate", strategy.generate, creator.Individual)
         self.toolbox.register("update", strategy.update)
 
+        self.population_size = config.population_size
+        self.number_selected = strategy.mu
         self.population = None
 
+    def get_population_size(self) -> int:
+        return self.population_size
+
+    def get_number_selected(self) -> int:
+        # The strategy is only updated with the mu best individuals
+        return self.number_selected
+
     def ask(self) -> List[np.ndarray]:
         # Generate a new population
         self.population = self.toolbox.generate()
@@ -106,11 +106,25 @@ class CmaEsEvoTorch(IOptimizer):
 
         return rew
 
+    def get_population_size(self) -> int:
+        return len(self.cma_es.population)
+
+    def get_number_selected(self) -> int:
+        # Active CMA-ES also uses the worst solutions for the update of the covariance matrix
+        if self.cma_es.active:
+            return self.get_population_size()
+
+        return self.cma_es.mu
+
     def ask(self) -> List[np.ndarray]:
         self.population = self.cma_es.population.values.cpu().numpy()
 
         return self.population
 
+    def ask_into(self, population: np.ndarray) -> None:
+        # The population is already one 2-D array, thus it can be copied at once
+        np.copyto(population, self.ask())
+
     def tell(self, rewards: List[float]) -> np.ndarray:
         # These will be used in the CMA-ES step by EvoTorch in the assign_reward_to_evotorch() function
         self.rewards = rewards
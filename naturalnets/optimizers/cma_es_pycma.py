@@ -16,6 +16,8 @@ class OptimizerCmaEsPyCmaCfg(IOptimizerCfg):
 @register_optimizer_class
 class CmaEsPyCma(IOptimizer):
 
+    SUPPORTS_ASYNCHRONOUS_TELL = True
+
     def __init__(self, individual_size: int, global_seed: int, configuration: dict, **kwargs):
         super().__init__(individual_size, global_seed, configuration, **kwargs)
 
@@ -29,6 +31,17 @@ class CmaEsPyCma(IOptimizer):
 
         self.solutions = None
 
+    def get_population_size(self) -> int:
+        return self.es.popsize
+
+    def get_number_selected(self) -> int:
+        # Active CMA-ES (the default of PyCMA) uses negative recombination weights for the worst solutions, thus only
+        # without it, the update depends solely on the mu best solutions
+        if np.any(np.asarray(self.es.sp.weights) < 0):
+            return self.get_population_size()
+
+        return self.es.sp.weights.mu
+
     def ask(self) -> List[np.ndarray]:
         self.solutions = self.es.ask()
         return self.solutions
@@ -39,3 +52,12 @@ class CmaEsPyCma(IOptimizer):
         self.es.tell(self.solutions, rewards)
 
         return best_genome_current_generation
+
+    def tell_asynchronous(self, genomes: List[np.ndarray], rewards: List[float]) -> np.ndarray:
+        best_genome_current_generation = genomes[np.argmax(rewards)]
+
+        # PyCMA accepts solutions that were sampled in earlier iterations, but ask() has to be called between two
+        # calls of tell()
+        self.es.tell(genomes, rewards)
+
+        return best_genome_current_generation
@@ -27,6 +27,9 @@ class IOptimizerCfg:
 
 class IOptimizer(abc.ABC):
 
+    # True if the optimizer implements tell_asynchronous(), which is required for the asynchronous mode of train()
+    SUPPORTS_ASYNCHRONOUS_TELL: bool = False
+
     def __init__(self, individual_size: int, global_seed: int, configuration: dict, **kwargs):
         self.individual_size = individual_size
         self.global_seed = global_seed
@@ -39,3 +42,46 @@ class IOptimizer(abc.ABC):
     @abc.abstractmethod
     def tell(self, rewards: List[float]) -> np.ndarray:
         pass
+
+    def tell_asynchronous(self, genomes: List[np.ndarray], rewards: List[float]) -> np.ndarray:
+        """
+        Same as tell(), but with the rewards of the given genomes, which can be any get_population_size() genomes that
+        were returned by earlier calls of ask(), not necessarily by the last one. This allows to update the optimizer
+        with the genomes that were evaluated first, while the evaluation of others is still running. Only optimizers
+        that set SUPPORTS_ASYNCHRONOUS_TELL to True override it, and train() checks this flag before it uses the
+        asynchronous mode.
+
+        :param genomes: The evaluated genomes
+        :param rewards: The rewards of the genomes
+        :return: The best genome of the update
+        """
+        assert self.SUPPORTS_ASYNCHRONOUS_TELL, f"{type(self).__name__} does not support asynchronous updates"
+
+    @abc.abstractmethod
+    def get_population_size(self) -> int:
+        """Returns the number of genomes that ask() returns per generation."""
+        pass
+
+    def get_number_selected(self) -> int:
+        """
+        Returns k, such that tell() only depends on the fitness of the k best genomes of a generation (and not on the
+        fitness or the order of the others, as long as they are worse). This allows to stop the evaluation of genomes
+        early, which cannot be among the k best ones anymore (see the racing in train()). Optimizers that use the
+        fitness of all genomes, for example by ranking the complete population, return the population size.
+        """
+        return self.get_population_size()
+
+    def ask_into(self, population: np.ndarray) -> None:
+        """
+        Same as ask(), but writes the new population into the given 2-D array of shape (population_size,
+        individual_size), for example the array of a SharedPopulation. Optimizers that can generate their genomes
+        directly into the array should override this method.
+
+        :param population: The array, into which the genomes are written, one genome per row
+        """
+        genomes = self.ask()
+
+        assert len(genomes) == population.shape[0]
+
+        for i, genome in enumerate(genomes):
+            population[i] = genome
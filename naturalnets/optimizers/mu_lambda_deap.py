@@ -71,6 +71,13 @@ class MuLambdaDeap(IOptimizer):
         self.toolbox.register("mutate", fct_mutation_learned)
         self.select = tools.selBest
 
+    def get_population_size(self) -> int:
+        return self.configuration.lambda_
+
+    def get_number_selected(self) -> int:
+        # tools.selBest() selects the mu best offspring as the new population
+        return self.configuration.mu
+
     def ask(self) -> List[np.ndarray]:
         self.offspring = varOr(self.population, self.toolbox, self.configuration.lambda_, 1 - self.configuration.mutpb,
                                self.configuration.mutpb)
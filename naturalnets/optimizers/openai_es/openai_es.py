@@ -17,7 +17,7 @@ OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 """
 
 from collections import deque
-from typing import List
+from typing import List, Iterator
 
 import numpy as np
 from attrs import define, field, validators
@@ -64,6 +64,9 @@ class OptimizerOpenAIESCfg(IOptimizerCfg):
 
 @register_optimizer_class
 class OpenAIEs(IOptimizer):
+
+    SUPPORTS_ASYNCHRONOUS_TELL = True
+
     def __init__(self, individual_size: int, global_seed: int, configuration: dict,
                  output_neurons_start_index: int, output_neurons_end_index: int, **kwargs):
         super().__init__(individual_size, global_seed, configuration, **kwargs)
@@ -123,9 +126,18 @@ class OpenAIEs(IOptimizer):
             self.learning_rate = self.learning_rate - self.learning_rate * 0.25
             print("Decreased learning rate - Difference: {}".format(difference))
 
-    def ask(self) -> List[np.ndarray]:
-        individuals = []
+    def get_population_size(self) -> int:
+        if self.configuration.mirrored_sampling:
+            # An odd population_size is rounded down, as two individuals are generated per sampled noise
+            return (self.population_size // 2) * 2
+
+        return self.population_size
 
+    def sample_scaled_noise(self) -> Iterator[np.ndarray]:
+        """
+        Samples the noise for the individuals of a new population and yields it, multiplied with noise_stddev. The
+        unscaled noise is stored for the update in tell().
+        """
         number_of_individuals = self.population_size
 
         if self.configuration.mirrored_sampling:
@@ -138,8 +150,12 @@ class OpenAIEs(IOptimizer):
 
             # noise_stddev is only used for perturbing the individuals, later, when calculating the new individual,
             # the "original" noise is used, i.e. no multiplication with noise_stddev
-            noise_with_stddev = self.configuration.noise_stddev * noise_for_individual
+            yield self.configuration.noise_stddev * noise_for_individual
+
+    def ask(self) -> List[np.ndarray]:
+        individuals = []
 
+        for noise_with_stddev in self.sample_scaled_noise():
             individuals.append(self.current_individual + noise_with_stddev)
 
             # Mirrored sampling: Add _and_ subtract the noise to the individual
@@ -148,6 +164,19 @@ class OpenAIEs(IOptimizer):
 
         return individuals
 
+    def ask_into(self, population: np.ndarray) -> None:
+        assert population.shape[0] == self.get_population_size()
+
+        # Same as ask(), but the perturbed individuals are written directly into the rows of the population
+        i = 0
+        for noise_with_stddev in self.sample_scaled_noise():
+            np.add(self.current_individual, noise_with_stddev, out=population[i])
+            i += 1
+
+            if self.configuration.mirrored_sampling:
+                np.subtract(self.current_individual, noise_with_stddev, out=population[i])
+                i += 1
+
     def tell(self, rewards: List[float]) -> np.ndarray:
         best_genome_current_generation = self.current_individual
         # self.reward_history.append(np.mean(rewards))
@@ -173,6 +202,48 @@ class OpenAIEs(IOptimizer):
 
         assert g.shape == (self.individual_size,) and g.dtype == np.float32 and count == len(self.noise)
 
+        self.update_current_individual(g)
+
+        self.noise = []
+
+        return best_genome_current_generation
+
+    def tell_asynchronous(self, genomes: List[np.ndarray], rewards: List[float]) -> np.ndarray:
+        best_genome_current_generation = self.current_individual
+
+        processed_rewards = np.array(rewards, dtype=np.float32)
+
+        if self.configuration.use_centered_ranks:
+            processed_rewards = compute_centered_ranks(processed_rewards)
+
+        # Without mirrored pairs the rewards have no baseline, which tell() gets from the reward differences of the
+        # pairs. Therefore, the mean reward is subtracted, otherwise the update would follow the mean noise of the
+        # genomes if the rewards are not centered ranks (the centered ranks already have a mean of zero).
+        processed_rewards -= np.mean(processed_rewards)
+
+        # The genomes may have been sampled around an earlier individual, thus the noise is recovered as their
+        # perturbation of the current individual. With mirrored sampling, the genomes of a pair are not necessarily
+        # told together, therefore each genome is weighted on its own instead of using the reward differences.
+        noise = [(genome - self.current_individual) / self.configuration.noise_stddev for genome in genomes]
+
+        g, count = batched_weighted_sum(
+            processed_rewards,
+            noise,
+            batch_size=500
+        )
+
+        g /= len(rewards)
+
+        assert g.shape == (self.individual_size,) and g.dtype == np.float32 and count == len(genomes)
+
+        self.update_current_individual(g)
+
+        # The noise of the genomes is not used, thus discard it
+        self.noise = []
+
+        return best_genome_current_generation
+
+    def update_current_individual(self, g: np.ndarray):
         # gradient explanation: -g probably because the Adam implementation does gradient descent, but we want
         # to do gradient ascent since we want to maximize the reward, and the second part of the equation is weight
         # decay
@@ -180,7 +251,3 @@ class OpenAIEs(IOptimizer):
             theta=self.current_individual,
             gradient=-g + self.configuration.l2_regularization_coefficient * self.current_individual
         )
-
-        self.noise = []
-
-        return best_genome_current_generation
@@ -0,0 +1,24 @@
+import logging
+
+import click
+
+from naturalnets.environments.gui_app.compiled_gui_app import compile_transition_table
+
+
+@click.command()
+@click.option("--max-states", type=int, required=True, help="Number of states after which the exploration stops")
+@click.option("-o", "--output", type=str, required=True, help="Path of the saved transition table (.npz)")
+def main(max_states: int, output: str):
+    """Compiles a transition table of the GUIApp, which can be used by the GUIAppCompiled environment (see its
+    'transition_table' configuration option)."""
+    logging.basicConfig(level=logging.INFO)
+
+    table = compile_transition_table(max_states)
+    table.save(output)
+
+    logging.info(f"Saved {table.get_number_states()} states and {table.get_number_transitions()} transitions "
+                 f"to '{output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,24 @@
 import os
 import time
-from typing import Type, List, Tuple
+from typing import Type, List, Tuple, Optional, Sequence, Union
 
 import numpy as np
 from attrs import define, field, validators
 
 from naturalnets.brains import IBrain
-from naturalnets.enhancers.i_enhancer import get_enhancer_class
-from naturalnets.tools.utils import RunningStat
+from naturalnets.brains.i_brain import get_batched_brain_class
+from naturalnets.enhancers.i_enhancer import DummyEnhancer, get_enhancer_class
+from naturalnets.environments.i_environment import IVectorizedEnvironment, get_vectorized_environment_class
+from naturalnets.tools.utils import RunningStat, RunningStatPartial
 
 MODEL_FILE_NAME = "model.npz"
 INDIVIDUAL_KEY = "individual"
 OB_MEAN_KEY = "ob_mean"
 OB_STD_KEY = "ob_std"
 
+# The floating point data types, in which the brains can be evaluated
+COMPUTE_DTYPES = ["float32", "float64"]
+
 
 @define(slots=True, auto_attribs=True, frozen=True, kw_only=True)
 class PreprocessingCfg:
@@ -32,17 +37,132 @@ class PreprocessingCfg:
     )
 
 
+class ObservationPreprocessor:
+    """
+    Converts the observations of the environment to the compute data type, and applies the observation
+    standardization and clipping of a PreprocessingCfg. The reciprocal of the standard deviation is only calculated
+    when the statistics are set, and the observations are processed in place in a buffer that is reused for all steps,
+    i.e. no arrays are allocated per step. A processed observation is therefore only valid until the next call of
+    process().
+    """
+
+    def __init__(self, config: PreprocessingCfg, dtype: np.dtype = np.float32):
+        self.config = config
+        self.dtype = np.dtype(dtype)
+
+        self.ob_mean: Optional[np.ndarray] = None
+        self.ob_std_reciprocal: Optional[np.ndarray] = None
+
+        self._buffer: Optional[np.ndarray] = None
+
+    def set_ob_mean_std(self, ob_mean: np.ndarray, ob_std: np.ndarray):
+        self.ob_mean = np.asarray(ob_mean, dtype=self.dtype)
+        self.ob_std_reciprocal = np.reciprocal(ob_std).astype(self.dtype)
+
+    def process(self, ob: np.ndarray) -> np.ndarray:
+        if not (self.config.observation_standardization or self.config.observation_clipping) and ob.dtype == self.dtype:
+            return ob
+
+        if self._buffer is None or self._buffer.shape != ob.shape:
+            self._buffer = np.empty(ob.shape, dtype=self.dtype)
+
+        if self.config.observation_standardization:
+            np.subtract(ob, self.ob_mean, out=self._buffer)
+            np.multiply(self._buffer, self.ob_std_reciprocal, out=self._buffer)
+        else:
+            np.copyto(self._buffer, ob)
+
+        if self.config.observation_clipping:
+            # Same as np.clip(), which has a much larger overhead for small arrays
+            np.maximum(self._buffer, -self.config.ob_clipping_value, out=self._buffer)
+            np.minimum(self._buffer, self.config.ob_clipping_value, out=self._buffer)
+
+        return self._buffer
+
+
+class ObservationRecorder:
+    """
+    Records the observations of an episode (for the observation statistics) into a float32 buffer, which is allocated
+    once and reused for all episodes. The buffer is doubled in size if an episode has more observations than it can
+    hold.
+    """
+
+    def __init__(self, observation_size: int, capacity: int):
+        self._buffer = np.empty((capacity, observation_size), dtype=np.float32)
+        self._number_observations = 0
+
+    def clear(self):
+        self._number_observations = 0
+
+    def record(self, ob: np.ndarray):
+        if self._number_observations == len(self._buffer):
+            buffer = np.empty((2 * len(self._buffer), self._buffer.shape[1]), dtype=np.float32)
+            buffer[:self._number_observations] = self._buffer
+            self._buffer = buffer
+
+        # Copy the observation, since environments may return the same (changing) array in each step
+        self._buffer[self._number_observations] = ob
+        self._number_observations += 1
+
+    def calculate_partial(self) -> RunningStatPartial:
+        """Returns the partial statistics of the recorded observations, see RunningStat.calculate_partial()."""
+        return RunningStat.calculate_partial(self._buffer[:self._number_observations])
+
+
+class EnvironmentBatch:
+    """
+    Steps a list of environments in lockstep, like an IVectorizedEnvironment, i.e. reset() and step() take and return
+    the seeds, actions, observations, rewards and done flags of all environments stacked along the first axis. Environments whose episode is finished are
+    not stepped anymore, their reward is 0 and their last observation is repeated, until all episodes are finished.
+    """
+
+    def __init__(self, envs: list):
+        self.envs = envs
+        self.dones = np.zeros(len(envs), dtype=bool)
+        self.obs: Optional[np.ndarray] = None
+
+    def reset(self, env_seeds: Sequence[int]) -> np.ndarray:
+        self.dones[:] = False
+        self.obs = np.stack([env.reset(env_seed=env_seed) for env, env_seed in zip(self.envs, env_seeds)])
+
+        return self.obs
+
+    def step(self, actions: np.ndarray):
+        rews = np.zeros(len(self.envs))
+
+        for k, env in enumerate(self.envs):
+            if self.dones[k]:
+                continue
+
+            self.obs[k], rews[k], self.dones[k], _ = env.step(actions[k])
+
+        return self.obs, rews, self.dones, {}
+
+
 class EpisodeRunner:
 
     def __init__(self, env_class, env_configuration: dict, brain_class: Type[IBrain], brain_configuration: dict,
-                 preprocessing_config: dict, enhancer_config: dict, global_seed: int):
+                 preprocessing_config: dict, enhancer_config: dict, global_seed: int, compute_dtype: str = "float32"):
+        # The floating point data type, in which the brains are evaluated. The genomes and the observations of the
+        # environment are converted to it, and the brains compute in the data type of their genome and inputs, thus the
+        # episodes need no mixed precision operations.
+        if compute_dtype not in COMPUTE_DTYPES:
+            raise RuntimeError(f"'{compute_dtype}' is not a valid compute data type. Please choose one from the "
+                               f"following list: {COMPUTE_DTYPES!r}")
+
+        self.compute_dtype = np.dtype(compute_dtype)
 
         self.env_class = env_class
         self.env_configuration = env_configuration
         env = self.env_class(configuration=self.env_configuration)
 
+        # If reset() of the environment restores the state of a new instance, the same instance is used for all
+        # episodes, see get_env()
+        self._env = env if self.env_class.REUSABLE else None
+
         self.env_observation_size = env.get_number_inputs()
         self.env_action_size = env.get_number_outputs()
+        self.episode_reward_bounds = env.get_episode_reward_bounds()
 
         self.brain_configuration = brain_configuration
         self.brain_class = brain_class
@@ -63,6 +183,13 @@ class EpisodeRunner:
         )
 
         self.preprocessing_config = PreprocessingCfg(**preprocessing_config)
+        self.observation_preprocessor = ObservationPreprocessor(self.preprocessing_config, self.compute_dtype)
+
+        # Created when observations are first recorded, see get_observation_recorder()
+        self._observation_recorder = None
+
+        # The reused environments of the batched evaluations, see get_env_batch()
+        self._batch_envs = []
 
         self.current_ob_mean, self.current_ob_std = None, None
         if self.preprocessing_config.observation_standardization:
@@ -73,8 +200,63 @@ class EpisodeRunner:
                 eps=1e-2  # eps to prevent dividing by zero at the beginning when computing mean/stdev
             )
 
-            self.current_ob_mean = self.ob_stat.mean
-            self.current_ob_std = self.ob_stat.std
+            self.set_ob_mean_std(self.ob_stat.mean, self.ob_stat.std)
+
+    def __getstate__(self):
+        # The environment is not sent to the worker processes, each worker creates its own when it is first needed
+        state = self.__dict__.copy()
+        state["_env"] = None
+        state["_observation_recorder"] = None
+        state["_batch_envs"] = []
+        return state
+
+    def get_env(self, render: bool = False):
+        """
+        Returns an environment for the next episode. Environments that can be reset to the state of a new instance
+        (i.e. their REUSABLE attribute is True) are only created once and then reused for all episodes. Otherwise, and
+        when rendering, a new instance is created.
+        """
+        if render:
+            return self.env_class(configuration=self.env_configuration, render_mode="human")
+
+        if not self.env_class.REUSABLE:
+            return self.env_class(configuration=self.env_configuration, render_mode=None)
+
+        if self._env is None:
+            self._env = self.env_class(configuration=self.env_configuration, render_mode=None)
+
+        return self._env
+
+    def get_env_batch(self, batch_size: int) -> Union[IVectorizedEnvironment, EnvironmentBatch]:
+        """
+        Returns batch_size environments for the next batched episodes, see eval_fitness_batched(). If the environment
+        has a vectorized implementation, it is used for all of them. Otherwise, the environments are stepped one after
+        another by an EnvironmentBatch, and like in get_env(), reusable environments are only created once.
+        """
+        vectorized_env_class = get_vectorized_environment_class(self.env_class.__name__)
+
+        if vectorized_env_class is not None:
+            return vectorized_env_class(self.env_configuration, batch_size)
+
+        if not self.env_class.REUSABLE:
+            return EnvironmentBatch([self.env_class(configuration=self.env_configuration, render_mode=None)
+                                     for _ in range(batch_size)])
+
+        while len(self._batch_envs) < batch_size:
+            self._batch_envs.append(self.env_class(configuration=self.env_configuration, render_mode=None))
+
+        return EnvironmentBatch(self._batch_envs[:batch_size])
+
+    def create_observation_recorder(self) -> ObservationRecorder:
+        # One observation after the reset and one per time step, if the environment has a time limit
+        capacity = self.env_configuration.get("number_time_steps", 1000) + 1
+        return ObservationRecorder(self.env_observation_size, capacity)
+
+    def get_observation_recorder(self) -> ObservationRecorder:
+        if self._observation_recorder is None:
+            self._observation_recorder = self.create_observation_recorder()
+
+        return self._observation_recorder
 
     def get_individual_size(self) -> Tuple[int, int, int]:
         """
@@ -91,22 +273,45 @@ class EpisodeRunner:
     def get_output_size(self):
         return self.output_size
 
+    def get_episode_reward_bounds(self) -> Optional[Tuple[float, float]]:
+        """Returns the bounds of the total reward of one episode of the environment, or None if they are unknown."""
+        return self.episode_reward_bounds
+
     def get_free_parameter_usage(self):
         free_parameter_usage, _, _ = self.brain_class.get_free_parameter_usage(
             self.input_size, self.output_size, self.brain_configuration, self.brain_state)
         return free_parameter_usage
 
-    def update_ob_mean_std(self, recorded_observations: List[np.ndarray]):
+    def update_ob_mean_std(self, ob_stat_partials: List[RunningStatPartial]):
+        """
+        Adds the partial observation statistics, which are returned by eval_fitness() for training evaluations, to the
+        observation statistics.
+        """
+        if self.preprocessing_config.observation_standardization:
+            for ob_stat_partial in ob_stat_partials:
+                self.ob_stat.increment(*ob_stat_partial)
+
+            self.set_ob_mean_std(self.ob_stat.mean, self.ob_stat.std)
+
+    def get_ob_mean_std(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns the observation mean and standard deviation which are currently used for the standardization, or None
+        if observation standardization is not used.
+        """
         if self.preprocessing_config.observation_standardization:
-            for recorded_ob in recorded_observations:
-                self.ob_stat.increment(
-                    recorded_ob.sum(axis=0),
-                    np.square(recorded_ob).sum(axis=0),
-                    recorded_ob.shape[0]
-                )
+            return self.current_ob_mean, self.current_ob_std
+
+        return None
+
+    def set_ob_mean_std(self, ob_mean: np.ndarray, ob_std: np.ndarray):
+        """
+        Sets the observation mean and standard deviation used for the standardization. This is used to synchronize
+        the statistics of EpisodeRunner objects that live in other processes.
+        """
+        self.current_ob_mean = ob_mean
+        self.current_ob_std = ob_std
 
-            self.current_ob_mean = self.ob_stat.mean
-            self.current_ob_std = self.ob_stat.std
+        self.observation_preprocessor.set_ob_mean_std(ob_mean, ob_std)
 
     def save_brain(self, results_subdirectory: str, individual: np.ndarray):
         file_name = os.path.join(results_subdirectory, MODEL_FILE_NAME)
@@ -131,8 +336,7 @@ class EpisodeRunner:
         self.brain_state = self.brain_class.load_brain_state(brain_data)
 
         if OB_MEAN_KEY in brain_data and OB_STD_KEY in brain_data:
-            self.current_ob_mean = brain_data[OB_MEAN_KEY]
-            self.current_ob_std = brain_data[OB_STD_KEY]
+            self.set_ob_mean_std(brain_data[OB_MEAN_KEY], brain_data[OB_STD_KEY])
 
         return individual
 
@@ -141,7 +345,7 @@ class EpisodeRunner:
         brain = self.brain_class(
             input_size=self.input_size,
             output_size=self.output_size,
-            individual=individual,
+            individual=np.asarray(individual, dtype=self.compute_dtype),
             configuration=self.brain_configuration,
             brain_state=self.brain_state
         )
@@ -153,16 +357,19 @@ class EpisodeRunner:
 
         fitness_total = 0
 
-        total_obs = []
+        ob_stat_partials = []
 
         for i in range(number_of_rounds):
-            save_obs, obs_list = False, []
+            save_obs, observation_recorder = False, None
             # Only save observations for training episodes, and not for validation episodes
             if self.preprocessing_config.observation_standardization and training:
                 save_obs = self.obs_rng.uniform(0.0, 1.0) < self.preprocessing_config.calc_ob_stat_prob
 
-            render_mode = "human" if render else None
-            env = self.env_class(configuration=self.env_configuration, render_mode=render_mode)
+            if save_obs:
+                observation_recorder = self.get_observation_recorder()
+                observation_recorder.clear()
+
+            env = self.get_env(render)
 
             ob = env.reset(env_seed=env_seed+i)
             enhancer.reset(rng_seed=env_seed+i)
@@ -172,19 +379,10 @@ class EpisodeRunner:
             done = False
 
             if save_obs:
-                obs_list.append(ob)
+                observation_recorder.record(ob)
 
             while not done:
-                processed_obs = ob
-
-                if self.preprocessing_config.observation_standardization:
-                    processed_obs = (processed_obs - self.current_ob_mean) / self.current_ob_std
-
-                if self.preprocessing_config.observation_clipping:
-                    processed_obs = np.clip(
-                        processed_obs,
-                        -self.preprocessing_config.ob_clipping_value, +self.preprocessing_config.ob_clipping_value
-                    )
+                processed_obs = self.observation_preprocessor.process(ob)
 
                 action = brain.step(processed_obs)
                 enhanced_action, enhancer_info = enhancer.step(action)
@@ -193,7 +391,7 @@ class EpisodeRunner:
                 fitness_current += rew
 
                 if save_obs:
-                    obs_list.append(ob)
+                    observation_recorder.record(ob)
 
                 if render:
                     env.render(enhancer_info)
@@ -202,13 +400,98 @@ class EpisodeRunner:
             fitness_total += fitness_current
 
             if save_obs:
-                total_obs.append(np.array(obs_list, dtype=np.float32))
+                # Only the partial statistics of the observations are returned, which are much smaller than the
+                # observations themselves
+                ob_stat_partials.append(observation_recorder.calculate_partial())
 
-        if self.preprocessing_config.observation_standardization and len(total_obs) > 0 and training:
-            return fitness_total / number_of_rounds, total_obs
+        if self.preprocessing_config.observation_standardization and len(ob_stat_partials) > 0 and training:
+            return fitness_total / number_of_rounds, RunningStat.combine_partials(ob_stat_partials)
 
         return fitness_total / number_of_rounds
 
+    def eval_fitness_batched(self, individuals: Sequence[np.ndarray], env_seeds: Sequence[int], number_of_rounds: int,
+                             training: bool) -> List[Union[float, Tuple[float, RunningStatPartial]]]:
+        """
+        Evaluates a batch of individuals in lockstep: the brains are evaluated at once by the batched implementation of
+        the brain class (see IBatchedBrain), and the environments are stepped together (see EnvironmentBatch). Thus, one
+        time step of all episodes needs a few large matrix multiplications instead of one small one per individual. If
+        the environment has a vectorized implementation (see IVectorizedEnvironment), it steps all episodes at once as
+        well.
+
+        :param individuals: The genomes that shall be evaluated
+        :param env_seeds: The environment seed of the first round of each individual
+        :return: The result of eval_fitness(individual, env_seed, number_of_rounds, training) for each individual
+        """
+        batch_size = len(individuals)
+        env_seeds = np.asarray(env_seeds)
+
+        batched_brain = get_batched_brain_class(self.brain_class.__name__)(
+            input_size=self.input_size,
+            output_size=self.output_size,
+            individuals=np.asarray(individuals, dtype=self.compute_dtype),
+            configuration=self.brain_configuration,
+            brain_state=self.brain_state
+        )
+
+        enhancers = [self.enhancer_class(config=self.enhancer_config, env_output_size=self.env_action_size)
+                     for _ in range(batch_size)]
+
+        env_batch = self.get_env_batch(batch_size)
+
+        fitness_totals = np.zeros(batch_size)
+
+        ob_stat_partials = [[] for _ in range(batch_size)]
+
+        for i in range(number_of_rounds):
+            # The observations of each individual are recorded with the same probability as in eval_fitness()
+            observation_recorders = {}
+            if self.preprocessing_config.observation_standardization and training:
+                for k in range(batch_size):
+                    if self.obs_rng.uniform(0.0, 1.0) < self.preprocessing_config.calc_ob_stat_prob:
+                        observation_recorders[k] = self.create_observation_recorder()
+
+            obs = env_batch.reset(env_seeds + i)
+            for enhancer, env_seed in zip(enhancers, env_seeds):
+                enhancer.reset(rng_seed=env_seed + i)
+            batched_brain.reset()
+
+            # Individuals whose episode is not finished yet
+            running = np.ones(batch_size, dtype=bool)
+
+            for k, observation_recorder in observation_recorders.items():
+                observation_recorder.record(obs[k])
+
+            while running.any():
+                processed_obs = self.observation_preprocessor.process(obs)
+
+                actions = batched_brain.step(processed_obs)
+
+                if self.enhancer_class is not DummyEnhancer:
+                    actions = np.stack([enhancer.step(action)[0] for enhancer, action in zip(enhancers, actions)])
+
+                obs, rews, dones, _ = env_batch.step(actions)
+
+                fitness_totals += rews
+
+                for k, observation_recorder in observation_recorders.items():
+                    if running[k]:
+                        observation_recorder.record(obs[k])
+
+                # A vectorized environment may return one done flag for all episodes
+                running &= np.logical_not(dones)
+
+            for k, observation_recorder in observation_recorders.items():
+                ob_stat_partials[k].append(observation_recorder.calculate_partial())
+
+        results = []
+        for fitness_total, partials in zip(fitness_totals, ob_stat_partials):
+            if self.preprocessing_config.observation_standardization and len(partials) > 0 and training:
+                results.append((float(fitness_total) / number_of_rounds, RunningStat.combine_partials(partials)))
+            else:
+                results.append(float(fitness_total) / number_of_rounds)
+
+        return results
+
     def visualize(self, exp_dir: str, number_visualization_episodes: int, lag: float):
         individual = self.load_brain(exp_dir)
 
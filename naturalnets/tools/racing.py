@@ -0,0 +1,81 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+class FitnessRace:
+    """
+    Racing of the training evaluations of one generation: the genomes are evaluated round by round, and after each
+    round, the evaluation of genomes that can no longer be among the number_selected best genomes is stopped.
+
+    Since the total reward of an episode is bounded by the episode reward bounds of the environment, the final
+    fitness (the mean over all rounds) of a genome is bounded after each round as well. A genome is stopped, if its
+    upper bound is lower than the lower bounds of number_selected other genomes. The k = number_selected best genomes
+    are thus never stopped and get their exact fitness, while a stopped genome gets the mean over the rounds it was
+    evaluated in. This partial mean is lower than the fitness of each of the k best genomes, i.e. an optimizer, whose
+    update only depends on the k best genomes (see IOptimizer.get_number_selected()), behaves the same as without
+    racing.
+    """
+
+    def __init__(self, population_size: int, number_rounds: int, number_selected: int,
+                 episode_reward_bounds: Tuple[float, float]):
+        """
+        :param population_size: The number of genomes of the generation
+        :param number_rounds: The number of rounds (episodes), in which each genome is evaluated at most
+        :param number_selected: The number of best genomes, which have to be evaluated in all rounds
+        :param episode_reward_bounds: The lower and upper bound of the total reward of one episode, see
+            IEnvironment.get_episode_reward_bounds()
+        """
+        self.number_rounds = number_rounds
+        self.number_selected = number_selected
+        self.reward_lower_bound, self.reward_upper_bound = episode_reward_bounds
+
+        self.fitness_sums = np.zeros(population_size, dtype=np.float64)
+        self.evaluated_rounds = np.zeros(population_size, dtype=np.int64)
+        self.running = np.ones(population_size, dtype=bool)
+
+        # The number of rounds, for which results were added
+        self.current_round = 0
+
+    def is_finished(self) -> bool:
+        return self.current_round >= self.number_rounds
+
+    def get_running_indices(self) -> List[int]:
+        """Returns the indices of the genomes that have to be evaluated in the current round."""
+        return np.flatnonzero(self.running).tolist()
+
+    def add_round(self, fitnesses: Sequence[float]):
+        """
+        Adds the fitness of the current round for the running genomes (in the order of get_running_indices()), and
+        stops the genomes that can no longer be among the best ones.
+        """
+        running_indices = self.get_running_indices()
+
+        assert len(fitnesses) == len(running_indices)
+        assert not self.is_finished()
+
+        self.fitness_sums[running_indices] += fitnesses
+        self.evaluated_rounds[running_indices] += 1
+        self.current_round += 1
+
+        if self.is_finished() or len(running_indices) <= self.number_selected:
+            return
+
+        remaining_rounds = self.number_rounds - self.current_round
+        running_sums = self.fitness_sums[running_indices]
+
+        lower_bounds = (running_sums + remaining_rounds * self.reward_lower_bound) / self.number_rounds
+        upper_bounds = (running_sums + remaining_rounds * self.reward_upper_bound) / self.number_rounds
+
+        # The lowest lower bound of the number_selected genomes with the highest lower bounds
+        threshold = np.partition(lower_bounds, -self.number_selected)[-self.number_selected]
+
+        self.running[np.asarray(running_indices)[upper_bounds < threshold]] = False
+
+    def get_fitnesses(self) -> List[float]:
+        """Returns the fitness of each genome, i.e. the mean over the rounds it was evaluated in."""
+        return (self.fitness_sums / self.evaluated_rounds).tolist()
+
+    def get_number_episodes(self) -> int:
+        """Returns the number of episodes that were run, for all genomes together."""
+        return int(self.evaluated_rounds.sum())
@@ -0,0 +1,208 @@
+"""
+Scheduling of the evaluations of train() on the processes of a multiprocessing pool.
+
+Pool.starmap() splits the evaluations into fixed chunks in advance, thus a worker that received short episodes (e.g. a
+GUIApp episode that ends early because all rewards were collected) idles at the end, while another one still works
+through a chunk of long episodes. The EvaluationScheduler instead hands out the evaluations dynamically: a worker
+receives the next chunk as soon as it finished its previous one, and the chunks are small. The chunk size adapts to the
+measured duration of the evaluations, such that the communication overhead of very short evaluations is amortized.
+
+Besides map(), evaluations can also be submitted one by one with submit(), and their results are then retrieved with
+get_completed() in the order in which they finish. This is used by the asynchronous mode of train(), in which the
+workers never wait for each other.
+"""
+
+import math
+import queue
+import time
+from multiprocessing.pool import Pool
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (index of the evaluation, evaluated function, arguments of the function)
+Task = Tuple[int, Callable, Sequence]
+
+
+def run_timed_task(task: Task) -> Tuple[int, Any, float]:
+    """
+    Executed in the worker processes: runs one evaluation and measures its duration.
+
+    :return: The index of the evaluation, its result, and its duration in seconds
+    """
+    index, function, arguments = task
+
+    start_time = time.perf_counter()
+    result = function(*arguments)
+
+    return index, result, time.perf_counter() - start_time
+
+
+class PendingEvaluations:
+    """The results of evaluations that were submitted with EvaluationScheduler.map_async()."""
+
+    def __init__(self, scheduler: "EvaluationScheduler", estimate_key: Hashable, number_evaluations: int,
+                 timed_results: Iterator[Tuple[int, Any, float]]):
+        self.scheduler = scheduler
+        self.estimate_key = estimate_key
+        self.number_evaluations = number_evaluations
+
+        self._timed_results = timed_results
+        self._results: Optional[List] = None
+
+    def get(self) -> List:
+        """Waits for all evaluations and returns their results in the order of the submitted evaluations."""
+        if self._results is None:
+            results = [None] * self.number_evaluations
+            task_durations = np.zeros(self.number_evaluations)
+
+            for index, result, duration in self._timed_results:
+                results[index] = result
+                task_durations[index] = duration
+
+            self.scheduler.record_task_durations(self.estimate_key, task_durations)
+            self._results = results
+
+        return self._results
+
+
+class EvaluationScheduler:
+    """
+    Distributes evaluations dynamically to the processes of a pool, see the module documentation. Without a pool (e.g.
+    in debug mode), the evaluations are run in the current process.
+    """
+
+    def __init__(self, pool: Optional[Pool], number_workers: int, minimum_chunk_duration: float = 0.05,
+                 chunks_per_worker: int = 4):
+        """
+        :param pool: The pool whose processes run the evaluations, or None to run them in the current process
+        :param number_workers: The number of processes of the pool
+        :param minimum_chunk_duration: Evaluations are combined into chunks, such that the estimated duration of a
+            chunk is at least this long (in seconds), to amortize the communication with the workers
+        :param chunks_per_worker: The chunks are at most so large, that each worker receives this many chunks per
+            call of map(), so that the workers can balance each other out
+        """
+        self.pool = pool
+        self.number_workers = number_workers
+        self.minimum_chunk_duration = minimum_chunk_duration
+        self.chunks_per_worker = chunks_per_worker
+
+        # Estimated duration of a single evaluation per estimate key (see map_async()), updated after each call of
+        # map()
+        self.task_duration_estimates: Dict[Hashable, float] = {}
+
+        # The durations of the evaluations of the last completed map() call per estimate key
+        self.last_task_durations: Dict[Hashable, np.ndarray] = {}
+
+        # Results of the evaluations that were submitted with submit(), in the order in which they finished
+        self._completed: queue.SimpleQueue = queue.SimpleQueue()
+        self.number_submitted = 0
+
+    @staticmethod
+    def get_function_name(function: Callable) -> str:
+        return getattr(function, "__qualname__", repr(function))
+
+    @staticmethod
+    def get_estimate_key(function: Callable, estimate_key: Optional[Hashable]) -> Hashable:
+        return EvaluationScheduler.get_function_name(function) if estimate_key is None else estimate_key
+
+    def get_chunk_size(self, estimate_key: Hashable, number_evaluations: int) -> int:
+        maximum_chunk_size = max(1, math.ceil(number_evaluations / (self.number_workers * self.chunks_per_worker)))
+
+        try:
+            task_duration_estimate = self.task_duration_estimates[estimate_key]
+        except KeyError:
+            # Nothing is known about the evaluations yet, thus use the largest chunks that still balance the load,
+            # like Pool.starmap() does, instead of paying the communication overhead for each evaluation
+            return maximum_chunk_size
+
+        if task_duration_estimate <= 0.0:
+            return maximum_chunk_size
+
+        return max(1, min(maximum_chunk_size, round(self.minimum_chunk_duration / task_duration_estimate)))
+
+    def record_task_durations(self, estimate_key: Hashable, task_durations: np.ndarray):
+        self.last_task_durations[estimate_key] = task_durations
+
+        if len(task_durations) > 0:
+            self.task_duration_estimates[estimate_key] = float(np.mean(task_durations))
+
+    def get_last_task_durations(self, function: Callable, estimate_key: Optional[Hashable] = None) -> np.ndarray:
+        """
+        Returns the durations (in seconds) of the evaluations of the last completed map() call of the function, or of
+        the given estimate key if one was passed to map().
+        """
+        return self.last_task_durations.get(self.get_estimate_key(function, estimate_key), np.zeros(0))
+
+    def map_async(self, function: Callable, evaluations: Sequence[Sequence],
+                  estimate_key: Optional[Hashable] = None) -> PendingEvaluations:
+        """
+        Submits the evaluations, i.e. calls of function with the given arguments, and returns immediately. The results
+        can be retrieved with get() of the returned PendingEvaluations.
+
+        Note that the arguments are only pickled when they are sent to a worker, thus they must not be changed
+        afterwards.
+
+        :param function: The evaluated function
+        :param evaluations: The arguments of each evaluation
+        :param estimate_key: The durations of the evaluations are estimated per key, defaults to the name of the
+            function. Evaluations of the same function that take differently long (e.g. training runs with several
+            rounds and single validation runs) should use different keys, otherwise their chunk sizes are based on the
+            mixed average duration.
+        """
+        estimate_key = self.get_estimate_key(function, estimate_key)
+        tasks = [(i, function, evaluation) for i, evaluation in enumerate(evaluations)]
+
+        if self.pool is None:
+            timed_results = iter([run_timed_task(task) for task in tasks])
+        else:
+            timed_results = self.pool.imap_unordered(
+                run_timed_task, tasks, chunksize=self.get_chunk_size(estimate_key, len(tasks))
+            )
+
+        return PendingEvaluations(self, estimate_key, len(tasks), timed_results)
+
+    def map(self, function: Callable, evaluations: Sequence[Sequence], estimate_key: Optional[Hashable] = None) -> List:
+        """
+        Same as Pool.starmap(), but with dynamic load balancing. Returns the results in the order of evaluations. See
+        map_async() for the estimate key.
+        """
+        return self.map_async(function, evaluations, estimate_key).get()
+
+    def submit(self, function: Callable, arguments: Sequence, tag: Hashable):
+        """
+        Submits a single evaluation, whose result is retrieved with get_completed(). Like for map_async(), the
+        arguments must not be changed after submitting them.
+
+        :param function: The evaluated function
+        :param arguments: The arguments of the function
+        :param tag: Identifies the evaluation, get_completed() returns it together with the result
+        """
+        self.number_submitted += 1
+
+        if self.pool is None:
+            self._completed.put((tag, run_timed_task((0, function, arguments))))
+            return
+
+        self.pool.apply_async(
+            run_timed_task, ((0, function, arguments),),
+            callback=lambda timed_result: self._completed.put((tag, timed_result)),
+            error_callback=lambda error: self._completed.put((tag, error))
+        )
+
+    def get_completed(self) -> Tuple[Hashable, Any, float]:
+        """
+        Waits until one of the evaluations that were submitted with submit() finished, and returns its tag, its result
+        and its duration in seconds.
+        """
+        assert self.number_submitted > 0, "No evaluations are submitted"
+
+        tag, timed_result = self._completed.get()
+        self.number_submitted -= 1
+
+        if isinstance(timed_result, BaseException):
+            raise timed_result
+
+        _, result, duration = timed_result
+
+        return tag, result, duration
@@ -0,0 +1,105 @@
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, Tuple
+
+import numpy as np
+
+POPULATION_DTYPE = np.float32
+
+# True if this process started its own resource tracker when attaching to a SharedPopulation, instead of using the one
+# of its parent process
+_has_own_resource_tracker = False
+
+
+def _uses_own_resource_tracker() -> bool:
+    """
+    Returns True if shared memory that is registered in this process is registered with a resource tracker that was
+    started by this process. Child processes (forked or spawned) share the resource tracker of their parent, if the
+    parent started it before the child was created. Must be called before the shared memory is registered.
+    """
+    global _has_own_resource_tracker
+
+    # noinspection PyProtectedMember
+    if resource_tracker._resource_tracker._fd is None:
+        # Registering the shared memory will start a new resource tracker
+        _has_own_resource_tracker = True
+
+    return _has_own_resource_tracker
+
+
+class SharedPopulation:
+    """
+    A population of genomes, which is stored in a single block of shared memory as a 2-D float32 array of shape
+    (population_size, individual_size).
+
+    The main process creates the SharedPopulation and the optimizer writes the genomes of a generation into it (see
+    IOptimizer.ask_into()). The worker processes attach to the same block of memory using its name and read the row
+    of the individual they shall evaluate without copying it, i.e. the genomes do not have to be pickled anymore.
+    """
+
+    def __init__(self, population_size: int, individual_size: int, name: Optional[str] = None):
+        """
+        :param population_size: Number of genomes in the population, i.e. the number of rows
+        :param individual_size: Number of parameters of one genome, i.e. the number of columns
+        :param name: If None, a new block of shared memory is created. Otherwise, the existing block of shared memory
+            with this name is used.
+        """
+        self.shape = (population_size, individual_size)
+        self.is_owner = name is None
+
+        size = population_size * individual_size * np.dtype(POPULATION_DTYPE).itemsize
+
+        if self.is_owner:
+            self.shared_memory = SharedMemory(create=True, size=size)
+        elif sys.version_info >= (3, 13):
+            # Only the creating process shall clean up the shared memory, thus it is not tracked when attaching
+            self.shared_memory = SharedMemory(name=name, size=size, track=False)
+        else:
+            uses_own_resource_tracker = _uses_own_resource_tracker()
+            self.shared_memory = SharedMemory(name=name, size=size)
+
+            if uses_own_resource_tracker:
+                # Only the creating process shall clean up the shared memory. Otherwise, the resource tracker of this
+                # process would unlink the memory (and warn about it) once this process exits. If the resource tracker
+                # is shared with the creating process, the memory is already registered, and unregistering it would
+                # remove the registration of the creating process.
+                # noinspection PyProtectedMember
+                resource_tracker.unregister(self.shared_memory._name, "shared_memory")
+
+        self.population = np.ndarray(self.shape, dtype=POPULATION_DTYPE, buffer=self.shared_memory.buf)
+
+    @classmethod
+    def attach(cls, name: str, shape: Tuple[int, int]) -> "SharedPopulation":
+        """
+        Attaches to an already existing SharedPopulation, for example from within a worker process.
+        """
+        return cls(population_size=shape[0], individual_size=shape[1], name=name)
+
+    def __reduce__(self):
+        # Only the name and shape are pickled, the process which unpickles the object attaches to the shared memory
+        return self.attach, (self.get_name(), self.get_shape())
+
+    def get_name(self) -> str:
+        return self.shared_memory.name
+
+    def get_shape(self) -> Tuple[int, int]:
+        return self.shape
+
+    def get_individual(self, index: int) -> np.ndarray:
+        """
+        Returns the genome with the given index. This is a view into the shared memory and not a copy.
+        """
+        return self.population[index]
+
+    def close(self):
+        """
+        Closes the access to the shared memory in this process. If this process created the shared memory, it is also
+        freed.
+        """
+        # Drop the NumPy view first, otherwise the buffer of the shared memory can not be released
+        self.population = None
+        self.shared_memory.close()
+
+        if self.is_owner:
+            self.shared_memory.unlink()
@@ -1,5 +1,5 @@
 import random
-from typing import Dict
+from typing import Dict, Sequence, Tuple
 
 import numpy as np
 import torch
@@ -55,6 +55,10 @@ def set_seeds(seed: int):
     torch.manual_seed(seed)
 
 
+# The sum, the sum of squares and the number of a batch of samples, see RunningStat.calculate_partial()
+RunningStatPartial = Tuple[np.ndarray, np.ndarray, int]
+
+
 class RunningStat(object):
     """
     Includes code from:
@@ -92,6 +96,32 @@ class RunningStat(object):
     def std(self):
         return np.sqrt(np.maximum(self.sumsq / self.count - np.square(self.mean), 1e-2))
 
+    @staticmethod
+    def calculate_partial(x: np.ndarray) -> RunningStatPartial:
+        """
+        Calculates the partial statistics of the samples in x (along the first axis), which can be added to a
+        RunningStat with increment(). This allows to reduce the samples where they are recorded (e.g. in a worker
+        process), such that only the partial statistics have to be sent to the process that holds the RunningStat.
+        """
+        return x.sum(axis=0, dtype=np.float64), np.square(x, dtype=np.float64).sum(axis=0), x.shape[0]
+
+    @staticmethod
+    def combine_partials(partials: Sequence[RunningStatPartial]) -> RunningStatPartial:
+        """
+        Combines the partial statistics of disjoint batches of samples into the partial statistics of all samples.
+        Since the statistics are sums (and not means and squared deviations from the mean), the parallel combination
+        of Chan et al. reduces to adding them.
+        """
+        assert len(partials) > 0
+
+        s, ssq, c = partials[0]
+        for partial_s, partial_ssq, partial_c in partials[1:]:
+            s = s + partial_s
+            ssq = ssq + partial_ssq
+            c += partial_c
+
+        return s, ssq, c
+
     def set_from_init(self, init_mean, init_std, init_count):
         self.sum[:] = init_mean * init_count
         self.sumsq[:] = (np.square(init_mean) + np.square(init_std)) * init_count
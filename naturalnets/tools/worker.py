@@ -0,0 +1,118 @@
+"""
+Functions which are executed inside the processes of the multiprocessing pool used in train().
+
+Each worker process receives the EpisodeRunner exactly once, when the pool is created (see initialize_worker()), and
+keeps it resident for the whole training. Afterwards, only the genome and the environment seed are sent to the workers
+per task. This avoids pickling the complete EpisodeRunner (including the brain_state and the observation statistics)
+for every single evaluation. If observation standardization is used, the updated observation statistics are sent to
+each worker once per generation, see broadcast_ob_mean_std(). If the population is stored in a SharedPopulation, even
+the genome is not sent, but only its index in the population. In the other direction, the observations that are
+recorded for the observation statistics are reduced to partial statistics in the worker (see
+RunningStat.calculate_partial()), so only these are sent back.
+"""
+
+from multiprocessing.pool import AsyncResult, Pool
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from naturalnets.tools.episode_runner import EpisodeRunner
+from naturalnets.tools.shared_population import SharedPopulation
+
+# The EpisodeRunner that lives in the current worker process, set by initialize_worker()
+_episode_runner: Optional[EpisodeRunner] = None
+
+# The population of the current generation, if the genomes are shared using shared memory
+_shared_population: Optional[SharedPopulation] = None
+
+# Shared by all worker processes of the pool, to hand out exactly one broadcast task to each worker
+_broadcast_barrier = None
+
+
+def initialize_worker(episode_runner: EpisodeRunner, shared_population: Optional[SharedPopulation] = None,
+                      broadcast_barrier=None):
+    """
+    Initializer for the worker processes of the multiprocessing pool. Stores the given EpisodeRunner in the worker
+    process, so that it can be reused by all evaluations that are executed in this process.
+
+    Note that the EpisodeRunner must be created in the main process and then passed here, because the brain_state
+    (for example the randomly generated masks of the CTRNN) must be identical in all processes.
+
+    :param episode_runner: The EpisodeRunner of the main process
+    :param shared_population: Optionally, the SharedPopulation into which the optimizer writes the genomes. When it is
+        passed to a worker process, the worker attaches to the same shared memory.
+    :param broadcast_barrier: A multiprocessing.Barrier for the number of processes of the pool, which is required to
+        broadcast the observation statistics to the workers
+    """
+    global _episode_runner, _shared_population, _broadcast_barrier
+    _episode_runner = episode_runner
+    _shared_population = shared_population
+    _broadcast_barrier = broadcast_barrier
+
+
+def set_ob_mean_std_in_worker(ob_mean: np.ndarray, ob_std: np.ndarray):
+    assert _broadcast_barrier is not None, "The worker was initialized without a barrier for broadcasts"
+
+    _episode_runner.set_ob_mean_std(ob_mean, ob_std)
+
+    # Wait until each worker has received one of the broadcast tasks, so that no worker takes two of them
+    _broadcast_barrier.wait()
+
+
+def broadcast_ob_mean_std(pool: Pool, number_workers: int, ob_mean_std: Tuple[np.ndarray, np.ndarray]) -> AsyncResult:
+    """
+    Sends the observation statistics once to each worker process of the pool, where they replace the statistics of the
+    resident EpisodeRunner. The pool hands out the tasks in the order in which they were submitted, thus evaluations
+    that were submitted before the broadcast still use the previous statistics, and all evaluations that are submitted
+    afterwards use the new ones. Returns immediately, the workers receive the statistics once they finished the
+    evaluations submitted before.
+
+    :param pool: The pool, whose workers were initialized with initialize_worker() and a barrier for number_workers
+    :param number_workers: The number of processes of the pool
+    :param ob_mean_std: The observation mean and standard deviation
+    """
+    return pool.starmap_async(set_ob_mean_std_in_worker, [ob_mean_std] * number_workers, chunksize=1)
+
+
+def eval_fitness_in_worker(individual: np.ndarray, env_seed: int, number_of_rounds: int, training: bool):
+    """
+    Evaluates the individual with the EpisodeRunner that is resident in the current worker process.
+
+    :param individual: The genome that shall be evaluated
+    :param env_seed: The environment seed of the first round
+    :param number_of_rounds: The number of episodes that are run
+    :param training: True if this is a training evaluation, False if it is a validation evaluation
+    :return: Same as EpisodeRunner.eval_fitness()
+    """
+    assert _episode_runner is not None, "The worker was not initialized, use initialize_worker() as pool initializer"
+
+    return _episode_runner.eval_fitness(individual, env_seed, number_of_rounds, training)
+
+
+def eval_fitness_batched_in_worker(individuals: Sequence[np.ndarray], env_seeds: Sequence[int], number_of_rounds: int,
+                                   training: bool):
+    """
+    Evaluates the batch of individuals in lockstep with the EpisodeRunner that is resident in the current worker
+    process.
+
+    :return: Same as EpisodeRunner.eval_fitness_batched()
+    """
+    assert _episode_runner is not None, "The worker was not initialized, use initialize_worker() as pool initializer"
+
+    return _episode_runner.eval_fitness_batched(individuals, env_seeds, number_of_rounds, training)
+
+
+def eval_shared_individual_in_worker(individual_index: int, env_seed: int, number_of_rounds: int, training: bool):
+    """
+    Evaluates the individual from the SharedPopulation with the EpisodeRunner that is resident in the current worker
+    process. The individual is read directly from the shared memory, only its index in the population is sent to the
+    worker.
+
+    :param individual_index: The row of the SharedPopulation which contains the individual
+    :return: Same as EpisodeRunner.eval_fitness()
+    """
+    assert _shared_population is not None, "The worker was initialized without a SharedPopulation"
+
+    return eval_fitness_in_worker(
+        _shared_population.get_individual(individual_index), env_seed, number_of_rounds, training
+    )
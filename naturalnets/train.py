@@ -6,7 +6,8 @@ import random
 import time
 from datetime import datetime
 from socket import gethostname
-from typing import Optional, Dict, Union, Tuple
+from collections import deque
+from typing import Optional, Dict, Union, Tuple, List, Callable
 
 import click
 import numpy as np
@@ -15,11 +16,16 @@ from attrs import define, field, validators
 from cpuinfo import get_cpu_info
 from tensorboardX import SummaryWriter
 
-from naturalnets.brains.i_brain import get_brain_class
+from naturalnets.brains.i_brain import get_brain_class, get_batched_brain_class
 from naturalnets.environments.i_environment import get_environment_class
-from naturalnets.optimizers.i_optimizer import get_optimizer_class
-from naturalnets.tools.episode_runner import EpisodeRunner
-from naturalnets.tools.utils import flatten_dict, set_seeds
+from naturalnets.optimizers.i_optimizer import IOptimizer, get_optimizer_class
+from naturalnets.tools.episode_runner import COMPUTE_DTYPES, EpisodeRunner
+from naturalnets.tools.racing import FitnessRace
+from naturalnets.tools.scheduler import EvaluationScheduler
+from naturalnets.tools.shared_population import SharedPopulation
+from naturalnets.tools.utils import flatten_dict, set_seeds, RunningStatPartial
+from naturalnets.tools.worker import (initialize_worker, eval_fitness_in_worker, eval_shared_individual_in_worker,
+                                     eval_fitness_batched_in_worker, broadcast_ob_mean_std)
 from naturalnets.tools.write_results import write_results_to_textfile
 
 GEN_KEY = "gen"
@@ -31,6 +37,8 @@ MEAN_VAL_KEY = "mean_val"
 MAX_VAL_KEY = "max_val"
 BEST_KEY = "best"
 ELAPSED_KEY = "elapsed_time"
+MEAN_EVAL_TIME_KEY = "mean_eval_time"
+MAX_EVAL_TIME_KEY = "max_eval_time"
 
 
 @define(slots=True, auto_attribs=True, frozen=True, kw_only=True)
@@ -48,14 +56,219 @@ class TrainingCfg:
     experiment_id: int = field(default=-1, validator=[validators.instance_of(int), validators.ge(-1)])
     global_seed: int = field(validator=[validators.instance_of(int), validators.ge(0)])
 
+    # The floating point data type, in which the brains are evaluated. The genomes and the observations are converted
+    # to it, see EpisodeRunner.
+    compute_dtype: str = field(
+        default="float32",
+        validator=[validators.instance_of(str), validators.in_(COMPUTE_DTYPES)]
+    )
+
+    # If true, each worker process of the pool receives the EpisodeRunner once at startup and keeps it, instead of
+    # receiving a pickled copy of it for each evaluation
+    persistent_workers: bool = field(default=False, validator=validators.instance_of(bool))
+
+    # If true, the optimizer writes the population into shared memory, from which the workers read their genome, i.e.
+    # the genomes are not pickled. Note that the genomes are then stored as float32.
+    shared_memory_population: bool = field(default=False, validator=validators.instance_of(bool))
+
+    @shared_memory_population.validator
+    def validate_shared_memory_population(self, attribute, value):
+        if value and not self.persistent_workers:
+            raise ValueError("'shared_memory_population' is set to True, but 'persistent_workers' is set to False.\n"
+                             "However, the workers can only attach to the shared memory if they are persistent, thus "
+                             "try setting 'persistent_workers' to True.")
+
+    # If true, the genomes are evaluated round by round, and genomes that can no longer be among the best genomes,
+    # which the optimizer uses for its update, are not evaluated in the remaining rounds (see FitnessRace). This
+    # requires an environment with known episode reward bounds.
+    racing: bool = field(default=False, validator=validators.instance_of(bool))
+
+    # If true, the validation runs of a generation are run concurrently with the training runs of the next
+    # generation, instead of waiting for them before the next generation starts. The log of a generation is then
+    # written after the training runs of the next generation.
+    overlap_validation: bool = field(default=False, validator=validators.instance_of(bool))
+
+    @overlap_validation.validator
+    def validate_overlap_validation(self, attribute, value):
+        if value and not self.persistent_workers:
+            raise ValueError("'overlap_validation' is set to True, but 'persistent_workers' is set to False.\n"
+                             "However, only persistent workers receive the updated observation statistics after the "
+                             "validation runs that were submitted before, which is required to update them before the "
+                             "validation runs are finished, thus try setting 'persistent_workers' to True.")
+
+    # If true, the training runs are asynchronous (steady-state): the workers continuously evaluate new genomes, and
+    # the optimizer is updated as soon as population_size evaluations are finished, without waiting for the
+    # evaluations that are still running. A "generation" is then one update of the optimizer. Requires an optimizer
+    # that supports asynchronous updates (see IOptimizer.tell_asynchronous()).
+    asynchronous: bool = field(default=False, validator=validators.instance_of(bool))
+
+    @asynchronous.validator
+    def validate_asynchronous(self, attribute, value):
+        if not value:
+            return
+
+        if not self.persistent_workers:
+            raise ValueError("'asynchronous' is set to True, but 'persistent_workers' is set to False.\n"
+                             "However, the observation statistics are updated while evaluations are running, which "
+                             "only persistent workers support, thus try setting 'persistent_workers' to True.")
+
+        if self.shared_memory_population or self.racing:
+            raise ValueError("'asynchronous' is set to True, which can not be combined with "
+                             "'shared_memory_population' or 'racing', thus set them to False.")
+
+    # If true, the training runs of a generation are split into one batch per worker, and the genomes of a batch are
+    # evaluated in lockstep with the batched implementation of the brain (see EpisodeRunner.eval_fitness_batched()).
+    # The evaluation times in the log are then those of the batches. The validation runs are not batched.
+    batched_evaluation: bool = field(default=False, validator=validators.instance_of(bool))
+
+    @batched_evaluation.validator
+    def validate_batched_evaluation(self, attribute, value):
+        if value and (self.shared_memory_population or self.racing or self.asynchronous):
+            raise ValueError("'batched_evaluation' is set to True, which can not be combined with "
+                             "'shared_memory_population', 'racing' or 'asynchronous', thus set them to False.")
+
+
+def draw_env_seed(config: TrainingCfg) -> int:
+    """Returns the environment seed for the training runs of a generation."""
+    if config.fixed_env_seed == -1:
+        # Excludes validation environment seeds
+        return random.randint(config.number_validation_runs, config.maximum_env_seed)
+
+    return config.fixed_env_seed
+
+
+def split_into_batches(individuals: List[np.ndarray], env_seed: int, number_of_rounds: int,
+                       number_batches: int) -> List[list]:
+    """
+    Splits the training runs of a generation into (at most) number_batches evaluations of
+    EpisodeRunner.eval_fitness_batched() of similar size.
+    """
+    batches = np.array_split(np.arange(len(individuals)), number_batches)
+
+    return [[[individuals[i] for i in batch], [env_seed] * len(batch), number_of_rounds, True]
+            for batch in batches if len(batch) > 0]
+
+
+def split_training_results(training_results: List) -> Tuple[List[float], List[RunningStatPartial]]:
+    """
+    Splits the results of training evaluations (see EpisodeRunner.eval_fitness()) into the rewards and the partial
+    observation statistics, which are only returned if observations were recorded.
+    """
+    rewards = []
+    ob_stat_partials = []
+    for result in training_results:
+        if isinstance(result, tuple):
+            rewards.append(result[0])
+            ob_stat_partials.append(result[1])
+        else:
+            rewards.append(result)
+
+    return rewards, ob_stat_partials
+
+
+def run_asynchronous_generations(config: TrainingCfg, opt: IOptimizer, ep_runner: EpisodeRunner,
+                                 scheduler: EvaluationScheduler, eval_fitness: Callable, number_workers: int,
+                                 update_ob_mean_std: Callable, finish_generation: Callable):
+    """
+    Runs the asynchronous training, see TrainingCfg.asynchronous. As soon as an evaluation is finished, a new genome is
+    submitted, thus the workers never wait for each other. The optimizer is updated with the first population_size
+    finished evaluations, and the validation runs of the update are submitted like the training runs. A generation
+    is logged (with finish_generation()) once its validation runs are finished.
+    """
+    population_size = opt.get_population_size()
+
+    # Enough training runs for the next update are in flight, and at least one per worker
+    number_running_training_evaluations = max(population_size, number_workers)
+
+    # Genomes of ask() (with the environment seed of their population) that are not submitted yet
+    asked_genomes = deque()
+    running_training_genomes: Dict[int, np.ndarray] = {}
+    next_genome_id = 0
+
+    # The finished training runs of the next update
+    genomes, rewards_training, ob_stat_partials, training_task_durations = [], [], [], []
+
+    # The generations whose validation runs are not finished yet, with the arguments of finish_generation()
+    pending_generations: Dict[int, Tuple[tuple, List[Optional[float]]]] = {}
+
+    generation = 0
+    number_finished_generations = 0
+    start_time_current_generation = time.time()
+
+    while number_finished_generations < config.number_generations:
+        while (generation < config.number_generations
+               and len(running_training_genomes) < number_running_training_evaluations):
+            if len(asked_genomes) == 0:
+                env_seed = draw_env_seed(config)
+                asked_genomes.extend((genome, env_seed) for genome in opt.ask())
+
+            genome, env_seed = asked_genomes.popleft()
+            running_training_genomes[next_genome_id] = genome
+
+            scheduler.submit(eval_fitness, [genome, env_seed, config.number_rounds, True],
+                             tag=("training", next_genome_id))
+            next_genome_id += 1
+
+        (kind, key), result, duration = scheduler.get_completed()
+
+        if kind == "validation":
+            validation_generation, i = key
+            pending_generations[validation_generation][1][i] = result
+
+            # The generations are logged in order
+            while (number_finished_generations in pending_generations
+                   and None not in pending_generations[number_finished_generations][1]):
+                finish_generation_arguments, rewards_validation = pending_generations.pop(number_finished_generations)
+                finish_generation(*finish_generation_arguments, rewards_validation)
+                number_finished_generations += 1
+
+            continue
+
+        genome = running_training_genomes.pop(key)
+
+        if generation >= config.number_generations:
+            # All updates are done, only the validation runs are still awaited
+            continue
+
+        reward, partials = split_training_results([result])
+        genomes.append(genome)
+        rewards_training.extend(reward)
+        ob_stat_partials.extend(partials)
+        training_task_durations.append(duration)
+
+        if len(genomes) < population_size:
+            continue
+
+        best_genome_current_generation = opt.tell_asynchronous(genomes, rewards_training)
+
+        # The genomes that are not submitted yet were sampled before the update, thus sample new ones instead
+        asked_genomes.clear()
+
+        # Like in the generational training, the validation runs use the observation statistics from before the
+        # update, since they are submitted before the updated statistics. The genome is copied, because the arguments
+        # are pickled only later.
+        for i in range(config.number_validation_runs):
+            scheduler.submit(eval_fitness, [np.array(best_genome_current_generation), i, 1, False],
+                             tag=("validation", (generation, i)))
+
+        pending_generations[generation] = (
+            (generation, start_time_current_generation, rewards_training, np.array(training_task_durations),
+             best_genome_current_generation),
+            [None] * config.number_validation_runs
+        )
+
+        update_ob_mean_std(ob_stat_partials)
+
+        generation += 1
+        start_time_current_generation = time.time()
+        genomes, rewards_training, ob_stat_partials, training_task_durations = [], [], [], []
+
 
 def train(configuration: Optional[Union[str, Dict]] = None, results_directory: str = "results", debug: bool = False,
           w_and_b_log: bool = True, w_and_b_entity: str = "neuroevolution-fzi", w_and_b_project: str = "NaturalNets"):
     start_time_training = time.time()
     start_date_training = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 
-    pool = multiprocessing.Pool()
-
     if w_and_b_log:
         # Use the local folder name, where the results are stored as the WandB experiment name, to match them
         # later
@@ -93,6 +306,10 @@ def train(configuration: Optional[Union[str, Dict]] = None, results_directory: s
     # Get brain class from configuration
     brain_class = get_brain_class(config.brain["type"])
 
+    if config.batched_evaluation:
+        # Raises an error already here, if the brain has no batched implementation
+        get_batched_brain_class(config.brain["type"])
+
     preprocessing_config = config.preprocessing
     enhancer_config = config.enhancer
 
@@ -104,9 +321,18 @@ def train(configuration: Optional[Union[str, Dict]] = None, results_directory: s
         brain_configuration=config.brain,
         preprocessing_config=preprocessing_config,
         enhancer_config=enhancer_config,
-        global_seed=config.global_seed
+        global_seed=config.global_seed,
+        compute_dtype=config.compute_dtype
     )
 
+    if config.racing and ep_runner.get_episode_reward_bounds() is None:
+        raise RuntimeError(f"'racing' is set to True, but the environment '{config.environment['type']}' does not "
+                           f"provide bounds for the reward of an episode, which are required for racing.")
+
+    if config.asynchronous and not get_optimizer_class(config.optimizer["type"]).SUPPORTS_ASYNCHRONOUS_TELL:
+        raise RuntimeError(f"'asynchronous' is set to True, but the optimizer '{config.optimizer['type']}' does not "
+                           f"support asynchronous updates.")
+
     individual_size, output_neurons_start_index, output_neurons_end_index = ep_runner.get_individual_size()
 
     print(f"Free parameters: {ep_runner.get_free_parameter_usage()}")
@@ -124,58 +350,40 @@ def train(configuration: Optional[Union[str, Dict]] = None, results_directory: s
         output_neurons_end_index=output_neurons_end_index
     )
 
+    shared_population = None
+    if config.shared_memory_population:
+        shared_population = SharedPopulation(opt.get_population_size(), individual_size)
+
+    number_workers = os.cpu_count() or 1
+
+    if config.persistent_workers:
+        # The EpisodeRunner is sent once to each worker, afterwards only the genomes and seeds are sent, and the updated
+        # observation statistics once per generation
+        pool = multiprocessing.Pool(number_workers, initializer=initialize_worker,
+                                    initargs=(ep_runner, shared_population, multiprocessing.Barrier(number_workers)))
+        # The main process is initialized as well, since it runs the evaluations in debug mode. Its resident
+        # EpisodeRunner is ep_runner itself, thus it always has the current observation statistics.
+        initialize_worker(ep_runner, shared_population)
+        eval_fitness = eval_fitness_in_worker
+        eval_fitness_batched = eval_fitness_batched_in_worker
+    else:
+        pool = multiprocessing.Pool(number_workers)
+        eval_fitness = ep_runner.eval_fitness
+        eval_fitness_batched = ep_runner.eval_fitness_batched
+
+    # In debug mode, the scheduler runs all evaluations in the main process
+    scheduler = EvaluationScheduler(None if debug else pool, number_workers)
+
     best_genome_overall = None
     best_reward_overall = -math.inf
 
     log = []
 
-    # Run evolutionary training for given number of generations
-    for generation in range(config.number_generations):
-
-        start_time_current_generation = time.time()
-
-        # Environment seed for this generation
-        if config.fixed_env_seed == -1:
-            # Excludes validation environment seeds
-            env_seed = random.randint(config.number_validation_runs, config.maximum_env_seed)
-        else:
-            env_seed = config.fixed_env_seed
-
-        # Ask optimizers for new population
-        genomes = opt.ask()
-
-        # Training runs for candidates
-        evaluations = []
-        for genome in genomes:
-            evaluations.append([genome, env_seed, config.number_rounds, True])
-
-        if debug:
-            # Use this for debugging
-            training_results = [ep_runner.eval_fitness(*individual_eval) for individual_eval in evaluations]
-        else:
-            training_results = pool.starmap(ep_runner.eval_fitness, evaluations)
-
-        rewards_training = []
-        recorded_observations = []
-        for result in training_results:
-            if isinstance(result, tuple):
-                rewards_training.append(result[0])
-                recorded_observations.extend(result[1])
-            else:
-                rewards_training.append(result)
-
-        # Tell optimizers new rewards
-        best_genome_current_generation = opt.tell(rewards_training)
-
-        # Validation runs for best individual
-        evaluations = []
-        for i in range(config.number_validation_runs):
-            evaluations.append([best_genome_current_generation, i, 1, False])
-
-        if debug:
-            rewards_validation = [ep_runner.eval_fitness(*individual_eval) for individual_eval in evaluations]
-        else:
-            rewards_validation = pool.starmap(ep_runner.eval_fitness, evaluations)
+    def finish_generation(generation: int, start_time_generation: float, rewards_training: List[float],
+                          training_task_durations: np.ndarray, best_genome_generation: np.ndarray,
+                          rewards_validation: List[float]):
+        """Logs the generation, once its validation runs are finished."""
+        nonlocal best_genome_overall, best_reward_overall
 
         min_reward_validation = np.min(rewards_validation)
         mean_reward_validation = np.mean(rewards_validation)
@@ -183,16 +391,11 @@ def train(configuration: Optional[Union[str, Dict]] = None, results_directory: s
 
         best_reward_current_generation = mean_reward_validation
         if best_reward_current_generation > best_reward_overall:
-            best_genome_overall = best_genome_current_generation
+            best_genome_overall = best_genome_generation
             best_reward_overall = best_reward_current_generation
 
-        # Update the statistics used for standardizing the observations, so that in the new generation the updated ones
-        # can be used (if this preprocessing is not selected for the training, nothing is done, and
-        # len(recorded_observations) is zero anyway
-        # Important to do this here at the end, otherwise the validation episodes would use the updated statistics
-        ep_runner.update_ob_mean_std(recorded_observations)
-
-        elapsed_time_current_generation = time.time() - start_time_current_generation
+        # If the validation runs are overlapped or asynchronous, this includes training runs of the next generation
+        elapsed_time_current_generation = time.time() - start_time_generation
 
         min_reward_training = np.min(rewards_training)
         mean_reward_training = np.mean(rewards_training)
@@ -207,7 +410,9 @@ def train(configuration: Optional[Union[str, Dict]] = None, results_directory: s
             MEAN_VAL_KEY: mean_reward_validation,
             MAX_VAL_KEY: max_reward_validation,
             BEST_KEY: best_reward_overall,
-            ELAPSED_KEY: elapsed_time_current_generation
+            ELAPSED_KEY: elapsed_time_current_generation,
+            MEAN_EVAL_TIME_KEY: float(np.mean(training_task_durations)),
+            MAX_EVAL_TIME_KEY: float(np.max(training_task_durations))
         }
 
         # Print info for current generation
@@ -227,6 +432,133 @@ def train(configuration: Optional[Union[str, Dict]] = None, results_directory: s
         if w_and_b_log:
             wandb.log(log_line)
 
+    # The broadcast of the latest observation statistics to the persistent workers
+    pending_broadcast = None
+
+    def update_ob_mean_std(ob_stat_partials: List[RunningStatPartial]):
+        """
+        Updates the statistics used for standardizing the observations, so that in the new generation the updated ones
+        can be used (if this preprocessing is not selected for the training, nothing is done, and len(ob_stat_partials)
+        is zero anyway).
+        """
+        nonlocal pending_broadcast
+
+        ep_runner.update_ob_mean_std(ob_stat_partials)
+
+        if config.persistent_workers and not debug and ep_runner.get_ob_mean_std() is not None:
+            if pending_broadcast is not None:
+                pending_broadcast.get()
+
+            # The resident EpisodeRunner of the workers only needs the updated observation statistics. The workers
+            # receive them after the evaluations that were already submitted, thus these still use the previous ones.
+            pending_broadcast = broadcast_ob_mean_std(pool, number_workers, ep_runner.get_ob_mean_std())
+
+    # The generation whose validation runs are still running, if they are overlapped with the next generation
+    pending_generation = None
+
+    if config.asynchronous:
+        run_asynchronous_generations(config, opt, ep_runner, scheduler, eval_fitness, number_workers,
+                                     update_ob_mean_std, finish_generation)
+    else:
+        # Run evolutionary training for given number of generations
+        for generation in range(config.number_generations):
+
+            start_time_current_generation = time.time()
+
+            # Environment seed for this generation
+            env_seed = draw_env_seed(config)
+
+            # Training runs for candidates
+            if shared_population is not None:
+                # Ask optimizers for new population, which is written into the shared memory. The workers then only need
+                # the index of the genome in the population.
+                opt.ask_into(shared_population.population)
+                eval_training_fitness = eval_shared_individual_in_worker
+                individuals = list(range(opt.get_population_size()))
+            else:
+                # Ask optimizers for new population
+                eval_training_fitness = eval_fitness
+                individuals = opt.ask()
+
+            # The durations of the training evaluations in seconds
+            training_task_durations = []
+
+            if config.racing:
+                race = FitnessRace(len(individuals), config.number_rounds, opt.get_number_selected(),
+                                   ep_runner.get_episode_reward_bounds())
+                ob_stat_partials = []
+
+                while not race.is_finished():
+                    # Evaluate the running genomes in the current round only, which uses the same environment seed as
+                    # the corresponding round of an evaluation with all rounds at once
+                    evaluations = [[individuals[i], env_seed + race.current_round, 1, True]
+                                   for i in race.get_running_indices()]
+
+                    round_rewards, round_ob_stat_partials = split_training_results(
+                        scheduler.map(eval_training_fitness, evaluations, estimate_key="training")
+                    )
+                    training_task_durations.append(scheduler.get_last_task_durations(eval_training_fitness, "training"))
+
+                    race.add_round(round_rewards)
+                    ob_stat_partials.extend(round_ob_stat_partials)
+
+                rewards_training = race.get_fitnesses()
+            elif config.batched_evaluation:
+                evaluations = split_into_batches(individuals, env_seed, config.number_rounds, number_workers)
+
+                batch_results = scheduler.map(eval_fitness_batched, evaluations, estimate_key="training")
+                rewards_training, ob_stat_partials = split_training_results(
+                    [result for results in batch_results for result in results]
+                )
+                training_task_durations.append(scheduler.get_last_task_durations(eval_fitness_batched, "training"))
+            else:
+                evaluations = [[individual, env_seed, config.number_rounds, True]
+                               for individual in individuals]
+
+                rewards_training, ob_stat_partials = split_training_results(
+                    scheduler.map(eval_training_fitness, evaluations, estimate_key="training")
+                )
+                training_task_durations.append(scheduler.get_last_task_durations(eval_training_fitness, "training"))
+
+            training_task_durations = np.concatenate(training_task_durations)
+
+            # Tell optimizers new rewards
+            best_genome_current_generation = opt.tell(rewards_training)
+
+            # Validation runs for best individual. The genome is copied, because the arguments are only pickled when
+            # they are sent to the workers, and the optimizer may reuse its arrays in the meantime.
+            evaluations = [[np.array(best_genome_current_generation), i, 1, False]
+                           for i in range(config.number_validation_runs)]
+
+            pending_validation = scheduler.map_async(eval_fitness, evaluations, estimate_key="validation")
+
+            if config.overlap_validation:
+                # The validation runs were submitted before the updated observation statistics, thus the statistics
+                # can already be updated for the next generation, and the validation runs are collected after the
+                # training runs of the next generation
+                update_ob_mean_std(ob_stat_partials)
+
+                if pending_generation is not None:
+                    finish_generation(*pending_generation[:-1], pending_generation[-1].get())
+
+                pending_generation = (generation, start_time_current_generation, rewards_training,
+                                      training_task_durations, best_genome_current_generation, pending_validation)
+            else:
+                rewards_validation = pending_validation.get()
+
+                # Important to do this here at the end, otherwise the validation episodes would use the updated
+                # statistics
+                update_ob_mean_std(ob_stat_partials)
+
+                finish_generation(generation, start_time_current_generation, rewards_training, training_task_durations,
+                                  best_genome_current_generation, rewards_validation)
+
+    if pending_generation is not None:
+        finish_generation(*pending_generation[:-1], pending_generation[-1].get())
+
+    if pending_broadcast is not None:
+        pending_broadcast.get()
+
     elapsed_time = time.time() - start_time_training
 
     print(f"Elapsed time for training: {elapsed_time:.2f} seconds")
@@ -299,6 +631,9 @@ def train(configuration: Optional[Union[str, Dict]] = None, results_directory: s
     pool.close()
     pool.join()
 
+    if shared_population is not None:
+        shared_population.close()
+
     if w_and_b_log:
         wandb.finish()
 
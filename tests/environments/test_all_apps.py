@@ -1,6 +1,15 @@
+import numpy as np
+import pytest
+
 from naturalnets.environments.anki.anki_app import AnkiApp
+from naturalnets.environments.anki.deck import DeckDatabase
+from naturalnets.environments.anki.deck_storage import InMemoryDeckStorage
 from naturalnets.environments.dummy_app.dummy_app import DummyApp
+from naturalnets.environments.dummy_app.vec_dummy_app import VecDummyApp
+from naturalnets.environments.gui_app.gui_app import GUIApp
+from naturalnets.environments.i_environment import get_vectorized_environment_class
 from naturalnets.environments.passlock_app.passlock_app import PasslockApp
+from naturalnets.environments.password_manager_app.password_manager_app import PasswordManagerApp
 
 
 class TestPasslockApp:
@@ -51,6 +60,52 @@ class TestAnkiApp():
         assert self.anki_app.click_position_x == 0
         assert self.anki_app.click_position_y == 0
 
+    def test_anki_independent_instances(self):
+        """
+        Test if two AnkiApps that are stepped alternately behave exactly like AnkiApps that are stepped on their own,
+        i.e. that they do not share any state
+        """
+        configuration = {"type": "AnkiApp", "number_time_steps": 300}
+        rng = np.random.default_rng(0)
+        actions = [rng.uniform(-1.0, 1.0, size=(300, 2)) for _ in range(2)]
+
+        expected_states = []
+        for app_actions in actions:
+            anki_app = AnkiApp(configuration)
+            anki_app.reset()
+            expected_states.append([anki_app.step(action)[0].copy() for action in app_actions])
+
+        anki_apps = [AnkiApp(configuration), AnkiApp(configuration)]
+        for anki_app in anki_apps:
+            anki_app.reset()
+
+        for t in range(300):
+            for i, anki_app in enumerate(anki_apps):
+                ob, _, _, _ = anki_app.step(actions[i][t])
+                assert np.array_equal(ob, expected_states[i][t])
+
+    def test_anki_in_memory_deck_storage(self):
+        """
+        Test if decks are imported from the cached predefined decks and exported into the in-memory storage of the
+        DeckDatabase
+        """
+        deck_databases = [DeckDatabase(InMemoryDeckStorage()), DeckDatabase(InMemoryDeckStorage())]
+
+        imported_decks = [deck_database.import_deck("German_numbers_0-100") for deck_database in deck_databases]
+        assert imported_decks[0].deck_length() == 101
+        assert imported_decks[0].get_cards()[1].get_front() == "1"
+        assert imported_decks[0].get_cards()[1].get_back() == "Eins"
+        # Each import creates new cards, so that editing a card does not change other decks
+        assert imported_decks[0].get_cards()[1] is not imported_decks[1].get_cards()[1]
+
+        deck_databases[0].default_decks()
+        deck_databases[0].export_deck(deck_databases[0].get_decks()[0])
+        assert deck_databases[0].is_exported(deck_databases[0].get_decks()[0].get_name())
+        assert not deck_databases[1].is_exported(deck_databases[0].get_decks()[0].get_name())
+
+        deck_databases[0].reset_exported_decks()
+        assert not deck_databases[0].is_exported(deck_databases[0].get_decks()[0].get_name())
+
 
 class TestDummyApp():
 
@@ -81,3 +136,156 @@ class TestDummyApp():
         self.dummy_app.reset()
         assert self.dummy_app.click_position_x == 0
         assert self.dummy_app.click_position_y == 0
+
+    @pytest.mark.parametrize("force_consecutive_click_order", [True, False])
+    def test_vec_dummy_app(self, force_consecutive_click_order):
+        """
+        Test if each instance of the VecDummyApp behaves exactly like a DummyApp with the same environment seed
+        """
+        configuration = {
+            "type": "DummyApp",
+            "number_time_steps": 100,
+            "screen_width": 400,
+            "screen_height": 400,
+            "number_button_columns": 5,
+            "number_button_rows": 5,
+            "button_width": 50,
+            "button_height": 30,
+            "fixed_env_seed": False,
+            "force_consecutive_click_order": force_consecutive_click_order
+        }
+
+        # Used by the batched evaluations of the EpisodeRunner
+        assert get_vectorized_environment_class("DummyApp") is VecDummyApp
+
+        number_instances = 4
+        env_seeds = list(range(number_instances))
+
+        vec_dummy_app = VecDummyApp(configuration, number_instances)
+        dummy_apps = [DummyApp(configuration) for _ in range(number_instances)]
+
+        vec_ob = vec_dummy_app.reset(env_seeds)
+        for k, dummy_app in enumerate(dummy_apps):
+            assert np.array_equal(vec_ob[k], dummy_app.reset(env_seeds[k]))
+
+        rng = np.random.default_rng(0)
+        vec_done = False
+
+        while not vec_done:
+            actions = rng.uniform(-1.0, 1.0, size=(number_instances, 2))
+            vec_ob, vec_rew, vec_done, vec_info = vec_dummy_app.step(actions)
+
+            for k, dummy_app in enumerate(dummy_apps):
+                ob, rew, done, info = dummy_app.step(actions[k])
+
+                assert np.array_equal(vec_ob[k], ob)
+                assert vec_rew[k] == rew
+                assert vec_done == done
+                assert vec_info["action"][k] == info["action"]
+
+
+def run_password_manager_app_episode(coverage_measurer: str, seed: int) -> list:
+    """
+    Runs an episode of a new PasswordManagerApp with random clicks drawn from the seed and returns the rewards
+    """
+    password_manager_app = PasswordManagerApp({
+        "type": "PasswordManagerApp",
+        "number_time_steps": 50,
+        "coverage_measurer": coverage_measurer
+    })
+    password_manager_app.reset()
+
+    actions = np.random.default_rng(seed).uniform(-1.0, 1.0, size=(50, 2))
+
+    return [password_manager_app.step(action)[1] for action in actions]
+
+
+class TestPasswordManagerApp:
+
+    def test_coverage_measurers(self):
+        """
+        Test if the LineTracer gives the same PasswordManagerApp rewards as coverage.py
+        """
+        for seed in range(3):
+            line_tracer_rewards = run_password_manager_app_episode("line_tracer", seed)
+            coverage_py_rewards = run_password_manager_app_episode("coverage_py", seed)
+
+            assert line_tracer_rewards == coverage_py_rewards
+
+    def test_line_tracer_reward(self):
+        """
+        Test the PasswordManagerApp rewards with the (default) LineTracer for a fixed action sequence
+        """
+        rewards = run_password_manager_app_episode("line_tracer", 0)
+
+        # The first step additionally contains the time step reward (number_time_steps)
+        assert rewards[:4] == [72, 5, 30, -1]
+        assert sum(rewards) == 154
+
+    def test_independent_instances(self):
+        """
+        Test if two PasswordManagerApps that are stepped alternately behave exactly like PasswordManagerApps that are
+        stepped on their own, i.e. that they do not share any state
+        """
+        configuration = {"type": "PasswordManagerApp", "number_time_steps": 100}
+        rng = np.random.default_rng(0)
+        actions = [rng.uniform(-1.0, 1.0, size=(100, 2)) for _ in range(2)]
+
+        expected_steps = []
+        for app_actions in actions:
+            password_manager_app = PasswordManagerApp(configuration)
+            password_manager_app.reset()
+            expected_steps.append([])
+            for action in app_actions:
+                ob, rew, _, _ = password_manager_app.step(action)
+                expected_steps[-1].append((ob.copy(), rew))
+
+        password_manager_apps = [PasswordManagerApp(configuration), PasswordManagerApp(configuration)]
+        for password_manager_app in password_manager_apps:
+            password_manager_app.reset()
+
+        for t in range(100):
+            for i, password_manager_app in enumerate(password_manager_apps):
+                ob, rew, _, _ = password_manager_app.step(actions[i][t])
+                expected_ob, expected_rew = expected_steps[i][t]
+
+                assert np.array_equal(ob, expected_ob)
+                assert rew == expected_rew
+
+
+class TestSnapshotReset:
+
+    @pytest.mark.parametrize("app_class, configuration", [
+        (GUIApp, {"type": "GUIApp", "number_time_steps": 1000, "include_fake_bug": False}),
+        (PasslockApp, {"type": "PasslockApp", "number_time_steps": 1000, "include_fake_bug": False}),
+        (AnkiApp, {"type": "AnkiApp", "number_time_steps": 1000})
+    ])
+    def test_reset_after_episode(self, app_class, configuration):
+        """
+        Test if an app that is reset after an episode, i.e. that restores its snapshot, behaves exactly like a freshly
+        built app
+        """
+        # With this seed, the PasslockApp does not click the login button while the password textfield is not
+        # selected, which raises an AttributeError
+        rng = np.random.default_rng(1)
+        episode_actions, compared_actions = rng.uniform(-1.0, 1.0, size=(2, 1000, 2))
+
+        app = app_class(configuration)
+        app.reset()
+        for action in episode_actions:
+            app.step(action)
+
+        new_app = app_class(configuration)
+        assert np.array_equal(app.reset(), new_app.reset())
+        assert np.array_equal(app.render_image(), new_app.render_image())
+
+        for t, action in enumerate(compared_actions):
+            ob, rew, _, _ = app.step(action)
+            new_ob, new_rew, _, _ = new_app.step(action)
+
+            assert np.array_equal(ob, new_ob)
+            assert rew == new_rew
+
+            # Some fields are only rendered, e.g. the text of a textfield
+            if t % 10 == 0:
+                assert np.array_equal(app.render_image(), new_app.render_image())
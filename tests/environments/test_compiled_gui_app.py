@@ -0,0 +1,98 @@
+import numpy as np
+
+from naturalnets.environments import GUIApp, GUIAppCompiled
+from naturalnets.environments.gui_app.app_controller import AppController
+from naturalnets.environments.gui_app.compiled_gui_app import (TransitionTable, add_current_state,
+                                                               compile_transition_table, find_click_position,
+                                                               record_click)
+
+
+class TestGUIAppCompiled:
+
+    number_time_steps = 100
+
+    gui_app_configuration = {
+        "type": "GUIApp",
+        "number_time_steps": number_time_steps,
+        "include_fake_bug": False,
+        "return_clickable_elements": True,
+        "nearest_widget_click": True
+    }
+
+    def assert_same_episodes(self, gui_app_compiled: GUIAppCompiled, number_episodes: int):
+        gui_app = GUIApp(self.gui_app_configuration)
+        rng = np.random.default_rng(0)
+
+        for _ in range(number_episodes):
+            assert (gui_app.reset() == gui_app_compiled.reset()).all()
+
+            done = False
+            while not done:
+                action = rng.uniform(-1.0, 1.0, size=2)
+                ob, rew, done, _ = gui_app.step(action)
+                compiled_ob, compiled_rew, compiled_done, _ = gui_app_compiled.step(action)
+
+                assert (ob == compiled_ob).all()
+                assert rew == compiled_rew
+                assert done == compiled_done
+
+    def test_same_as_gui_app(self):
+        """
+        Test if GUIAppCompiled, which starts with an empty transition table, gives the same observations and rewards as
+        the GUIApp with nearest widget clicks, also when the transitions are looked up in later episodes
+        """
+        gui_app_compiled = GUIAppCompiled({"type": "GUIAppCompiled", "number_time_steps": self.number_time_steps})
+
+        self.assert_same_episodes(gui_app_compiled, number_episodes=10)
+        self.assert_same_episodes(gui_app_compiled, number_episodes=10)
+
+    def test_compiled_transition_table(self, tmp_path):
+        """
+        Test if a compiled transition table can be saved and loaded, and is used by GUIAppCompiled
+        """
+        table = compile_transition_table(max_states=100)
+        assert table.get_number_states() >= 100
+
+        path = str(tmp_path / "transition_table.npz")
+        table.save(path)
+        loaded_table = TransitionTable.load(path)
+
+        assert loaded_table.get_number_states() == table.get_number_states()
+        assert loaded_table.clickable_coordinates == table.clickable_coordinates
+        assert loaded_table.transitions == table.transitions
+
+        gui_app_compiled = GUIAppCompiled({
+            "type": "GUIAppCompiled",
+            "number_time_steps": self.number_time_steps,
+            "transition_table": path
+        })
+
+        self.assert_same_episodes(gui_app_compiled, number_episodes=5)
+
+    def test_record_click_resets_reward_counter(self):
+        """
+        Test if recording a click clears the rewards together with the RewardCounter of the AppController, such that
+        both still agree if rewards were registered before the click
+        """
+        app_controller = AppController(nearest_widget_click=True)
+        app_controller.reset()
+
+        table = TransitionTable(app_controller.get_total_state_len(), app_controller.get_total_reward_len())
+        state_id = add_current_state(table, app_controller)
+
+        for element_index in range(len(table.clickable_coordinates[state_id])):
+            click_position = find_click_position(table, state_id, element_index)
+
+            if click_position is None:
+                continue
+
+            # Reach the state with a click that already registers rewards, then record the same click again
+            app_controller.reset()
+            app_controller.handle_click(click_position)
+            assert app_controller.reward_counter.count > 0
+
+            state_id_after_click = add_current_state(table, app_controller)
+            _, reward_indices = record_click(table, app_controller, state_id_after_click, click_position)
+
+            assert app_controller.reward_counter.count == len(reward_indices) == app_controller.reward_array.sum()
+            break
@@ -1,4 +1,9 @@
+import numpy as np
+
 from naturalnets.environments import GUIApp
+from naturalnets.environments.app_components.click_index import ClickIndex, create_nearest_label_image
+from naturalnets.environments.app_components.utils import get_image_path, load_image, load_resized_image
+from naturalnets.environments.gui_app.constants import IMAGES_PATH
 from naturalnets.tools.utils import rescale_values
 
 
@@ -26,3 +31,124 @@ class TestGUIApp:
 
                 # Compare reward coming from the environment with the recorded, ground truth reward
                 assert rew == interaction[2]
+
+    def test_gui_app_snapshot_reset(self, test_coordinates_and_rewards):
+        """
+        Test if resetting the GUIApp by restoring its snapshot gives the same states and rewards as a new GUIApp
+        """
+        configuration = {"type": "GUIApp", "number_time_steps": 1000, "include_fake_bug": False}
+        gui_app = GUIApp(configuration)
+
+        for interaction_sequence in test_coordinates_and_rewards:
+            ob = gui_app.reset()
+
+            new_gui_app = GUIApp(configuration)
+            assert (ob == new_gui_app.reset()).all()
+
+            for interaction in interaction_sequence:
+                action = rescale_values(interaction[:2], previous_low=0, previous_high=447, new_low=-1, new_high=1)
+                ob, rew, _, _ = gui_app.step(action)
+                new_ob, new_rew, _, _ = new_gui_app.step(action)
+
+                assert rew == new_rew
+                assert (ob == new_ob).all()
+
+    def test_image_cache(self, test_coordinates_and_rewards):
+        """
+        Test if the cached images are shared and read-only, and if rendering does not change them, i.e. the rendered
+        images of an app that rendered many steps are the same as the ones of a fresh app
+        """
+        img_path = get_image_path(IMAGES_PATH, "main_window_base.png")
+
+        assert load_image(img_path) is load_image(img_path)
+        assert load_resized_image(img_path, 100, 50) is load_resized_image(img_path, 100, 50)
+        assert load_resized_image(img_path, 100, 50).shape == (50, 100, 3)
+
+        assert not load_image(img_path).flags.writeable
+        assert not load_resized_image(img_path, 100, 50).flags.writeable
+
+        configuration = {"type": "GUIApp", "number_time_steps": 1000, "include_fake_bug": False}
+        actions = [rescale_values(interaction[:2], previous_low=0, previous_high=447, new_low=-1, new_high=1)
+                   for interaction in test_coordinates_and_rewards[0][:50]]
+
+        gui_app = GUIApp(configuration)
+        gui_app.reset()
+        initial_image = gui_app.render_image()
+
+        rendered_images = []
+        for action in actions:
+            gui_app.step(action)
+            rendered_images.append(gui_app.render_image())
+
+        fresh_gui_app = GUIApp(configuration)
+        fresh_gui_app.reset()
+        assert np.array_equal(fresh_gui_app.render_image(), initial_image)
+
+        for action, rendered_image in zip(actions, rendered_images):
+            fresh_gui_app.step(action)
+            assert np.array_equal(fresh_gui_app.render_image(), rendered_image)
+
+    def test_click_index(self, test_coordinates_and_rewards):
+        """
+        Test if the ClickIndex finds the same clicked and nearest elements as testing all clickable elements, also
+        when the nearest elements are looked up in a nearest label image
+        """
+        gui_app = GUIApp({"type": "GUIApp", "number_time_steps": 1000, "include_fake_bug": False})
+        gui_app.reset()
+
+        rng = np.random.default_rng(0)
+
+        for interaction in test_coordinates_and_rewards[0]:
+            clickable_elements = gui_app.app_controller.get_clickable_elements()
+            click_index = ClickIndex(clickable_elements, cell_size=16)
+            nearest_label_image = create_nearest_label_image(click_index.coordinates, 449, 449)
+
+            for click_position in rng.integers(0, 449, size=(20, 2)):
+                assert click_index.get_clicked_elements(click_position) == [
+                    element for element in clickable_elements if element.is_clicked_by(click_position)
+                ]
+
+                distances = [element.calculate_distance_to_click(click_position) for element in clickable_elements]
+                nearest_element = clickable_elements[int(np.argmin(distances))]
+                assert click_index.get_nearest_element(click_position) is nearest_element
+                assert click_index.get_nearest_element(click_position, nearest_label_image) is nearest_element
+
+            gui_app.step(rescale_values(interaction[:2], previous_low=0, previous_high=447, new_low=-1, new_high=1))
+
+    def test_cached_clickable_elements(self, test_coordinates_and_rewards):
+        """
+        Test if the cached clickable elements are the same as the ones collected from the current app state
+        """
+        gui_app = GUIApp({
+            "type": "GUIApp",
+            "number_time_steps": 1000,
+            "include_fake_bug": False,
+            "return_clickable_elements": True
+        })
+
+        for interaction_sequence in test_coordinates_and_rewards:
+            gui_app.reset()
+
+            for interaction in interaction_sequence:
+                _, _, _, info = gui_app.step(
+                    rescale_values(interaction[:2], previous_low=0, previous_high=447, new_low=-1, new_high=1)
+                )
+
+                clickable_elements = gui_app.app_controller._collect_clickable_elements()
+                assert info["clickable_elements"] == clickable_elements
+                assert gui_app.get_clickable_elements() == clickable_elements
+
+    def test_reward_counter(self, test_coordinates_and_rewards):
+        """
+        Test if the reward counter always equals the number of rewards that are set in the reward array
+        """
+        gui_app = GUIApp({"type": "GUIApp", "number_time_steps": 1000, "include_fake_bug": False})
+
+        for interaction_sequence in test_coordinates_and_rewards:
+            gui_app.reset()
+            app_controller = gui_app.app_controller
+
+            for interaction in interaction_sequence:
+                gui_app.step(rescale_values(interaction[:2], previous_low=0, previous_high=447, new_low=-1, new_high=1))
+
+                assert app_controller.reward_counter.count == np.count_nonzero(app_controller.reward_array)
@@ -1,4 +1,9 @@
 import numpy as np
+import pytest
+from scipy.sparse import issparse
+
+from naturalnets.brains.continuous_time_rnn import CTRNN
+from naturalnets.brains.i_brain import get_batched_brain_class
 
 
 class TestBrains:
@@ -50,4 +55,267 @@ class TestBrains:
         actions = np.array(actions)
 
         assert np.array_equal(observations, reference_observations)
-        assert np.array_equal(actions, reference_actions)
+        # Not bitwise, because the order of the floating point operations may differ between implementations (e.g. the
+        # LSTM and GRU fuse the products of their gates)
+        np.testing.assert_allclose(actions, reference_actions, rtol=1e-12, atol=1e-12)
+
+    def test_batched_brains(self, brain_test_config):
+        """
+        Test if the batched implementation of a brain gives the same outputs as the single brains
+        """
+        input_size = brain_test_config[0]
+        output_size = brain_test_config[1]
+        brain_config = brain_test_config[2]
+        brain_class = brain_test_config[3]
+
+        batched_brain_class = get_batched_brain_class(brain_config["type"])
+
+        brain_state = brain_class.generate_brain_state(
+            input_size=input_size,
+            output_size=output_size,
+            configuration=brain_config
+        )
+
+        individual_size, _, _ = brain_class.get_individual_size(input_size, output_size, brain_config, brain_state)
+
+        rng = np.random.default_rng(0)
+        batch_size = 4
+        individuals = rng.standard_normal((batch_size, individual_size))
+
+        # noinspection PyCallingNonCallable
+        brains = [
+            brain_class(
+                input_size=input_size,
+                output_size=output_size,
+                individual=individual,
+                configuration=brain_config,
+                brain_state=brain_state
+            ) for individual in individuals
+        ]
+
+        batched_brain = batched_brain_class(
+            input_size=input_size,
+            output_size=output_size,
+            individuals=individuals,
+            configuration=brain_config,
+            brain_state=brain_state
+        )
+
+        for brain in brains:
+            brain.reset()
+        batched_brain.reset()
+
+        for _ in range(10):
+            obs = rng.standard_normal((batch_size, input_size))
+
+            actions = np.array([brain.step(ob) for brain, ob in zip(brains, obs)])
+            batched_actions = batched_brain.step(obs)
+
+            assert batched_actions.shape == (batch_size, output_size)
+            assert np.allclose(actions, batched_actions, atol=1e-6)
+
+    def test_reset(self, brain_test_config):
+        """
+        Test if a brain gives the same outputs after a reset, also if the data type of the observations changes, since
+        some brains reuse their state arrays
+        """
+        input_size = brain_test_config[0]
+        output_size = brain_test_config[1]
+        brain_config = brain_test_config[2]
+        brain_class = brain_test_config[3]
+
+        brain_state = brain_class.generate_brain_state(
+            input_size=input_size,
+            output_size=output_size,
+            configuration=brain_config
+        )
+
+        individual_size, _, _ = brain_class.get_individual_size(input_size, output_size, brain_config, brain_state)
+
+        rng = np.random.default_rng(0)
+        individual = rng.standard_normal(individual_size, dtype=np.float32)
+        observations = rng.standard_normal((10, input_size), dtype=np.float32)
+
+        # noinspection PyCallingNonCallable
+        brain = brain_class(
+            input_size=input_size,
+            output_size=output_size,
+            individual=individual,
+            configuration=brain_config,
+            brain_state=brain_state
+        )
+
+        brain.reset()
+        actions = np.array([brain.step(ob) for ob in observations])
+
+        brain.reset()
+        assert np.array_equal(np.array([brain.step(ob) for ob in observations]), actions)
+
+        brain.reset()
+        actions_float64 = np.array([brain.step(ob.astype(np.float64)) for ob in observations])
+        assert np.allclose(actions_float64, actions, atol=1e-5)
+
+    @pytest.mark.parametrize("differential_equation", ["NaturalNet", "LiHoChow2005"])
+    def test_sparse_ctrnn(self, differential_equation: str):
+        """
+        Test if a CTRNN with sparse weight matrices gives the same outputs as the same CTRNN with dense weight matrices
+        """
+        input_size, output_size = 30, 10
+        brain_config = {
+            "type": "CTRNN",
+            "delta_t": 0.05,
+            "differential_equation": differential_equation,
+            "number_neurons": 300,
+            "v_mask": "random",
+            "v_mask_density": 0.5,
+            "w_mask": "random",
+            "w_mask_density": 0.05,
+            "t_mask": "random",
+            "t_mask_density": 0.3,
+            "set_principle_diagonal_elements_of_W_negative": True,
+            "optimize_x0": True
+        }
+
+        np.random.seed(0)
+        brain_state = CTRNN.generate_brain_state(input_size, output_size, brain_config)
+        individual_size, _, _ = CTRNN.get_individual_size(input_size, output_size, brain_config, brain_state)
+
+        rng = np.random.default_rng(0)
+        individual = rng.standard_normal(individual_size)
+
+        sparse_brain = CTRNN(input_size, output_size, individual, brain_config, brain_state)
+        dense_brain = CTRNN(input_size, output_size, individual, {**brain_config, "sparse_density_threshold": 0.0},
+                            brain_state)
+
+        # Only W is large and sparse enough
+        assert issparse(sparse_brain.W) and not issparse(sparse_brain.V) and not issparse(sparse_brain.T)
+        assert not issparse(dense_brain.W)
+        assert np.array_equal(sparse_brain.W.toarray(), dense_brain.W)
+        assert np.all(np.diag(dense_brain.W) <= 0)
+        assert np.count_nonzero(dense_brain.W) == np.count_nonzero(brain_state["w_mask"])
+
+        sparse_brain.reset()
+        dense_brain.reset()
+
+        for _ in range(20):
+            ob = rng.standard_normal(input_size)
+            assert np.allclose(sparse_brain.step(ob), dense_brain.step(ob))
+
+    @pytest.mark.parametrize("mask_type", ["dense", "random"])
+    def test_ctrnn_decoding(self, mask_type: str):
+        """Test if the CTRNN inserts the genome into the masks in row-major order, using the precomputed indices"""
+        input_size, output_size = 8, 3
+        brain_config = {
+            "type": "CTRNN",
+            "delta_t": 0.05,
+            "differential_equation": "NaturalNet",
+            "number_neurons": 6,
+            "v_mask": mask_type,
+            "v_mask_density": 0.5,
+            "w_mask": mask_type,
+            "w_mask_density": 0.5,
+            "t_mask": mask_type,
+            "t_mask_density": 0.5,
+            "optimize_x0": True
+        }
+
+        np.random.seed(0)
+        brain_state = CTRNN.generate_brain_state(input_size, output_size, brain_config)
+        individual_size, _, _ = CTRNN.get_individual_size(input_size, output_size, brain_config, brain_state)
+
+        individual = np.random.default_rng(0).standard_normal(individual_size)
+        brain = CTRNN(input_size, output_size, individual, brain_config, brain_state)
+
+        index = 0
+        for matrix, mask in [(brain.V, brain_state["v_mask"]), (brain.W, brain_state["w_mask"]),
+                             (brain.T, brain_state["t_mask"])]:
+            expected = np.zeros(mask.shape)
+            expected[mask] = individual[index:index + np.count_nonzero(mask)]
+            index += np.count_nonzero(mask)
+
+            assert np.array_equal(matrix, expected)
+
+            # Dense matrices are views of the genome
+            if mask_type == "dense":
+                assert np.shares_memory(matrix, individual)
+
+        assert np.array_equal(brain.x0, individual[index:])
+
+    @pytest.mark.parametrize("differential_equation", ["NaturalNet", "LiHoChow2005"])
+    def test_ctrnn_integration_methods(self, differential_equation: str):
+        """
+        Test if the CTRNN with substeps is integrated further per step, and if the error of the integration methods
+        decreases with their order, compared to an accurate solution with many small substeps
+        """
+        input_size, output_size, number_neurons = 8, 3, 10
+        brain_config = {
+            "type": "CTRNN",
+            "delta_t": 0.2,
+            "differential_equation": differential_equation,
+            "number_neurons": number_neurons,
+            "clipping_range": 100.0,
+            "alpha": 0.1,
+            "optimize_x0": True
+        }
+
+        brain_state = CTRNN.generate_brain_state(input_size, output_size, brain_config)
+        individual_size, _, _ = CTRNN.get_individual_size(input_size, output_size, brain_config, brain_state)
+
+        rng = np.random.default_rng(0)
+        individual = rng.standard_normal(individual_size) * 0.5
+        observations = rng.standard_normal((10, input_size))
+
+        def run(**config_changes) -> np.ndarray:
+            brain = CTRNN(input_size, output_size, individual, {**brain_config, **config_changes}, brain_state)
+            brain.reset()
+            return np.array([brain.step(ob) for ob in observations])
+
+        # Two substeps per step give the same outputs as stepping a brain twice with each input
+        two_substeps = run(number_substeps=2)
+        brain = CTRNN(input_size, output_size, individual, brain_config, brain_state)
+        brain.reset()
+        repeated = np.array([[brain.step(ob) for _ in range(2)][-1] for ob in observations])
+        assert np.array_equal(two_substeps, repeated)
+
+        accurate = run(delta_t=0.002, number_substeps=100, integration_method="RK4")
+        errors = [np.max(np.abs(run(integration_method=method) - accurate)) for method in ["Euler", "RK2", "RK4"]]
+
+        assert errors[0] > errors[1] > errors[2]
+        assert errors[2] < 1e-4
+
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_compute_dtype(self, brain_test_config, dtype):
+        """Test if a brain computes in the data type of its genome and inputs, i.e. does not upcast float32 to float64"""
+        input_size = brain_test_config[0]
+        output_size = brain_test_config[1]
+        brain_class = brain_test_config[3]
+
+        # Without biases, some brains use zero biases instead, which must have the data type of the genome as well
+        brain_configs = [brain_test_config[2]]
+        if "use_bias" in brain_test_config[2]:
+            brain_configs.append({**brain_test_config[2], "use_bias": False})
+
+        for brain_config in brain_configs:
+            brain_state = brain_class.generate_brain_state(
+                input_size=input_size,
+                output_size=output_size,
+                configuration=brain_config
+            )
+
+            individual_size, _, _ = brain_class.get_individual_size(input_size, output_size, brain_config,
+                                                                    brain_state)
+
+            rng = np.random.default_rng(0)
+
+            # noinspection PyCallingNonCallable
+            brain = brain_class(
+                input_size=input_size,
+                output_size=output_size,
+                individual=rng.standard_normal(individual_size).astype(dtype),
+                configuration=brain_config,
+                brain_state=brain_state
+            )
+
+            brain.reset()
+            for ob in rng.standard_normal((3, input_size)).astype(dtype):
+                assert brain.step(ob).dtype == dtype
@@ -1,8 +1,13 @@
 import os
 
 import numpy as np
+import pytest
 
-from naturalnets.tools.episode_runner import EpisodeRunner
+from naturalnets.brains.i_brain import get_brain_class
+from naturalnets.environments.i_environment import get_environment_class
+from naturalnets.tools.episode_runner import (EpisodeRunner, ObservationPreprocessor, ObservationRecorder,
+                                               PreprocessingCfg)
+from naturalnets.tools.utils import RunningStat
 
 
 class TestEpisodeRunner:
@@ -38,4 +43,197 @@ class TestEpisodeRunner:
 
         results = [ep_runner.eval_fitness(*individual_genome) for individual_genome in genomes]
 
-        assert np.array_equal(results, reference_results)
+        np.testing.assert_allclose(results, reference_results, rtol=1e-12, atol=1e-12)
+
+    @pytest.mark.parametrize("env_config", [
+        {"type": "GUIApp", "number_time_steps": 200, "include_fake_bug": False, "return_clickable_elements": True,
+         "nearest_widget_click": True},
+        {"type": "GUIAppCompiled", "number_time_steps": 200},
+        {"type": "PasslockApp", "number_time_steps": 200, "include_fake_bug": False},
+        {"type": "AnkiApp", "number_time_steps": 200},
+        {"type": "DummyApp", "number_time_steps": 100, "screen_width": 400, "screen_height": 400,
+         "number_button_columns": 5, "number_button_rows": 5, "button_width": 50, "button_height": 30,
+         "fixed_env_seed": False}
+    ])
+    def test_reused_environment(self, env_config):
+        """
+        Test if evaluating with the reused environment of an EpisodeRunner gives the same results as evaluating each
+        episode with a newly created environment
+        """
+        env_class = get_environment_class(env_config["type"])
+        assert env_class.REUSABLE
+
+        def create_episode_runner() -> EpisodeRunner:
+            return EpisodeRunner(
+                env_class=env_class,
+                env_configuration=env_config,
+                brain_class=get_brain_class("RNN"),
+                brain_configuration={"type": "RNN", "hidden_layers": [5], "use_bias": True},
+                preprocessing_config={},
+                # The random inputs of the enhancer let the episodes explore more of the environment
+                enhancer_config={"type": "RandomEnhancer"},
+                global_seed=0
+            )
+
+        ep_runner = create_episode_runner()
+
+        individual_size, _, _ = ep_runner.get_individual_size()
+        rng = np.random.default_rng(0)
+        genomes = [rng.standard_normal(individual_size, dtype=np.float32) for _ in range(10)]
+
+        for env_seed, genome in enumerate(genomes):
+            expected = create_episode_runner().eval_fitness(genome, env_seed, 1, False)
+            result = ep_runner.eval_fitness(genome, env_seed, 1, False)
+
+            assert result == expected
+
+        assert ep_runner.get_env() is ep_runner.get_env()
+
+    @pytest.mark.parametrize("env_config, brain_config, enhancer_config", [
+        ({"type": "GUIApp", "number_time_steps": 100, "include_fake_bug": False},
+         {"type": "LSTM", "hidden_layers": [8], "use_bias": True}, {"type": "RandomEnhancer"}),
+        ({"type": "DummyApp", "number_time_steps": 100, "screen_width": 400, "screen_height": 400,
+          "number_button_columns": 5, "number_button_rows": 5, "button_width": 50, "button_height": 30,
+          "fixed_env_seed": False},
+         {"type": "GRU", "hidden_layers": [8], "use_bias": True}, {"type": None}),
+        ({"type": "PasslockApp", "number_time_steps": 100, "include_fake_bug": False},
+         {"type": "FeedForwardNN", "hidden_layers": [8, 8], "neuron_activation": "tanh",
+          "neuron_activation_output": "tanh", "use_bias": True}, {"type": None})
+    ])
+    def test_eval_fitness_batched(self, env_config, brain_config, enhancer_config):
+        """
+        Test if evaluating a batch of genomes in lockstep gives the same results as evaluating each genome on its own
+        """
+        ep_runner = EpisodeRunner(
+            env_class=get_environment_class(env_config["type"]),
+            env_configuration=env_config,
+            brain_class=get_brain_class(brain_config["type"]),
+            brain_configuration=brain_config,
+            preprocessing_config={"observation_standardization": True, "calc_ob_stat_prob": 1.0},
+            enhancer_config=enhancer_config,
+            global_seed=0,
+            # The batched brains may round differently, which can change the clicked pixel in float32
+            compute_dtype="float64"
+        )
+
+        individual_size, _, _ = ep_runner.get_individual_size()
+        rng = np.random.default_rng(0)
+        genomes = [rng.standard_normal(individual_size) for _ in range(5)]
+        env_seeds = [0, 0, 1, 2, 3]
+
+        expected = [ep_runner.eval_fitness(genome, env_seed, 2, True) for genome, env_seed in zip(genomes, env_seeds)]
+        results = ep_runner.eval_fitness_batched(genomes, env_seeds, 2, True)
+
+        assert len(results) == len(expected)
+        for (reward, ob_stat_partial), (expected_reward, expected_ob_stat_partial) in zip(results, expected):
+            assert reward == pytest.approx(expected_reward)
+
+            for partial, expected_partial in zip(ob_stat_partial, expected_ob_stat_partial):
+                assert np.allclose(partial, expected_partial)
+
+    @pytest.mark.parametrize("observation_standardization,observation_clipping", [
+        (True, False), (False, True), (True, True)
+    ])
+    def test_observation_preprocessor(self, observation_standardization, observation_clipping):
+        """
+        Test if the ObservationPreprocessor gives the same results as standardizing and clipping with new arrays, in the
+        compute data type
+        """
+        config = PreprocessingCfg(observation_standardization=observation_standardization,
+                                  observation_clipping=observation_clipping, ob_clipping_value=1.5)
+
+        rng = np.random.default_rng(0)
+        ob_mean = rng.standard_normal(10, dtype=np.float32)
+        ob_std = rng.uniform(0.1, 2.0, size=10).astype(np.float32)
+
+        observation_preprocessor = ObservationPreprocessor(config)
+        observation_preprocessor.set_ob_mean_std(ob_mean, ob_std)
+
+        for ob in rng.integers(-5, 5, size=(5, 10), dtype=np.int8):
+            expected = ob
+            if observation_standardization:
+                expected = (expected - ob_mean) / ob_std
+            if observation_clipping:
+                expected = np.clip(expected, -1.5, 1.5)
+
+            processed_ob = observation_preprocessor.process(ob)
+
+            assert processed_ob.dtype == np.float32
+            assert np.allclose(processed_ob, expected)
+
+    def test_observation_recorder(self):
+        """
+        Test if the ObservationRecorder grows its buffer and records copies of the observations
+        """
+        observation_recorder = ObservationRecorder(observation_size=3, capacity=2)
+        ob = np.zeros(3, dtype=np.int8)
+
+        for i in range(5):
+            # Like the GUI apps, which return the same state array in each step
+            ob[:] = i
+            observation_recorder.record(ob)
+
+        recorded_observations = np.repeat(np.arange(5), 3).reshape(5, 3)
+        ob_sum, ob_sum_of_squares, count = observation_recorder.calculate_partial()
+
+        assert count == 5
+        assert np.array_equal(ob_sum, recorded_observations.sum(axis=0))
+        assert np.array_equal(ob_sum_of_squares, np.square(recorded_observations).sum(axis=0))
+
+        observation_recorder.clear()
+        observation_recorder.record(ob)
+
+        ob_sum, _, count = observation_recorder.calculate_partial()
+
+        assert count == 1
+        assert np.array_equal(ob_sum, [4, 4, 4])
+
+    def test_ob_stat_partials(self):
+        """
+        Test if updating the observation statistics with the partial statistics returned by training evaluations gives
+        the same statistics as adding all observations at once
+        """
+        ep_runner = EpisodeRunner(
+            env_class=get_environment_class("GUIApp"),
+            env_configuration={"type": "GUIApp", "number_time_steps": 50, "include_fake_bug": False},
+            brain_class=get_brain_class("RNN"),
+            brain_configuration={"type": "RNN", "hidden_layers": [5], "use_bias": True},
+            preprocessing_config={"observation_standardization": True, "calc_ob_stat_prob": 1.0},
+            enhancer_config={"type": "RandomEnhancer"},
+            global_seed=0
+        )
+
+        individual_size, _, _ = ep_runner.get_individual_size()
+        rng = np.random.default_rng(0)
+        genomes = [rng.standard_normal(individual_size, dtype=np.float32) for _ in range(3)]
+
+        ob_stat_partials = []
+        for env_seed, genome in enumerate(genomes):
+            _, ob_stat_partial = ep_runner.eval_fitness(genome, env_seed, 2, True)
+            ob_stat_partials.append(ob_stat_partial)
+
+        # Each evaluation has two episodes with 50 steps, and one observation after each reset
+        assert [count for _, _, count in ob_stat_partials] == [102, 102, 102]
+
+        expected_ob_stat = RunningStat(shape=(ep_runner.get_input_size(),), eps=1e-2)
+        expected_ob_stat.increment(*RunningStat.combine_partials(ob_stat_partials))
+
+        ep_runner.update_ob_mean_std(ob_stat_partials)
+        ob_mean, ob_std = ep_runner.get_ob_mean_std()
+
+        assert np.allclose(ob_mean, expected_ob_stat.mean)
+        assert np.allclose(ob_std, expected_ob_stat.std)
+
+    def test_combine_running_stat_partials(self):
+        """
+        Test if combining the partial statistics of batches of samples gives the partial statistics of all samples
+        """
+        rng = np.random.default_rng(0)
+        batches = [rng.standard_normal((n, 4)).astype(np.float32) for n in (1, 7, 20)]
+
+        s, ssq, c = RunningStat.combine_partials([RunningStat.calculate_partial(batch) for batch in batches])
+        expected_s, expected_ssq, expected_c = RunningStat.calculate_partial(np.concatenate(batches))
+
+        assert np.allclose(s, expected_s)
+        assert np.allclose(ssq, expected_ssq)
+        assert c == expected_c
@@ -0,0 +1,73 @@
+import numpy as np
+
+from naturalnets.optimizers import CmaEsPyCma, OpenAIEs
+
+
+class TestOptimizers:
+
+    def test_openai_es_tell_asynchronous(self):
+        """
+        Test if an asynchronous update with the genomes of the last ask() is the same as a regular update, and if
+        genomes of an earlier ask() can be told as well
+        """
+        configuration = {"type": "OpenAIEs", "population_size": 10, "learning_rate": 0.01, "noise_stddev": 0.05,
+                         "l2_regularization_coefficient": 0.005, "mirrored_sampling": False}
+        optimizers = [OpenAIEs(individual_size=20, global_seed=0, configuration=configuration,
+                               output_neurons_start_index=0, output_neurons_end_index=0) for _ in range(2)]
+
+        genomes = [optimizer.ask() for optimizer in optimizers]
+        rewards = np.random.default_rng(0).standard_normal(10).tolist()
+
+        optimizers[0].tell(rewards)
+        optimizers[1].tell_asynchronous(genomes[1], rewards)
+
+        assert np.allclose(optimizers[0].current_individual, optimizers[1].current_individual, atol=1e-6)
+
+        old_genomes = optimizers[1].ask()
+        new_genomes = optimizers[1].ask()
+        optimizers[1].tell_asynchronous(old_genomes[5:] + new_genomes[:5], rewards)
+
+        assert np.all(np.isfinite(optimizers[1].current_individual))
+
+    def test_cma_es_pycma_tell_asynchronous(self):
+        optimizer = CmaEsPyCma(individual_size=5, global_seed=0,
+                               configuration={"type": "CmaEsPyCma", "population_size": 6, "sigma": 1.0})
+
+        for _ in range(3):
+            # Half of the told genomes are from an earlier ask()
+            old_genomes = optimizer.ask()
+            new_genomes = optimizer.ask()
+            genomes = old_genomes[3:] + new_genomes[:3]
+            rewards = [float(np.sum(np.square(genome))) for genome in genomes]
+
+            best_genome = optimizer.tell_asynchronous(genomes, rewards)
+
+            assert best_genome is genomes[int(np.argmax(rewards))]
+
+    def test_openai_es_tell_asynchronous_improves(self):
+        """
+        Test if asynchronous updates with the raw rewards (i.e. no centered ranks) improve the individual on a simple
+        quadratic objective, whose rewards have a large offset
+        """
+        configuration = {"type": "OpenAIEs", "population_size": 20, "learning_rate": 0.05, "noise_stddev": 0.05,
+                         "l2_regularization_coefficient": 0.0, "use_centered_ranks": False}
+        optimizer = OpenAIEs(individual_size=10, global_seed=0, configuration=configuration,
+                             output_neurons_start_index=0, output_neurons_end_index=0)
+
+        target = np.ones(10, dtype=np.float32)
+
+        def get_distance(genome):
+            return float(np.linalg.norm(genome - target))
+
+        initial_distance = get_distance(optimizer.current_individual)
+
+        genomes = optimizer.ask()
+        for _ in range(30):
+            # Half of the told genomes are from an earlier ask()
+            new_genomes = optimizer.ask()
+            told_genomes = genomes[10:] + new_genomes[:10]
+            genomes = new_genomes
+
+            optimizer.tell_asynchronous(told_genomes, [1000.0 - get_distance(genome) ** 2 for genome in told_genomes])
+
+        assert get_distance(optimizer.current_individual) < 0.5 * initial_distance
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from naturalnets.brains.i_brain import get_brain_class
+from naturalnets.environments.i_environment import get_environment_class
+from naturalnets.tools.episode_runner import EpisodeRunner
+from naturalnets.tools.racing import FitnessRace
+
+
+class TestRacing:
+
+    @pytest.mark.parametrize("number_selected", [1, 5, 20])
+    def test_best_genomes_are_preserved(self, number_selected: int):
+        """
+        Test if racing gives the exact fitness for the best genomes, and a lower fitness than theirs for all others
+        """
+        population_size, number_rounds = 20, 8
+        bounds = (0.0, 10.0)
+
+        rng = np.random.default_rng(0)
+        # Genomes of different quality, with noisy episode rewards within the bounds
+        genome_qualities = np.linspace(1.0, 9.0, population_size)[:, np.newaxis]
+        round_rewards = np.clip(genome_qualities + rng.normal(0.0, 1.0, (population_size, number_rounds)), *bounds)
+        expected_fitnesses = round_rewards.mean(axis=1)
+
+        race = FitnessRace(population_size, number_rounds, number_selected, bounds)
+        while not race.is_finished():
+            running_indices = race.get_running_indices()
+            race.add_round(round_rewards[running_indices, race.current_round].tolist())
+
+        fitnesses = np.array(race.get_fitnesses())
+        best_indices = np.argsort(expected_fitnesses)[-number_selected:]
+        other_indices = np.argsort(expected_fitnesses)[:-number_selected]
+
+        assert np.allclose(fitnesses[best_indices], expected_fitnesses[best_indices])
+        if len(other_indices) > 0:
+            assert np.max(fitnesses[other_indices]) < np.min(fitnesses[best_indices])
+
+        if number_selected < population_size:
+            assert race.get_number_episodes() < population_size * number_rounds
+        else:
+            assert race.get_number_episodes() == population_size * number_rounds
+
+    def test_round_by_round_evaluation(self):
+        """
+        Test if evaluating the rounds one by one gives the same fitness as evaluating them at once, and if the episode
+        rewards are within the episode reward bounds of the environment
+        """
+        ep_runner = EpisodeRunner(
+            env_class=get_environment_class("GUIApp"),
+            env_configuration={"type": "GUIApp", "number_time_steps": 50, "include_fake_bug": False},
+            brain_class=get_brain_class("RNN"),
+            brain_configuration={"type": "RNN", "hidden_layers": [5], "use_bias": True},
+            preprocessing_config={},
+            enhancer_config={"type": None},
+            global_seed=0
+        )
+        lower_bound, upper_bound = ep_runner.get_episode_reward_bounds()
+
+        individual_size, _, _ = ep_runner.get_individual_size()
+        rng = np.random.default_rng(0)
+
+        env_seed, number_rounds = 3, 4
+        for _ in range(3):
+            genome = rng.standard_normal(individual_size, dtype=np.float32)
+
+            round_fitnesses = [ep_runner.eval_fitness(genome, env_seed + i, 1, True) for i in range(number_rounds)]
+
+            assert all(lower_bound <= fitness <= upper_bound for fitness in round_fitnesses)
+            assert np.isclose(np.mean(round_fitnesses), ep_runner.eval_fitness(genome, env_seed, number_rounds, True))
@@ -0,0 +1,95 @@
+import multiprocessing
+import time
+
+import pytest
+
+from naturalnets.tools.scheduler import EvaluationScheduler
+
+
+def _sleep_and_square(x: int, duration: float) -> int:
+    time.sleep(duration)
+    return x * x
+
+
+class TestScheduler:
+
+    @pytest.mark.parametrize("use_pool", [False, True])
+    def test_results_in_order(self, use_pool: bool):
+        """
+        Test if the scheduler returns the results in the order of the evaluations, although they finish in a
+        different order, and if it records the duration of each evaluation
+        """
+        evaluations = [[x, 0.02 if x % 3 == 0 else 0.0] for x in range(12)]
+        expected = [x * x for x in range(12)]
+
+        if use_pool:
+            with multiprocessing.Pool(3) as pool:
+                scheduler = EvaluationScheduler(pool, 3)
+                results = scheduler.map(_sleep_and_square, evaluations)
+                pending = scheduler.map_async(_sleep_and_square, evaluations)
+                async_results = pending.get()
+        else:
+            scheduler = EvaluationScheduler(None, 1)
+            results = scheduler.map(_sleep_and_square, evaluations)
+            async_results = scheduler.map_async(_sleep_and_square, evaluations).get()
+
+        assert results == expected
+        assert async_results == expected
+
+        task_durations = scheduler.get_last_task_durations(_sleep_and_square)
+        assert len(task_durations) == len(evaluations)
+        assert all(task_durations[x] >= 0.02 for x in range(0, 12, 3))
+
+    def test_adaptive_chunk_size(self):
+        scheduler = EvaluationScheduler(None, 4, minimum_chunk_duration=0.05, chunks_per_worker=4)
+        function_name = EvaluationScheduler.get_function_name(_sleep_and_square)
+
+        # Without an estimate of the duration, each worker gets chunks_per_worker chunks
+        assert scheduler.get_chunk_size(function_name, 1000) == 63
+
+        scheduler.task_duration_estimates[function_name] = 0.001
+        assert scheduler.get_chunk_size(function_name, 1000) == 50
+        # The chunks are limited, such that each worker gets chunks_per_worker chunks
+        assert scheduler.get_chunk_size(function_name, 160) == 10
+
+        # Long evaluations are not combined
+        scheduler.task_duration_estimates[function_name] = 1.0
+        assert scheduler.get_chunk_size(function_name, 1000) == 1
+
+    @pytest.mark.parametrize("use_pool", [False, True])
+    def test_submit(self, use_pool: bool):
+        """Test if evaluations submitted one by one are all returned with their tag"""
+        pool = multiprocessing.Pool(2) if use_pool else None
+
+        try:
+            scheduler = EvaluationScheduler(pool, 2)
+
+            for x in range(6):
+                scheduler.submit(_sleep_and_square, [x, 0.01 * (6 - x)], tag=("square", x))
+
+            results = {}
+            for _ in range(6):
+                (kind, x), result, duration = scheduler.get_completed()
+                assert kind == "square" and duration >= 0.0
+                results[x] = result
+
+            assert results == {x: x * x for x in range(6)}
+            assert scheduler.number_submitted == 0
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    def test_estimate_keys(self):
+        """Test if evaluations of the same function with different estimate keys get separate duration estimates"""
+        scheduler = EvaluationScheduler(None, 1)
+
+        scheduler.map(_sleep_and_square, [[x, 0.02] for x in range(3)], estimate_key="training")
+        scheduler.map(_sleep_and_square, [[x, 0.0] for x in range(3)], estimate_key="validation")
+
+        assert scheduler.task_duration_estimates["training"] >= 0.02
+        assert scheduler.task_duration_estimates["validation"] < 0.02
+        assert EvaluationScheduler.get_function_name(_sleep_and_square) not in scheduler.task_duration_estimates
+
+        assert len(scheduler.get_last_task_durations(_sleep_and_square, "training")) == 3
+        assert len(scheduler.get_last_task_durations(_sleep_and_square)) == 0
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+# Runs in a fresh interpreter, such that the resource tracker of the owner is started by the owner itself. A spawned
+# worker attaches to the SharedPopulation and exits, then the owner either closes the SharedPopulation or exits
+# without closing it, in which case the resource tracker must clean up.
+OWNER_SCRIPT = """
+import multiprocessing
+import sys
+
+from naturalnets.tools.shared_population import SharedPopulation
+
+shared_population = SharedPopulation(2, 3)
+shared_population.population[:] = 1.0
+
+with multiprocessing.get_context("spawn").Pool(1) as pool:
+    assert pool.apply(SharedPopulation.get_individual, (shared_population, 1)).sum() == 3.0
+
+print(shared_population.get_name(), flush=True)
+
+if sys.argv[1] == "close":
+    shared_population.close()
+"""
+
+
+def _shared_memory_exists(name: str) -> bool:
+    try:
+        shared_memory = SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+
+    # Do not leak the shared memory if the test fails
+    shared_memory.close()
+    shared_memory.unlink()
+    return True
+
+
+class TestSharedPopulation:
+
+    @pytest.mark.parametrize("owner_closes", [True, False])
+    def test_owner_cleans_up_after_spawned_workers(self, owner_closes: bool):
+        """
+        Test if the shared memory is still unlinked by the owner (or by its resource tracker, if the owner does not
+        close it), after a spawned worker attached to it and exited
+        """
+        result = subprocess.run(
+            [sys.executable, "-c", OWNER_SCRIPT, "close" if owner_closes else "exit"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, timeout=120
+        )
+
+        assert result.returncode == 0, result.stderr
+
+        # The resource tracker writes to the same stderr, and subprocess.run() waits until it exited as well
+        assert "KeyError" not in result.stderr
+        assert not _shared_memory_exists(result.stdout.split()[0])
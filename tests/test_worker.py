@@ -0,0 +1,114 @@
+import multiprocessing
+
+import numpy as np
+
+from naturalnets.brains.i_brain import get_brain_class
+from naturalnets.environments.i_environment import get_environment_class
+from naturalnets.tools.episode_runner import EpisodeRunner
+from naturalnets.tools import worker
+from naturalnets.tools.shared_population import SharedPopulation
+from naturalnets.tools.worker import (initialize_worker, eval_fitness_in_worker, eval_shared_individual_in_worker,
+                                     broadcast_ob_mean_std)
+
+
+def _create_episode_runner(preprocessing_config: dict = None) -> EpisodeRunner:
+    return EpisodeRunner(
+        env_class=get_environment_class("GUIApp"),
+        env_configuration={"type": "GUIApp", "number_time_steps": 50, "include_fake_bug": False},
+        brain_class=get_brain_class("RNN"),
+        brain_configuration={"type": "RNN", "hidden_layers": [5], "use_bias": True},
+        preprocessing_config=preprocessing_config or {},
+        enhancer_config={"type": None},
+        global_seed=0
+    )
+
+
+def _eval_and_get_ob_mean_std(genome: np.ndarray):
+    # Also returns the observation statistics, which the resident EpisodeRunner of the worker used
+    return eval_fitness_in_worker(genome, 0, 1, False), worker._episode_runner.get_ob_mean_std()
+
+
+class TestWorker:
+
+    def test_resident_episode_runner(self):
+        """
+        Test if evaluating with the resident EpisodeRunner of a worker gives the same results as evaluating with the
+        EpisodeRunner directly
+        """
+        ep_runner = _create_episode_runner()
+
+        individual_size, _, _ = ep_runner.get_individual_size()
+        rng = np.random.default_rng(0)
+        genomes = [rng.standard_normal(individual_size, dtype=np.float32) for _ in range(3)]
+
+        initialize_worker(ep_runner)
+
+        for env_seed, genome in enumerate(genomes):
+            expected = ep_runner.eval_fitness(genome, env_seed, 2, False)
+            result = eval_fitness_in_worker(genome, env_seed, 2, False)
+
+            assert result == expected
+
+    def test_broadcast_ob_mean_std(self):
+        """
+        Test if the evaluations that are submitted after a broadcast use the broadcast observation statistics, while
+        the ones submitted before still use the previous statistics
+        """
+        ep_runner = _create_episode_runner({"observation_standardization": True})
+
+        individual_size, _, _ = ep_runner.get_individual_size()
+        observation_size = ep_runner.get_input_size()
+        rng = np.random.default_rng(0)
+        genome = rng.standard_normal(individual_size, dtype=np.float32)
+
+        number_workers = 2
+        ob_mean_stds = [ep_runner.get_ob_mean_std()]
+        pending_results = []
+
+        with multiprocessing.Pool(number_workers, initializer=initialize_worker,
+                                  initargs=(ep_runner, None, multiprocessing.Barrier(number_workers))) as pool:
+            for _ in range(3):
+                pending_results.append(pool.starmap_async(_eval_and_get_ob_mean_std, [[genome]] * 4, chunksize=1))
+
+                ob_mean_stds.append((rng.standard_normal(observation_size), rng.uniform(0.5, 2.0, observation_size)))
+                broadcast_ob_mean_std(pool, number_workers, ob_mean_stds[-1])
+
+            pending_results.append(pool.starmap_async(_eval_and_get_ob_mean_std, [[genome]] * 4, chunksize=1))
+
+            results = [pending_result.get() for pending_result in pending_results]
+
+        for (ob_mean, ob_std), version_results in zip(ob_mean_stds, results):
+            ep_runner.set_ob_mean_std(ob_mean, ob_std)
+            expected = ep_runner.eval_fitness(genome, 0, 1, False)
+
+            for result, (worker_ob_mean, worker_ob_std) in version_results:
+                assert result == expected
+                assert np.array_equal(worker_ob_mean, ob_mean) and np.array_equal(worker_ob_std, ob_std)
+
+    def test_shared_population(self):
+        """
+        Test if evaluating the individuals of a SharedPopulation gives the same results as evaluating the genomes
+        directly
+        """
+        ep_runner = _create_episode_runner()
+
+        individual_size, _, _ = ep_runner.get_individual_size()
+        rng = np.random.default_rng(0)
+        genomes = [rng.standard_normal(individual_size, dtype=np.float32) for _ in range(3)]
+
+        shared_population = SharedPopulation(len(genomes), individual_size)
+
+        try:
+            for i, genome in enumerate(genomes):
+                shared_population.population[i] = genome
+
+            initialize_worker(ep_runner, shared_population)
+
+            for i, genome in enumerate(genomes):
+                expected = ep_runner.eval_fitness(genome, 0, 2, False)
+                result = eval_shared_individual_in_worker(i, 0, 2, False)
+
+                assert result == expected
+        finally:
+            initialize_worker(ep_runner, None)
+            shared_population.close()